@@ -1,6 +1,6 @@
 import streamlit as st
 import google.generativeai as genai
-from PIL import Image
+from PIL import Image, ImageOps
 import sqlite3
 import hashlib
 import smtplib
@@ -8,59 +8,744 @@ import random
 import string
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import time
 from dotenv import load_dotenv
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from collections import OrderedDict, defaultdict, deque
+import csv
+import gzip
+import html
+import io
+import json
+import math
+import queue
+import re
+import textwrap
+import threading
+import zlib
 
-load_dotenv()
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# One-time setup that ran during this script run. Streamlit reruns the
+# whole script on every interaction, so the setup below is process-scoped
+# (st.cache_resource) and a rerun in a warm process should leave this empty.
+SETUP_STEPS = []
+
+@st.cache_resource
+def load_environment():
+    SETUP_STEPS.append("load_dotenv")
+    load_dotenv()
+
+load_environment()
 # 🔑 Configuration
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-genai.configure(api_key=GOOGLE_API_KEY)
 
-# Email configuration from environment variables
-SMTP_SERVER = st.secrets["SMTP_SERVER"]
-SMTP_PORT = int(st.secrets["SMTP_PORT"])
-EMAIL_USER = st.secrets["EMAIL_USER"]
-EMAIL_PASS = st.secrets["EMAIL_PASS"]
+# Maximum number of feature prompts sent to Gemini at the same time
+MAX_FEATURE_WORKERS = int(os.getenv("CODEGPT_MAX_WORKERS", "6"))
+# Stream Gemini responses into the page as they are generated
+STREAM_RESPONSES = os.getenv("CODEGPT_STREAM_RESPONSES", "1") == "1"
+# Show the performance diagnostics panel in the sidebar
+SHOW_DIAGNOSTICS = os.getenv("CODEGPT_SHOW_DIAGNOSTICS", "0") == "1"
+
+GEMINI_MODEL = "gemini-1.5-flash"
+# Default for sending all selected features to Gemini in a single request
+BATCH_FEATURES = os.getenv("CODEGPT_BATCH_FEATURES", "0") == "1"
+# LLM backend: "gemini", or "fake" for offline load testing and benchmarks
+LLM_BACKEND = os.getenv("CODEGPT_BACKEND", "gemini")
+FAKE_LATENCY = os.getenv("CODEGPT_FAKE_LATENCY", "lognormal:0.8:0.3")
+FAKE_TOKENS_PER_SEC = float(os.getenv("CODEGPT_FAKE_TOKENS_PER_SEC", "80"))
+FAKE_OUTPUT_TOKENS = int(os.getenv("CODEGPT_FAKE_OUTPUT_TOKENS", "300"))
+FAKE_ERROR_RATE = float(os.getenv("CODEGPT_FAKE_ERROR_RATE", "0"))
+FAKE_SEED = int(os.getenv("CODEGPT_FAKE_SEED", "42"))
+# Make a cheap call at server start so the first analysis skips connection setup
+WARMUP_MODELS = os.getenv("CODEGPT_WARMUP", "1") == "1"
+
+# Response cache for feature prompts
+RESPONSE_CACHE_TTL = int(os.getenv("CODEGPT_CACHE_TTL", "86400"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("CODEGPT_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("CODEGPT_CACHE_MAX_MB", "32")) * 1024 * 1024
+RESPONSE_CACHE_PERSIST = os.getenv("CODEGPT_CACHE_PERSIST", "0") == "1"
+RESPONSE_CACHE_WARM = os.getenv("CODEGPT_CACHE_WARM", "0") == "1"
+
+# Handwritten code images are capped, downscaled and re-encoded before upload
+IMAGE_MAX_UPLOAD_MB = float(os.getenv("CODEGPT_IMAGE_MAX_UPLOAD_MB", "10"))
+IMAGE_MAX_PIXELS = int(os.getenv("CODEGPT_IMAGE_MAX_PIXELS", "50000000"))
+IMAGE_MAX_EDGE = int(os.getenv("CODEGPT_IMAGE_MAX_EDGE", "1600"))
+IMAGE_GRAYSCALE = os.getenv("CODEGPT_IMAGE_GRAYSCALE", "1") == "1"
+IMAGE_AUTOCONTRAST = os.getenv("CODEGPT_IMAGE_AUTOCONTRAST", "1") == "1"
+# JPEG or WEBP
+IMAGE_FORMAT = os.getenv("CODEGPT_IMAGE_FORMAT", "JPEG").upper()
+IMAGE_QUALITY = int(os.getenv("CODEGPT_IMAGE_QUALITY", "85"))
+# Handwritten pages converted per upload
+IMAGE_MAX_PAGES = int(os.getenv("CODEGPT_IMAGE_MAX_PAGES", "20"))
+# Digitized handwritten code is reused when the same user uploads the same
+# image again (0 entries disables). An IMAGE_CACHE_MAX_DISTANCE above 0 also
+# reuses it for images whose perceptual hash is within that many bits, which
+# catches re-saved photos but can mistake one similar notebook page for another.
+IMAGE_CACHE_MAX_ENTRIES = int(os.getenv("CODEGPT_IMAGE_CACHE_MAX_ENTRIES", "500"))
+IMAGE_CACHE_MAX_DISTANCE = int(os.getenv("CODEGPT_IMAGE_CACHE_MAX_DISTANCE", "0"))
+
+def get_secret(name, default=None):
+    # st.secrets first, then the environment, so scripts that import app.py
+    # (benchmarks, checks) work without a secrets.toml
+    try:
+        return st.secrets[name]
+    except (KeyError, FileNotFoundError):
+        return os.getenv(name, default)
+
+# Email configuration from st.secrets or environment variables
+@st.cache_resource
+def load_email_settings():
+    SETUP_STEPS.append("secrets")
+    return (get_secret("SMTP_SERVER"), int(get_secret("SMTP_PORT", "587")), get_secret("EMAIL_USER"),
+            get_secret("EMAIL_PASS"), str(get_secret("SMTP_STARTTLS", "1")).lower() in ("1", "true"))
+
+SMTP_SERVER, SMTP_PORT, EMAIL_USER, EMAIL_PASS, SMTP_STARTTLS = load_email_settings()
+# Outbound mail is queued in email_outbox and sent by a background worker
+EMAIL_MAX_ATTEMPTS = int(os.getenv("CODEGPT_EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE = float(os.getenv("CODEGPT_EMAIL_RETRY_BASE", "2"))
+# Seconds the SMTP connection is kept open with nothing to send
+EMAIL_IDLE_TIMEOUT = float(os.getenv("CODEGPT_EMAIL_IDLE_TIMEOUT", "60"))
+
+# Served by Streamlit at app/static/ when server.enableStaticServing is on
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# Fonts bundled as static/fonts/<Family>-<weight>.woff2, e.g. Inter-400.woff2
+# or Inter-300-900.woff2 for a variable font. Google Fonts is imported for a
+# family with no bundled files on "auto", always on "1" and never on "0"
+FONT_DIR = os.path.join(STATIC_DIR, "fonts")
+GOOGLE_FONTS = os.getenv("CODEGPT_GOOGLE_FONTS", "auto").lower()
+FONT_FAMILIES = {
+    "Inter": "300;400;500;600;700;800;900",
+    "JetBrains Mono": "400;500;600",
+    "Poppins": "400;500;600;700;800",
+}
 
 # Database setup
+DB_PATH = os.getenv("CODEGPT_DB_PATH", "codegpt_users.db")
+DB_POOL_SIZE = int(os.getenv("CODEGPT_DB_POOL_SIZE", "8"))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("CODEGPT_DB_BUSY_TIMEOUT_MS", "5000"))
+# Storage format for chat_history code and output: "zlib", "zstd" (needs the
+# zstandard package, otherwise zlib is used) or "none"
+HISTORY_COMPRESSION = os.getenv("CODEGPT_HISTORY_COMPRESSION", "zlib")
+HISTORY_COMPRESS_MIN_BYTES = int(os.getenv("CODEGPT_HISTORY_COMPRESS_MIN_BYTES", "512"))
+# Code and outputs at least this large are stored once per database in
+# history_blobs, keyed by content hash, instead of inline in chat_history
+HISTORY_BLOB_MIN_BYTES = int(os.getenv("CODEGPT_HISTORY_BLOB_MIN_BYTES", "256"))
+# Move rows written before the blob store existed into it, in the background
+HISTORY_MIGRATE = os.getenv("CODEGPT_HISTORY_MIGRATE", "1") == "1"
+# Delete analyses older than this many days (0 keeps them forever)
+HISTORY_RETENTION_DAYS = int(os.getenv("CODEGPT_HISTORY_RETENTION_DAYS", "0"))
+HISTORY_MAINTENANCE_INTERVAL = int(os.getenv("CODEGPT_HISTORY_MAINTENANCE_INTERVAL", "3600"))
+# Unreferenced blobs are only collected once they have been unreferenced (or
+# unused since they were written) for this many seconds
+HISTORY_BLOB_GRACE = int(os.getenv("CODEGPT_HISTORY_BLOB_GRACE", "3600"))
+# Characters of code and output the history page query returns per row
+HISTORY_PREVIEW_CHARS = 500
+# Seconds between sweeps of expired OTP codes
+OTP_SWEEP_INTERVAL = int(os.getenv("CODEGPT_OTP_SWEEP_INTERVAL", "300"))
+
+class Database:
+    # Pool of long-lived connections shared by every session. WAL lets readers
+    # run alongside a writer, and each connection keeps its own cache of
+    # prepared statements, which only pays off because connections are reused.
+    def __init__(self, path, pool_size=8, busy_timeout_ms=5000, statement_cache=256):
+        self.path = path
+        self.pool_size = pool_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.statement_cache = statement_cache
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+        self.opened = 0
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False,
+                               cached_statements=self.statement_cache)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        register_sql_functions(conn)
+        return conn
+
+    def _acquire(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            can_open = self.opened < self.pool_size
+            if can_open:
+                self.opened += 1
+        if can_open:
+            try:
+                return self._open()
+            except Exception:
+                with self.lock:
+                    self.opened -= 1
+                raise
+        try:
+            return self.idle.get(timeout=self.busy_timeout_ms / 1000)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a free database connection")
+
+    def snapshot(self):
+        with self.lock:
+            return {"open": self.opened, "idle": self.idle.qsize(), "size": self.pool_size}
+
+    @contextmanager
+    def connection(self, write=False):
+        # Commits when the block finishes and rolls back if it raises. With
+        # write=True the write lock is taken up front (BEGIN IMMEDIATE), so
+        # everything read in the block stays true until the commit.
+        conn = self._acquire()
+        try:
+            if write:
+                conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.idle.put(conn)
+
+def hamming_distance(a, b):
+    # Bits that differ between two 64-bit hashes stored as signed INTEGERs
+    return ((a ^ b) & 0xFFFFFFFFFFFFFFFF).bit_count()
+
+def register_sql_functions(conn):
+    # history_text() decodes stored history values inside SQL;
+    # history_fts_source needs it on every connection that indexes or
+    # searches history
+    conn.create_function("history_text", 1, decode_history_text, deterministic=True)
+    conn.create_function("hamming", 2, hamming_distance, deterministic=True)
+
+@st.cache_resource
+def get_db():
+    SETUP_STEPS.append("db_pool")
+    return Database(DB_PATH, DB_POOL_SIZE, DB_BUSY_TIMEOUT_MS)
+
+# Stored in PRAGMA user_version once init_database has run. Bump it whenever
+# init_database changes so existing databases pick the change up.
+SCHEMA_VERSION = 4
+
 def init_database():
-    conn = sqlite3.connect('codegpt_users.db')
-    c = conn.cursor()
-    
-    # Users table
-    c.execute('''CREATE TABLE IF NOT EXISTS users
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  username TEXT UNIQUE NOT NULL,
-                  email TEXT UNIQUE NOT NULL,
-                  password_hash TEXT NOT NULL,
-                  verified INTEGER DEFAULT 0,
-                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-    
-    # Chat history table
-    c.execute('''CREATE TABLE IF NOT EXISTS chat_history
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  user_id INTEGER,
-                  code_input TEXT,
-                  features_used TEXT,
-                  ai_output TEXT,
-                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                  FOREIGN KEY (user_id) REFERENCES users (id))''')
-    
-    # OTP table
-    c.execute('''CREATE TABLE IF NOT EXISTS otp_codes
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                  email TEXT NOT NULL,
-                  otp_code TEXT NOT NULL,
-                  expires_at TIMESTAMP NOT NULL,
-                  used INTEGER DEFAULT 0)''')
-    
-    conn.commit()
-    conn.close()
+    # Returns True when the schema had to be created or upgraded
+    with get_db().connection() as conn:
+        c = conn.cursor()
+        version = c.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            if version > SCHEMA_VERSION:
+                print(f"Database schema version {version} is newer than this app's ({SCHEMA_VERSION})")
+            return False
+        
+        # Users table
+        c.execute('''CREATE TABLE IF NOT EXISTS users
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      username TEXT UNIQUE NOT NULL,
+                      email TEXT UNIQUE NOT NULL,
+                      password_hash TEXT NOT NULL,
+                      verified INTEGER DEFAULT 0,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+        
+        # Chat history table
+        c.execute('''CREATE TABLE IF NOT EXISTS chat_history
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER,
+                      code_input TEXT,
+                      features_used TEXT,
+                      ai_output TEXT,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      FOREIGN KEY (user_id) REFERENCES users (id))''')
+        
+        # OTP table
+        c.execute('''CREATE TABLE IF NOT EXISTS otp_codes
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      email TEXT NOT NULL,
+                      otp_code TEXT NOT NULL,
+                      expires_at TIMESTAMP NOT NULL,
+                      used INTEGER DEFAULT 0)''')
+        
+        # Persistent tier of the response cache
+        c.execute('''CREATE TABLE IF NOT EXISTS response_cache
+                     (cache_key TEXT PRIMARY KEY,
+                      feature TEXT NOT NULL,
+                      output TEXT NOT NULL,
+                      created_at REAL NOT NULL)''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_created ON response_cache (created_at)")
+        
+        # Handwritten code conversions by image content (sha256) and perceptual
+        # hash (dhash). Entries from before sha256 was stored were shared
+        # between users and matched on dhash alone, so they are dropped.
+        if "sha256" not in {row[1] for row in c.execute("PRAGMA table_info(image_cache)")}:
+            c.execute("DROP TABLE IF EXISTS image_cache")
+        c.execute('''CREATE TABLE IF NOT EXISTS image_cache
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      scope TEXT NOT NULL,
+                      sha256 TEXT NOT NULL,
+                      dhash INTEGER NOT NULL,
+                      output TEXT NOT NULL,
+                      created_at REAL NOT NULL,
+                      last_used REAL NOT NULL)''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_image_cache_scope_sha256 ON image_cache (scope, sha256)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_image_cache_last_used ON image_cache (last_used)")
+        
+        # Outbound mail queue, drained by EmailOutbox
+        c.execute('''CREATE TABLE IF NOT EXISTS email_outbox
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      recipient TEXT NOT NULL,
+                      subject TEXT NOT NULL,
+                      body TEXT NOT NULL,
+                      status TEXT NOT NULL DEFAULT 'queued',
+                      attempts INTEGER NOT NULL DEFAULT 0,
+                      next_attempt_at REAL NOT NULL DEFAULT 0,
+                      last_error TEXT,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      finished_at REAL)''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (status, next_attempt_at)")
+        
+        # Content-addressed store for large code and outputs. refcount is
+        # maintained by the triggers below, so every writer keeps it right.
+        # touched_at is when the blob was written or last lost a reference;
+        # collect_history_blobs leaves recently touched blobs alone.
+        c.execute('''CREATE TABLE IF NOT EXISTS history_blobs
+                     (hash TEXT PRIMARY KEY,
+                      data BLOB NOT NULL,
+                      size INTEGER NOT NULL,
+                      refcount INTEGER NOT NULL DEFAULT 0,
+                      touched_at REAL NOT NULL DEFAULT 0)''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_history_blobs_orphans ON history_blobs (refcount) WHERE refcount <= 0")
+        if "touched_at" not in {row[1] for row in c.execute("PRAGMA table_info(history_blobs)")}:
+            c.execute("ALTER TABLE history_blobs ADD COLUMN touched_at REAL NOT NULL DEFAULT 0")
+        columns = {row[1] for row in c.execute("PRAGMA table_info(chat_history)")}
+        for column in ("code_hash", "output_hash"):
+            if column not in columns:
+                c.execute(f"ALTER TABLE chat_history ADD COLUMN {column} TEXT")
+        c.execute("DROP TRIGGER IF EXISTS chat_history_blobs_update")
+        c.execute("DROP TRIGGER IF EXISTS chat_history_blobs_delete")
+        c.execute('''CREATE TRIGGER IF NOT EXISTS chat_history_blobs_insert AFTER INSERT ON chat_history
+                     BEGIN
+                         UPDATE history_blobs SET refcount = refcount + 1 WHERE hash = NEW.code_hash;
+                         UPDATE history_blobs SET refcount = refcount + 1 WHERE hash = NEW.output_hash;
+                     END''')
+        c.execute('''CREATE TRIGGER IF NOT EXISTS chat_history_blobs_update AFTER UPDATE OF code_hash, output_hash ON chat_history
+                     BEGIN
+                         UPDATE history_blobs SET refcount = refcount - 1, touched_at = strftime('%s', 'now') WHERE hash = OLD.code_hash;
+                         UPDATE history_blobs SET refcount = refcount - 1, touched_at = strftime('%s', 'now') WHERE hash = OLD.output_hash;
+                         UPDATE history_blobs SET refcount = refcount + 1 WHERE hash = NEW.code_hash;
+                         UPDATE history_blobs SET refcount = refcount + 1 WHERE hash = NEW.output_hash;
+                     END''')
+        c.execute('''CREATE TRIGGER IF NOT EXISTS chat_history_blobs_delete AFTER DELETE ON chat_history
+                     BEGIN
+                         UPDATE history_blobs SET refcount = refcount - 1, touched_at = strftime('%s', 'now') WHERE hash = OLD.code_hash;
+                         UPDATE history_blobs SET refcount = refcount - 1, touched_at = strftime('%s', 'now') WHERE hash = OLD.output_hash;
+                     END''')
+        # Length and first characters of each blob, kept apart from the blob
+        # so the history page can show previews without reading the data
+        previews_exist = c.execute("SELECT 1 FROM sqlite_master WHERE name = 'history_blob_previews'").fetchone()
+        c.execute('''CREATE TABLE IF NOT EXISTS history_blob_previews
+                     (hash TEXT PRIMARY KEY,
+                      length INTEGER NOT NULL,
+                      preview TEXT NOT NULL)''')
+        if not previews_exist:
+            c.execute(f"""INSERT INTO history_blob_previews (hash, length, preview)
+                          SELECT hash, length(history_text(data)), substr(history_text(data), 1, {HISTORY_PREVIEW_CHARS})
+                          FROM history_blobs""")
+        c.execute('''CREATE TRIGGER IF NOT EXISTS history_blobs_previews_delete AFTER DELETE ON history_blobs
+                     BEGIN
+                         DELETE FROM history_blob_previews WHERE hash = OLD.hash;
+                     END''')
+        
+        # Full-text index over history. The text itself stays in chat_history
+        # and history_blobs: history_fts_source decodes it for the index and
+        # for snippet(), and owner holds a "u<user id>" token so a search
+        # only matches the searching user's rows. Reading the view (and so
+        # searching) needs history_text() registered, see register_sql_functions.
+        c.execute('''CREATE VIEW IF NOT EXISTS history_fts_source AS
+                     SELECT h.id AS id, 'u' || h.user_id AS owner,
+                            history_text(COALESCE(cb.data, h.code_input)) AS code_input,
+                            h.features_used AS features_used,
+                            history_text(COALESCE(ob.data, h.ai_output)) AS ai_output
+                     FROM chat_history h
+                     LEFT JOIN history_blobs cb ON cb.hash = h.code_hash
+                     LEFT JOIN history_blobs ob ON ob.hash = h.output_hash''')
+        fts_exists = c.execute("SELECT 1 FROM sqlite_master WHERE name = 'history_fts'").fetchone()
+        c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5
+                     (owner, code_input, features_used, ai_output,
+                      content='history_fts_source', content_rowid='id', prefix='2 3 4')''')
+        if not fts_exists:
+            c.execute("INSERT INTO history_fts (history_fts) VALUES ('rebuild')")
+        # The index is kept up to date by the app (index_history_rows and
+        # unindex_history_rows), not by triggers: history_fts_source calls
+        # history_text(), which only the app's connections register, so a
+        # trigger would stop the sqlite3 shell, admin scripts and backup tools
+        # from writing chat_history at all.
+        c.execute("DROP TRIGGER IF EXISTS chat_history_fts_insert")
+        c.execute("DROP TRIGGER IF EXISTS chat_history_fts_delete")
+        
+        # Secondary indexes for the hot lookups (see HOT_QUERIES)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_user_created ON chat_history (user_id, created_at)")
+        
+        # Per-user history statistics, maintained by save_chat_history
+        c.execute('''CREATE TABLE IF NOT EXISTS user_stats
+                     (user_id INTEGER PRIMARY KEY,
+                      total_count INTEGER NOT NULL DEFAULT 0,
+                      first_day TEXT,
+                      day_counts TEXT NOT NULL DEFAULT '{}',
+                      feature_counts TEXT NOT NULL DEFAULT '{}',
+                      FOREIGN KEY (user_id) REFERENCES users (id))''')
+        # Only served the GROUP BY features_used query that user_stats replaced
+        c.execute("DROP INDEX IF EXISTS idx_chat_history_user_features")
+        # One live OTP per email: store_otp upserts on the unique index.
+        # Tables from before it existed keep only the latest unused code.
+        if c.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_otp_codes_email'").fetchone() is None:
+            c.execute("DELETE FROM otp_codes WHERE used = 1")
+            c.execute("DELETE FROM otp_codes WHERE id NOT IN (SELECT MAX(id) FROM otp_codes GROUP BY email)")
+            c.execute("CREATE UNIQUE INDEX idx_otp_codes_email ON otp_codes (email)")
+        c.execute("DROP INDEX IF EXISTS idx_otp_codes_email_expires")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_otp_codes_expires ON otp_codes (expires_at)")
+        c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return True
+
+@st.cache_resource
+def ensure_schema():
+    SETUP_STEPS.append("schema")
+    return init_database()
+
+# Queries on the hot paths
+USER_EXISTS_SQL = "SELECT id FROM users WHERE username = ? OR email = ?"
+USER_LOGIN_SQL = "SELECT id, username, verified FROM users WHERE (username = ? OR email = ?) AND password_hash = ?"
+OTP_LOOKUP_SQL = """SELECT id FROM otp_codes 
+                    WHERE email = ? AND otp_code = ? AND expires_at > ? AND used = 0"""
+USER_STATS_SQL = "SELECT total_count, first_day, day_counts, feature_counts FROM user_stats WHERE user_id = ?"
+# History rows with code and output resolved from history_blobs when stored there
+HISTORY_ROW_SQL = """SELECT h.id, COALESCE(cb.data, h.code_input), h.features_used, COALESCE(ob.data, h.ai_output), h.created_at 
+                     FROM chat_history h 
+                     LEFT JOIN history_blobs cb ON cb.hash = h.code_hash 
+                     LEFT JOIN history_blobs ob ON ob.hash = h.output_hash"""
+# History pages only carry previews and lengths; the full row is loaded
+# by id (HISTORY_ENTRY_SQL) when the user opens it
+HISTORY_PREVIEW_SQL = f"""SELECT h.id, 
+                                 COALESCE(cp.preview, substr(history_text(h.code_input), 1, {HISTORY_PREVIEW_CHARS})), 
+                                 COALESCE(cp.length, length(history_text(h.code_input))), 
+                                 h.features_used, 
+                                 COALESCE(op.preview, substr(history_text(h.ai_output), 1, {HISTORY_PREVIEW_CHARS})), 
+                                 COALESCE(op.length, length(history_text(h.ai_output))), 
+                                 h.created_at 
+                          FROM chat_history h 
+                          LEFT JOIN history_blob_previews cp ON cp.hash = h.code_hash 
+                          LEFT JOIN history_blob_previews op ON op.hash = h.output_hash"""
+HISTORY_PAGE_SQL = HISTORY_PREVIEW_SQL + """ 
+                      WHERE h.user_id = ? 
+                      ORDER BY h.created_at DESC, h.id DESC LIMIT ?"""
+# History is paged by keyset on (created_at, id) rather than OFFSET, so a
+# deep page costs the same index seek as the first one
+HISTORY_PAGE_AFTER_SQL = HISTORY_PREVIEW_SQL + """ 
+                            WHERE h.user_id = ? AND (h.created_at, h.id) < (?, ?) 
+                            ORDER BY h.created_at DESC, h.id DESC LIMIT ?"""
+HISTORY_ENTRY_SQL = HISTORY_ROW_SQL + " WHERE h.id = ? AND h.user_id = ?"
+HISTORY_NEWER_COUNT_SQL = "SELECT COUNT(*) FROM chat_history WHERE user_id = ? AND created_at > ?"
+# Search runs in two steps: the best-ranked ids, then snippets for just those
+# rows. Done in one query, SQLite evaluates bm25 a second time for the
+# snippet columns, which doubles the cost of common words. Ranking is over
+# the newest HISTORY_SEARCH_CANDIDATES matches, which keeps a common word
+# cheap for users with tens of thousands of analyses.
+HISTORY_SEARCH_CANDIDATES = 2000
+HISTORY_SEARCH_SQL = """SELECT rowid FROM (SELECT rowid, rank FROM history_fts WHERE history_fts MATCH ? 
+                                           ORDER BY rowid DESC LIMIT ?) 
+                        ORDER BY rank LIMIT ?"""
+# \x02/\x03 mark the matched terms and become <mark> tags once escaped
+HISTORY_SEARCH_SNIPPETS_SQL = """SELECT h.id, h.features_used, h.created_at, 
+                                        snippet(history_fts, 1, char(2), char(3), ' … ', 16), 
+                                        snippet(history_fts, 3, char(2), char(3), ' … ', 32) 
+                                 FROM history_fts JOIN chat_history h ON h.id = history_fts.rowid 
+                                 WHERE history_fts MATCH ? AND history_fts.rowid IN (SELECT value FROM json_each(?))"""
+IMAGE_CACHE_EXACT_SQL = "SELECT id, output FROM image_cache WHERE scope = ? AND sha256 = ? LIMIT 1"
+# Opt-in near matches scan the scope's rows with hamming(); an exact match
+# still wins over a merely close one
+IMAGE_CACHE_NEAR_SQL = """SELECT id, output FROM image_cache 
+                          WHERE scope = ? AND (sha256 = ? OR hamming(dhash, ?) <= ?) 
+                          ORDER BY sha256 = ? DESC, hamming(dhash, ?) LIMIT 1"""
+EMAIL_DUE_SQL = """SELECT id, recipient, subject, body, attempts FROM email_outbox 
+                   WHERE status = 'queued' AND next_attempt_at <= ? 
+                   ORDER BY next_attempt_at LIMIT ?"""
+
+# name -> (sql, sample parameters, index the plan must search with)
+HOT_QUERIES = {
+    "signup.user_exists": (USER_EXISTS_SQL, ("u", "u@x.io"), "sqlite_autoindex_users_1"),
+    "login.user_lookup": (USER_LOGIN_SQL, ("u", "u", "h"), "sqlite_autoindex_users_2"),
+    "verify_otp.lookup": (OTP_LOOKUP_SQL, ("u@x.io", "123456", "2025-01-01 00:00:00"), "idx_otp_codes_email"),
+    "history.user_stats": (USER_STATS_SQL, (1,), "INTEGER PRIMARY KEY"),
+    "history.page": (HISTORY_PAGE_SQL, (1, 10), "idx_chat_history_user_created"),
+    "history.page_after": (HISTORY_PAGE_AFTER_SQL, (1, "2025-01-01 00:00:00", 100, 10), "idx_chat_history_user_created"),
+    "history.entry": (HISTORY_ENTRY_SQL, (1, 1), "INTEGER PRIMARY KEY"),
+    "history.newer_count": (HISTORY_NEWER_COUNT_SQL, (1, "2025-01-01 00:00:00"), "idx_chat_history_user_created"),
+    "image_cache.exact": (IMAGE_CACHE_EXACT_SQL, ("s", "h"), "idx_image_cache_scope_sha256"),
+    "email.due": (EMAIL_DUE_SQL, (0, 20), "idx_email_outbox_due"),
+}
+
+def explain_query_plan(conn, sql, params):
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+def check_query_plans(conn):
+    # A hot query passes when its plan searches the expected index and never
+    # falls back to scanning a whole table or index.
+    report = {}
+    for name, (sql, params, index) in HOT_QUERIES.items():
+        plan = explain_query_plan(conn, sql, params)
+        uses_index = any(line.startswith("SEARCH") and index in line for line in plan)
+        scans = any(line.startswith("SCAN") for line in plan)
+        report[name] = (uses_index and not scans, plan)
+    return report
+
+# Per-user history statistics
+# Day buckets older than this are dropped; total_count and first_day keep
+# the all-time figures the averages need.
+STATS_DAY_BUCKETS = 90
+
+def rebuild_user_stats(conn, user_id):
+    day_counts = defaultdict(int)
+    feature_counts = defaultdict(int)
+    total_count = 0
+    first_day = None
+    for day, features_used in conn.execute("SELECT date(created_at), features_used FROM chat_history WHERE user_id = ?",
+                                           (user_id,)):
+        total_count += 1
+        first_day = min(first_day or day, day)
+        day_counts[day] += 1
+        for feature in (features_used or "").split(','):
+            if feature:
+                feature_counts[feature] += 1
+    cutoff = (datetime.now(timezone.utc).date() - timedelta(days=STATS_DAY_BUCKETS)).isoformat()
+    row = (total_count, first_day,
+           json.dumps({day: n for day, n in day_counts.items() if day >= cutoff}), json.dumps(feature_counts))
+    conn.execute("INSERT OR REPLACE INTO user_stats (user_id, total_count, first_day, day_counts, feature_counts) VALUES (?, ?, ?, ?, ?)",
+                 (user_id, *row))
+    return row
+
+def load_user_stats(conn, user_id):
+    # Users whose history predates user_stats get their row built on first read
+    row = conn.execute(USER_STATS_SQL, (user_id,)).fetchone()
+    return row or rebuild_user_stats(conn, user_id)
+
+def record_history_stats(conn, user_id, features_used):
+    # Called in the same transaction as the chat_history insert, which already
+    # holds the write lock, so concurrent saves cannot lose an update.
+    row = conn.execute(USER_STATS_SQL, (user_id,)).fetchone()
+    if row is None:
+        rebuild_user_stats(conn, user_id)  # counts the row just inserted
+        return
+    total_count, first_day, day_counts, feature_counts = row
+    today = datetime.now(timezone.utc).date()
+    cutoff = (today - timedelta(days=STATS_DAY_BUCKETS)).isoformat()
+    day_counts = {day: n for day, n in json.loads(day_counts).items() if day >= cutoff}
+    day_counts[today.isoformat()] = day_counts.get(today.isoformat(), 0) + 1
+    feature_counts = json.loads(feature_counts)
+    for feature in features_used:
+        feature_counts[feature] = feature_counts.get(feature, 0) + 1
+    conn.execute("UPDATE user_stats SET total_count = ?, first_day = ?, day_counts = ?, feature_counts = ? WHERE user_id = ?",
+                 (total_count + 1, first_day or today.isoformat(), json.dumps(day_counts), json.dumps(feature_counts), user_id))
+
+def summarize_user_stats(row):
+    total_count, first_day, day_counts, feature_counts = row
+    today = datetime.now(timezone.utc).date()
+    # The last 7 calendar days, today included
+    week_start = (today - timedelta(days=6)).isoformat()
+    day_counts = json.loads(day_counts) if isinstance(day_counts, str) else day_counts
+    feature_counts = json.loads(feature_counts) if isinstance(feature_counts, str) else feature_counts
+    weeks_active = 1.0
+    if first_day:
+        weeks_active = max(1.0, ((today - datetime.strptime(first_day, "%Y-%m-%d").date()).days + 1) / 7)
+    return {
+        "total": total_count,
+        "week": sum(n for day, n in day_counts.items() if day >= week_start),
+        "top_feature": max(sorted(feature_counts), key=feature_counts.get) if feature_counts else "None",
+        "avg_per_week": total_count / weeks_active,
+    }
+
+# History storage format
+# Large code_input/ai_output values live in history_blobs, stored once per
+# distinct text and compressed there: a BLOB starting with a codec marker.
+# Anything else is plain TEXT, so old rows and small values read back
+# unchanged and the codec can be switched at any time.
+HISTORY_CODEC_MARKERS = {"zlib": b"zlib:", "zstd": b"zstd:"}
+
+def encode_history_text(text, codec=None):
+    codec = codec or HISTORY_COMPRESSION
+    if text is None or codec == "none":
+        return text
+    data = text.encode()
+    if len(data) < HISTORY_COMPRESS_MIN_BYTES:
+        return text
+    if codec == "zstd" and zstandard is not None:
+        blob = HISTORY_CODEC_MARKERS["zstd"] + zstandard.ZstdCompressor(level=6).compress(data)
+    else:
+        blob = HISTORY_CODEC_MARKERS["zlib"] + zlib.compress(data, 6)
+    return blob if len(blob) < len(data) else text
+
+def decode_history_text(value):
+    if not isinstance(value, bytes):
+        return value
+    if value.startswith(HISTORY_CODEC_MARKERS["zlib"]):
+        return zlib.decompress(value[len(HISTORY_CODEC_MARKERS["zlib"]):]).decode()
+    if value.startswith(HISTORY_CODEC_MARKERS["zstd"]):
+        if zstandard is None:
+            raise RuntimeError("chat_history contains zstd-compressed rows; install the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(value[len(HISTORY_CODEC_MARKERS["zstd"]):]).decode()
+    return value.decode()
+
+def decode_history_row(row):
+    row_id, code_input, features_used, ai_output, created_at = row
+    return row_id, decode_history_text(code_input), features_used, decode_history_text(ai_output), created_at
+
+def store_history_text(conn, text, codec=None):
+    # Returns the (inline value, blob hash) pair to write into chat_history.
+    # The blob is created with refcount 0; the chat_history triggers count
+    # the reference once the row pointing at it is written. Call it inside
+    # db.connection(write=True), in the same transaction as that row, so
+    # collect_history_blobs cannot delete an unreferenced blob in between.
+    data = text.encode() if text is not None else b""
+    if len(data) < HISTORY_BLOB_MIN_BYTES:
+        return text, None
+    digest = hashlib.sha256(data).hexdigest()
+    inserted = conn.execute("""INSERT INTO history_blobs (hash, data, size, refcount, touched_at) VALUES (?, ?, ?, 0, ?)
+                               ON CONFLICT(hash) DO NOTHING""",
+                            (digest, encode_history_text(text, codec), len(data), time.time())).rowcount
+    if inserted:
+        conn.execute("INSERT OR REPLACE INTO history_blob_previews (hash, length, preview) VALUES (?, ?, ?)",
+                     (digest, len(text), text[:HISTORY_PREVIEW_CHARS]))
+    return None, digest
+
+# The full-text index is external content over history_fts_source, so it is
+# told about rows explicitly: after they are inserted, and before they are
+# deleted (the delete command needs the text that was indexed). Rows written
+# by other clients are picked up by rebuilding the index from the app:
+# INSERT INTO history_fts (history_fts) VALUES ('rebuild').
+def index_history_rows(conn, where, params=()):
+    conn.execute("""INSERT INTO history_fts (rowid, owner, code_input, features_used, ai_output)
+                    SELECT id, owner, code_input, features_used, ai_output FROM history_fts_source WHERE """ + where, params)
+
+def unindex_history_rows(conn, where, params=()):
+    conn.execute("""INSERT INTO history_fts (history_fts, rowid, owner, code_input, features_used, ai_output)
+                    SELECT 'delete', id, owner, code_input, features_used, ai_output FROM history_fts_source WHERE """ + where,
+                 params)
+
+def migrate_history_rows(db, metrics, codec=None, batch_size=200, pause=0.05):
+    # Moves large values still stored inline (as TEXT, or compressed in
+    # place by earlier versions) into history_blobs. Walks the table by id in
+    # short transactions so page loads and saves are never blocked for long.
+    last_id = 0
+    migrated = 0
+    while True:
+        with db.connection(write=True) as conn:
+            rows = conn.execute("""SELECT id, code_input, code_hash, ai_output, output_hash FROM chat_history
+                                   WHERE id > ? AND ((code_hash IS NULL AND (typeof(code_input) = 'blob' OR length(code_input) >= ?))
+                                                  OR (output_hash IS NULL AND (typeof(ai_output) = 'blob' OR length(ai_output) >= ?)))
+                                   ORDER BY id LIMIT ?""",
+                                (last_id, HISTORY_BLOB_MIN_BYTES, HISTORY_BLOB_MIN_BYTES, batch_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            updates = []
+            for row_id, code_input, code_hash, ai_output, output_hash in rows:
+                if code_hash is None:
+                    code_input, code_hash = store_history_text(conn, decode_history_text(code_input), codec)
+                if output_hash is None:
+                    ai_output, output_hash = store_history_text(conn, decode_history_text(ai_output), codec)
+                updates.append((code_input, code_hash, ai_output, output_hash, row_id))
+            conn.executemany("UPDATE chat_history SET code_input = ?, code_hash = ?, ai_output = ?, output_hash = ? WHERE id = ?",
+                             updates)
+        migrated += len(updates)
+        metrics.increment("history.migrated_rows", len(updates))
+        time.sleep(pause)
+    return migrated
+
+def expire_history_rows(db, metrics, days, batch_size=500):
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+    expired = 0
+    while True:
+        with db.connection(write=True) as conn:
+            ids = json.dumps([row_id for row_id, in conn.execute("SELECT id FROM chat_history WHERE created_at < ? ORDER BY id LIMIT ?",
+                                                                 (cutoff, batch_size))])
+            unindex_history_rows(conn, "id IN (SELECT value FROM json_each(?))", (ids,))
+            deleted = conn.execute("DELETE FROM chat_history WHERE id IN (SELECT value FROM json_each(?)) RETURNING user_id",
+                                   (ids,)).fetchall()
+            # Rebuilt from the remaining rows on the next read
+            conn.executemany("DELETE FROM user_stats WHERE user_id = ?", {(user_id,) for user_id, in deleted})
+        if not deleted:
+            break
+        expired += len(deleted)
+    metrics.increment("history.expired_rows", expired)
+    return expired
+
+def collect_history_blobs(db, metrics, grace=None):
+    # Blobs whose last referencing row was deleted (refcount dropped to 0)
+    # at least grace seconds ago
+    cutoff = time.time() - (HISTORY_BLOB_GRACE if grace is None else grace)
+    with db.connection() as conn:
+        collected = conn.execute("DELETE FROM history_blobs WHERE refcount <= 0 AND touched_at < ?", (cutoff,)).rowcount
+    metrics.increment("history.collected_blobs", collected)
+    return collected
+
+def run_history_maintenance(db, metrics):
+    # The thread is started once per process, so a failed pass (e.g. the
+    # database stayed locked past busy_timeout) is logged and retried on the
+    # next interval instead of ending maintenance. The migration resumes
+    # where it stopped, since it only picks up rows still stored inline.
+    migrated = not HISTORY_MIGRATE
+    while True:
+        try:
+            if not migrated:
+                migrate_history_rows(db, metrics)
+                migrated = True
+            if HISTORY_RETENTION_DAYS > 0:
+                expire_history_rows(db, metrics, HISTORY_RETENTION_DAYS)
+            collect_history_blobs(db, metrics)
+        except Exception as e:
+            print(f"History maintenance failed: {e}")
+            metrics.increment("history.maintenance_errors")
+        time.sleep(HISTORY_MAINTENANCE_INTERVAL)
+
+def sweep_otp_codes(db, metrics, batch_size=500):
+    # Deletes expired codes in short transactions so signups are not blocked
+    started = time.perf_counter()
+    swept = 0
+    while True:
+        with db.connection() as conn:
+            deleted = conn.execute("""DELETE FROM otp_codes WHERE id IN
+                                          (SELECT id FROM otp_codes WHERE expires_at <= ? LIMIT ?)""",
+                                   (datetime.now(), batch_size)).rowcount
+        swept += deleted
+        if deleted < batch_size:
+            break
+    with db.connection() as conn:
+        remaining = conn.execute("SELECT COUNT(*) FROM otp_codes").fetchone()[0]
+    metrics.record("otp.sweep", time.perf_counter() - started)
+    metrics.increment("otp.swept_rows", swept)
+    metrics.set_gauge("otp.table_rows", remaining)
+    return swept
+
+def run_otp_sweeper(db, metrics):
+    # Like run_history_maintenance, a failed sweep is logged and retried on
+    # the next interval rather than ending the thread
+    while True:
+        try:
+            sweep_otp_codes(db, metrics)
+        except Exception as e:
+            print(f"OTP sweep failed: {e}")
+            metrics.increment("otp.sweep_errors")
+        time.sleep(OTP_SWEEP_INTERVAL)
 
 # Initialize database
-init_database()
+ensure_schema()
 
 # Utility functions
 def hash_password(password):
@@ -70,115 +755,246 @@ def generate_otp():
     return ''.join(random.choices(string.digits, k=6))
 
 def send_otp_email(email, otp):
-    try:
-        msg = MIMEMultipart()
-        msg['From'] = EMAIL_USER
-        msg['To'] = email
-        msg['Subject'] = "CodeGPT - Email Verification Required"
-        
-        body = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Email Verification</title>
-        </head>
-        <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f5f5f5;">
-            <div style="max-width: 600px; margin: 0 auto; background-color: #ffffff; box-shadow: 0 4px 10px rgba(0, 0, 0, 0.1);">
+    # Queues the message and returns its email_outbox id; delivery happens
+    # on the outbox worker, so the signup form does not wait on SMTP
+    body = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Email Verification</title>
+    </head>
+    <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f5f5f5;">
+        <div style="max-width: 600px; margin: 0 auto; background-color: #ffffff; box-shadow: 0 4px 10px rgba(0, 0, 0, 0.1);">
+            
+            <!-- Header -->
+            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px 30px; text-align: center;">
+                <h1 style="color: #ffffff; margin: 0; font-size: 28px; font-weight: 300; letter-spacing: 1px;">
+                    CodeGPT
+                </h1>
+                <p style="color: #e8eaf6; margin: 10px 0 0 0; font-size: 16px; opacity: 0.9;">
+                    Email Verification
+                </p>
+            </div>
+            
+            <!-- Content -->
+            <div style="padding: 40px 30px;">
+                <h2 style="color: #333333; font-size: 24px; margin: 0 0 20px 0; font-weight: 400;">
+                    Verify Your Email Address
+                </h2>
                 
-                <!-- Header -->
-                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px 30px; text-align: center;">
-                    <h1 style="color: #ffffff; margin: 0; font-size: 28px; font-weight: 300; letter-spacing: 1px;">
-                        CodeGPT
-                    </h1>
-                    <p style="color: #e8eaf6; margin: 10px 0 0 0; font-size: 16px; opacity: 0.9;">
-                        Email Verification
-                    </p>
-                </div>
+                <p style="color: #666666; font-size: 16px; line-height: 1.6; margin: 0 0 30px 0;">
+                    To complete your registration and secure your account, please use the verification code below:
+                </p>
                 
-                <!-- Content -->
-                <div style="padding: 40px 30px;">
-                    <h2 style="color: #333333; font-size: 24px; margin: 0 0 20px 0; font-weight: 400;">
-                        Verify Your Email Address
-                    </h2>
-                    
-                    <p style="color: #666666; font-size: 16px; line-height: 1.6; margin: 0 0 30px 0;">
-                        To complete your registration and secure your account, please use the verification code below:
+                <!-- OTP Box -->
+                <div style="background-color: #f8f9fa; border: 2px dashed #dee2e6; border-radius: 8px; padding: 30px; text-align: center; margin: 30px 0;">
+                    <p style="color: #495057; font-size: 14px; margin: 0 0 10px 0; text-transform: uppercase; letter-spacing: 1px; font-weight: 600;">
+                        Verification Code
                     </p>
-                    
-                    <!-- OTP Box -->
-                    <div style="background-color: #f8f9fa; border: 2px dashed #dee2e6; border-radius: 8px; padding: 30px; text-align: center; margin: 30px 0;">
-                        <p style="color: #495057; font-size: 14px; margin: 0 0 10px 0; text-transform: uppercase; letter-spacing: 1px; font-weight: 600;">
-                            Verification Code
-                        </p>
-                        <div style="font-size: 36px; font-weight: 700; color: #007bff; letter-spacing: 8px; font-family: 'Courier New', monospace;">
-                            {otp}
-                        </div>
+                    <div style="font-size: 36px; font-weight: 700; color: #007bff; letter-spacing: 8px; font-family: 'Courier New', monospace;">
+                        {otp}
                     </div>
-                    
-                    <!-- Important Info -->
-                    <div style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px 20px; margin: 30px 0; border-radius: 4px;">
-                        <p style="color: #856404; font-size: 14px; margin: 0; line-height: 1.5;">
-                            <strong>Important:</strong> This verification code will expire in 10 minutes for security purposes.
-                        </p>
-                    </div>
-                    
-                    <p style="color: #666666; font-size: 16px; line-height: 1.6; margin: 20px 0 0 0;">
-                        If you didn't create an account with CodeGPT, you can safely ignore this email.
-                    </p>
                 </div>
                 
-                <!-- Footer -->
-                <div style="background-color: #f8f9fa; padding: 30px; text-align: center; border-top: 1px solid #dee2e6;">
-                    <p style="color: #6c757d; font-size: 14px; margin: 0 0 10px 0;">
-                        This is an automated message from CodeGPT
-                    </p>
-                    <p style="color: #adb5bd; font-size: 12px; margin: 0;">
-                        © 2025 CodeGPT. All rights reserved.
+                <!-- Important Info -->
+                <div style="background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px 20px; margin: 30px 0; border-radius: 4px;">
+                    <p style="color: #856404; font-size: 14px; margin: 0; line-height: 1.5;">
+                        <strong>Important:</strong> This verification code will expire in 10 minutes for security purposes.
                     </p>
                 </div>
                 
+                <p style="color: #666666; font-size: 16px; line-height: 1.6; margin: 20px 0 0 0;">
+                    If you didn't create an account with CodeGPT, you can safely ignore this email.
+                </p>
             </div>
-        </body>
-        </html>
-        """
-        
-        msg.attach(MIMEText(body, 'html'))
-        
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(EMAIL_USER, EMAIL_PASS)
-        text = msg.as_string()
-        server.sendmail(EMAIL_USER, email, text)
-        server.quit()
-        return True
-    except Exception as e:
-        st.error(f"Failed to send OTP: {str(e)}")
-        return False
+            
+            <!-- Footer -->
+            <div style="background-color: #f8f9fa; padding: 30px; text-align: center; border-top: 1px solid #dee2e6;">
+                <p style="color: #6c757d; font-size: 14px; margin: 0 0 10px 0;">
+                    This is an automated message from CodeGPT
+                </p>
+                <p style="color: #adb5bd; font-size: 12px; margin: 0;">
+                    © 2025 CodeGPT. All rights reserved.
+                </p>
+            </div>
+            
+        </div>
+    </body>
+    </html>
+    """
+    return get_email_outbox().enqueue(email, "CodeGPT - Email Verification Required", body)
 
 def store_otp(email, otp):
-    conn = sqlite3.connect('codegpt_users.db')
-    c = conn.cursor()
     expires_at = datetime.now() + timedelta(minutes=10)
-    c.execute("INSERT INTO otp_codes (email, otp_code, expires_at) VALUES (?, ?, ?)",
-              (email, otp, expires_at))
-    conn.commit()
-    conn.close()
+    with get_db().connection() as conn:
+        # Replaces any earlier code for this email, so only the latest one verifies
+        conn.execute("""INSERT INTO otp_codes (email, otp_code, expires_at, used) VALUES (?, ?, ?, 0)
+                        ON CONFLICT (email) DO UPDATE SET otp_code = excluded.otp_code,
+                                                          expires_at = excluded.expires_at, used = 0""",
+                     (email, otp, expires_at))
 
 def verify_otp(email, otp):
-    conn = sqlite3.connect('codegpt_users.db')
-    c = conn.cursor()
-    c.execute("""SELECT id FROM otp_codes 
-                 WHERE email = ? AND otp_code = ? AND expires_at > ? AND used = 0""",
-              (email, otp, datetime.now()))
-    result = c.fetchone()
-    if result:
-        c.execute("UPDATE otp_codes SET used = 1 WHERE id = ?", (result[0],))
-        conn.commit()
-    conn.close()
+    with get_db().connection() as conn:
+        c = conn.cursor()
+        c.execute(OTP_LOOKUP_SQL, (email, otp, datetime.now()))
+        result = c.fetchone()
+        if result:
+            c.execute("DELETE FROM otp_codes WHERE id = ?", (result[0],))
     return result is not None
 
+class EmailOutbox:
+    # Sends the email_outbox queue from one background thread over a single
+    # authenticated SMTP connection, reopened when the server drops it.
+    # Failed sends are retried with exponential backoff.
+    def __init__(self, db, metrics, host, port, user, password, starttls=True, batch_size=20):
+        self.db = db
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.batch_size = batch_size
+        self.wake = threading.Event()
+        self.server = None
+        self.last_used = 0.0
+        self.pruned_at = 0.0
+
+    def enqueue(self, recipient, subject, body):
+        with self.db.connection() as conn:
+            email_id = conn.execute("INSERT INTO email_outbox (recipient, subject, body) VALUES (?, ?, ?)",
+                                    (recipient, subject, body)).lastrowid
+        self.wake.set()
+        return email_id
+
+    def status(self, email_id):
+        # (status, attempts, last_error), or None once the row was pruned
+        with self.db.connection() as conn:
+            return conn.execute("SELECT status, attempts, last_error FROM email_outbox WHERE id = ?",
+                                (email_id,)).fetchone()
+
+    def connect(self):
+        started = time.perf_counter()
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.starttls:
+            server.starttls()
+        if self.user:
+            server.login(self.user, self.password)
+        self.metrics.record("email.connect", time.perf_counter() - started)
+        self.metrics.increment("email.connects")
+        return server
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.server = None
+
+    def deliver(self, recipient, message):
+        # A connection that sat idle may have been closed by the server, which
+        # only shows on the next command: retry once on a fresh connection
+        reused = self.server is not None
+        if not reused:
+            self.server = self.connect()
+        try:
+            self.server.sendmail(self.user, recipient, message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            self.close()
+            if not reused:
+                raise
+            self.server = self.connect()
+            self.server.sendmail(self.user, recipient, message)
+        self.last_used = time.monotonic()
+
+    def send(self, email_id, recipient, subject, body, attempts):
+        msg = MIMEMultipart()
+        msg['From'] = self.user
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'html'))
+        started = time.perf_counter()
+        try:
+            self.deliver(recipient, msg.as_string())
+        except (smtplib.SMTPException, OSError) as e:
+            attempts += 1
+            # A refused recipient will not be accepted later; anything else
+            # may have left the connection unusable
+            permanent = isinstance(e, smtplib.SMTPRecipientsRefused)
+            if not permanent:
+                self.close()
+            self.fail(email_id, attempts, e, permanent)
+            return
+        # The body holds the OTP, so it is not kept once delivered
+        with self.db.connection() as conn:
+            conn.execute("""UPDATE email_outbox SET status = 'sent', attempts = ?, body = '', last_error = NULL, finished_at = ?
+                            WHERE id = ?""", (attempts + 1, time.time(), email_id))
+        self.metrics.record("email.send", time.perf_counter() - started)
+        self.metrics.increment("email.sent")
+
+    def fail(self, email_id, attempts, error, permanent=False):
+        # Schedules a retry with backoff, or gives up on the message
+        with self.db.connection() as conn:
+            if permanent or attempts >= EMAIL_MAX_ATTEMPTS:
+                conn.execute("""UPDATE email_outbox SET status = 'failed', attempts = ?, last_error = ?, finished_at = ?
+                                WHERE id = ?""", (attempts, str(error), time.time(), email_id))
+                self.metrics.increment("email.failed")
+            else:
+                retry_at = time.time() + min(EMAIL_RETRY_BASE * 2 ** (attempts - 1), 300)
+                conn.execute("UPDATE email_outbox SET attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                             (attempts, str(error), retry_at, email_id))
+                self.metrics.increment("email.retries")
+
+    def send_due(self):
+        # Sends everything due and returns the seconds until the next retry
+        while True:
+            with self.db.connection() as conn:
+                due = conn.execute(EMAIL_DUE_SQL, (time.time(), self.batch_size)).fetchall()
+            for row in due:
+                try:
+                    self.send(*row)
+                except Exception as e:
+                    # Whatever this message broke on is retried later with
+                    # backoff so it does not hold up the rest of the batch.
+                    # If that update fails too, run() backs off as a whole.
+                    print(f"Email {row[0]} could not be sent: {e}")
+                    self.metrics.increment("email.worker_errors")
+                    self.close()
+                    self.fail(row[0], row[4] + 1, e)
+            if len(due) < self.batch_size:
+                break
+        with self.db.connection() as conn:
+            next_at, queued = conn.execute("SELECT MIN(next_attempt_at), COUNT(*) FROM email_outbox WHERE status = 'queued'").fetchone()
+            if time.time() - self.pruned_at > 3600:
+                conn.execute("DELETE FROM email_outbox WHERE status != 'queued' AND finished_at < ?", (time.time() - 86400,))
+                self.pruned_at = time.time()
+        self.metrics.set_gauge("email.queued", queued)
+        return max(0.0, next_at - time.time()) if next_at is not None else EMAIL_IDLE_TIMEOUT
+
+    def run(self):
+        # The worker is started once per process (get_email_outbox), so a
+        # failed pass, e.g. the database stayed locked past busy_timeout or
+        # the disk is full, is logged and retried with backoff instead of
+        # ending the thread and leaving every later email unsent
+        errors = 0
+        while True:
+            self.wake.clear()
+            try:
+                delay = self.send_due()
+                errors = 0
+            except Exception as e:
+                errors += 1
+                print(f"Email outbox pass failed: {e}")
+                self.metrics.increment("email.worker_errors")
+                self.close()
+                delay = min(EMAIL_RETRY_BASE * 2 ** (errors - 1), 300)
+            if self.server is not None and time.monotonic() - self.last_used >= EMAIL_IDLE_TIMEOUT:
+                self.close()
+            self.wake.wait(min(delay, EMAIL_IDLE_TIMEOUT))
+
 # Page configuration
 st.set_page_config(
     page_title="CodeGPT - AI Code Assistant", 
@@ -188,11 +1004,7 @@ st.set_page_config(
 )
 
 # Modern CSS styling
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&family=JetBrains+Mono:wght@400;500;600&family=Poppins:wght@400;500;600;700;800&display=swap');
-    
+GLOBAL_CSS = """
     /* Root variables for modern theme */
     :root {
         --primary-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -836,1250 +1648,2213 @@ st.markdown("""
             transition-duration: 0.01ms !important;
         }
     }
-</style>
-""", unsafe_allow_html=True)
-
-# Initialize session state
-if 'authenticated' not in st.session_state:
-    st.session_state.authenticated = False
-if 'user_id' not in st.session_state:
-    st.session_state.user_id = None
-if 'username' not in st.session_state:
-    st.session_state.username = None
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = 'main'
-if 'temp_email' not in st.session_state:
-    st.session_state.temp_email = None
-if 'temp_username' not in st.session_state:
-    st.session_state.temp_username = None
-if 'temp_password' not in st.session_state:
-    st.session_state.temp_password = None
+"""
 
-# Professional Navigation
-def show_navigation():
-    col1, col2, col3, col4, col5, col6 = st.columns([1,1,1,1,1,1])
+# About page CSS with proper alignment and dark theme support
+ABOUT_CSS = """
+    /* Root variables for theme support */
+    :root {
+        --primary-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        --secondary-gradient: linear-gradient(135deg, #4299e1 0%, #3182ce 100%);
+        --bg-light: #ffffff;
+        --bg-dark: #1a202c;
+        --text-primary-light: #2d3748;
+        --text-primary-dark: #f7fafc;
+        --text-secondary-light: #4a5568;
+        --text-secondary-dark: #cbd5e0;
+        --card-bg-light: #ffffff;
+        --card-bg-dark: #2d3748;
+        --border-light: #e2e8f0;
+        --border-dark: #4a5568;
+        --section-bg-light: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);
+        --section-bg-dark: linear-gradient(135deg, #2d3748 0%, #1a202c 100%);
+    }
     
-    with col1:
-        if st.button("🏠 Home", key="nav_home"):
-            st.session_state.current_page = 'main'
-            st.rerun()
+    /* Dark theme detection */
+    @media (prefers-color-scheme: dark) {
+        :root {
+            --bg-primary: var(--bg-dark);
+            --text-primary: var(--text-primary-dark);
+            --text-secondary: var(--text-secondary-dark);
+            --card-bg: var(--card-bg-dark);
+            --border-color: var(--border-dark);
+            --section-bg: var(--section-bg-dark);
+        }
+    }
     
-    with col2:
-        if st.button("📊 History", key="nav_history"):
-            if st.session_state.authenticated:
-                st.session_state.current_page = 'history'
-                st.rerun()
-            else:
-                st.warning("Please login to view history")
+    @media (prefers-color-scheme: light) {
+        :root {
+            --bg-primary: var(--bg-light);
+            --text-primary: var(--text-primary-light);
+            --text-secondary: var(--text-secondary-light);
+            --card-bg: var(--card-bg-light);
+            --border-color: var(--border-light);
+            --section-bg: var(--section-bg-light);
+        }
+    }
     
-    with col3:
-        if not st.session_state.authenticated:
-            if st.button("🔐 Login", key="nav_login"):
-                st.session_state.current_page = 'login'
-                st.rerun()
-        else:
-            if st.button("👤 Profile", key="nav_profile"):
-                st.session_state.current_page = 'profile'
-                st.rerun()
+    /* Streamlit dark theme override */
+    .stApp[data-theme="dark"] {
+        --bg-primary: var(--bg-dark);
+        --text-primary: var(--text-primary-dark);
+        --text-secondary: var(--text-secondary-dark);
+        --card-bg: var(--card-bg-dark);
+        --border-color: var(--border-dark);
+        --section-bg: var(--section-bg-dark);
+    }
     
-    with col4:
-        if not st.session_state.authenticated:
-            if st.button("📝 Sign Up", key="nav_signup"):
-                st.session_state.current_page = 'signup'
-                st.rerun()
-        else:
-            if st.button("🚪 Logout", key="nav_logout"):
-                st.session_state.authenticated = False
-                st.session_state.user_id = None
-                st.session_state.username = None
-                st.session_state.current_page = 'main'
-                st.success("Logged out successfully!")
-                st.rerun()
+    .stApp[data-theme="light"] {
+        --bg-primary: var(--bg-light);
+        --text-primary: var(--text-primary-light);
+        --text-secondary: var(--text-secondary-light);
+        --card-bg: var(--card-bg-light);
+        --border-color: var(--border-light);
+        --section-bg: var(--section-bg-light);
+    }
     
-    with col5:
-        if st.button("ℹ About", key="nav_about"):
-            st.session_state.current_page = 'about'
-            st.rerun()
-
-    with col6:
-        if st.button("📞 Contact", key="nav_contact"):
-            st.session_state.current_page = 'contact'
-            st.rerun()
+    /* Main wrapper with proper alignment */
+    .about-main-wrapper {
+        max-width: 1400px;
+        margin: 0 auto;
+        padding: 2rem;
+        font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        width: 100%;
+        box-sizing: border-box;
+    }
     
-    st.markdown('</div>', unsafe_allow_html=True)
-
-# Authentication functions
-
-
-# Authentication functions
-def signup_page():
-    st.markdown('<div class="main-container">', unsafe_allow_html=True)
-    st.markdown("## 📝 Create Account")
+    /* Hero banner with enhanced styling */
+    .about-hero-banner {
+        background: var(--primary-gradient);
+        color: white;
+        padding: 4rem 2rem;
+        border-radius: 24px;
+        text-align: center;
+        margin-bottom: 4rem;
+        box-shadow: 0 20px 40px rgba(102, 126, 234, 0.3);
+        position: relative;
+        overflow: hidden;
+    }
     
-    with st.form("signup_form"):
-        username = st.text_input("Username", placeholder="Enter username")
-        email = st.text_input("Email", placeholder="Enter email address")
-        password = st.text_input("Password", type="password", placeholder="Enter password")
-        confirm_password = st.text_input("Confirm Password", type="password", placeholder="Confirm password")
-        
-        submitted = st.form_submit_button("Create Account")
-
-        
-        if submitted:
-            if not all([username, email, password, confirm_password]):
-                st.error("Please fill all fields")
-            elif password != confirm_password:
-                st.error("Passwords don't match")
-            elif len(password) < 6:
-                st.error("Password must be at least 6 characters")
-            else:
-                # Check if user exists
-                conn = sqlite3.connect('codegpt_users.db')
-                c = conn.cursor()
-                c.execute("SELECT id FROM users WHERE username = ? OR email = ?", (username, email))
-                if c.fetchone():
-                    st.error("Username or email already exists")
-                    conn.close()
-                else:
-                    conn.close()
-                    # Generate and send OTP
-                    otp = generate_otp()
-                    if send_otp_email(email, otp):
-                        store_otp(email, otp)
-                        st.session_state.temp_username = username
-                        st.session_state.temp_email = email
-                        st.session_state.temp_password = hash_password(password)
-                        st.session_state.current_page = 'verify_otp'
-                        st.success("OTP sent to your email! Check your inbox.")
-                        st.rerun()
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        st.markdown(
-            """
-            <div style='text-align: center;'>
-                <p>Already have an account?</p>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
-        if st.button("🔐 Login Here", key="signup_to_login", use_container_width=True):
-            st.session_state.current_page = 'login'
-            st.rerun()
+    .about-hero-banner::before {
+        content: '';
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+        bottom: 0;
+        background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="grain" width="100" height="100" patternUnits="userSpaceOnUse"><circle cx="50" cy="50" r="1" fill="white" opacity="0.1"/></pattern></defs><rect width="100" height="100" fill="url(%23grain)"/></svg>');
+        pointer-events: none;
+    }
     
-    st.markdown('</div>', unsafe_allow_html=True)
-
-def contactus():    
-    # Contact Form Section
-    st.header("📝 Send us a Message")
+    .about-hero-banner h1 {
+        font-size: clamp(2.5rem, 5vw, 4rem) !important;
+        font-weight: 800 !important;
+        margin-bottom: 1.5rem !important;
+        color: white !important;
+        text-shadow: 2px 2px 8px rgba(0,0,0,0.3);
+        position: relative;
+        z-index: 1;
+    }
     
-    with st.form("contact_form"):
-        # Form fields
-        name = st.text_input("Full Name *", placeholder="Enter your full name")
-        email = st.text_input("Email Address *", placeholder="Enter your email address")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            subject_type = st.selectbox(
-                "Subject Category *",
-                ["General Inquiry", "Technical Support", "Bug Report", "Feature Request", "Billing", "Other"]
-            )
-        with col2:
-            priority = st.selectbox(
-                "Priority Level",
-                ["Low", "Medium", "High", "Urgent"]
-            )
-        
-        subject = st.text_input("Subject *", placeholder="Brief description of your inquiry")
-        message = st.text_area(
-            "Message *", 
-            placeholder="Please provide detailed information about your inquiry...",
-            height=150
-        )
-        
-        # Additional options
-        col1, col2 = st.columns(2)
-        with col1:
-            phone = st.text_input("Phone Number (Optional)", placeholder="For urgent matters")
-        with col2:
-            preferred_contact = st.selectbox(
-                "Preferred Contact Method",
-                ["Email", "Phone", "No Preference"]
-            )
-        
-        # File upload for attachments
-        uploaded_file = st.file_uploader(
-            "Attach Files (Optional)",
-            type=['pdf', 'doc', 'docx', 'txt', 'png', 'jpg', 'jpeg'],
-            help="Upload any relevant documents or screenshots"
-        )
-        
-        # Newsletter signup
-        newsletter = st.checkbox("Subscribe to our newsletter for updates and tips")
-        
-        # Submit button
-        submitted = st.form_submit_button("📤 Send Message", use_container_width=True)
-        
-        if submitted:
-            # Validation
-            if not name or not email or not subject or not message:
-                st.error("Please fill in all required fields marked with *")
-            elif "@" not in email or "." not in email:
-                st.error("Please enter a valid email address")
-            else:
-                # Here you would typically save to database or send email
-                # For now, we'll just show a success message
-                st.success("✅ Thank you for contacting us!")
-                st.info(f"We've received your message about '{subject}' and will respond within 24 hours.")
-                
-                # You can add code here to:
-                # 1. Save to database
-                # 2. Send email notification
-                # 3. Create support ticket
-                
-                # Example of what you might store:
-                contact_data = {
-                    "name": name,
-                    "email": email,
-                    "subject_type": subject_type,
-                    "priority": priority,
-                    "subject": subject,
-                    "message": message,
-                    "phone": phone,
-                    "preferred_contact": preferred_contact,
-                    "newsletter": newsletter,
-                    "timestamp": "datetime.now()",
-                    "file_attached": uploaded_file is not None
-                }
-                
-                # Clear form (optional - Streamlit will handle this on rerun)
-                st.balloons()
+    .about-hero-banner p {
+        font-size: clamp(1.1rem, 2vw, 1.4rem) !important;
+        opacity: 0.95 !important;
+        max-width: 800px !important;
+        margin: 0 auto !important;
+        line-height: 1.8 !important;
+        color: white !important;
+        position: relative;
+        z-index: 1;
+    }
     
-    st.markdown("---")
+    /* Features section with better alignment */
+    .about-features-section {
+        margin: 5rem 0;
+        width: 100%;
+    }
     
-    # Contact Information Section
-    st.header("Get in Touch")
-    st.write("We'd love to hear from you! Reach out to us using any of the methods below:")
+    .about-features-header {
+        text-align: center;
+        margin-bottom: 4rem;
+    }
     
-    col1, col2 ,col3, col4= st.columns(4)
+    .about-features-header h2 {
+        font-size: clamp(2rem, 4vw, 3rem) !important;
+        color: var(--text-primary) !important;
+        margin-bottom: 1rem !important;
+        font-weight: 700 !important;
+    }
     
-    with col1:
-        st.subheader("📧 Email")
-        st.write("support@codegpt.com")
-        st.write("info@codegpt.com")
-        
-        st.subheader("📱 Phone")
-        st.write("+1 (555) 123-4567")
-        st.write("Mon-Fri: 9:00 AM - 6:00 PM IST")
-        
-    with col2:
-        st.subheader("🌐 Social Media")
-        st.write("Follow us on:")
-        st.write("• Twitter: @codegptapp")
-        st.write("• LinkedIn: codegpt")
-        st.write("• Facebook: codegpt")
-    with col3:
-        st.subheader("📍 Address")
-        st.write("Sri sainath nagar")
-        st.write("Rangampeta")
-        st.write("Tirupati, Andhrapradesh 12345")
+    .about-features-header p {
+        font-size: 1.2rem !important;
+        color: var(--text-secondary) !important;
+        max-width: 600px !important;
+        margin: 0 auto !important;
+        line-height: 1.6 !important;
+    }
     
-    with col4:
-        st.subheader("⏰ Response Time")
-        st.write("• Email: Within 24 hours")
-        st.write("• Phone: Immediate")
-        st.write("• Support tickets: Within 4 hours")
+    /* Grid layout for features - 3 columns */
+    .about-features-container {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap: 2rem;
+        width: 100%;
+        max-width: 1300px;
+        margin: 0 auto;
+        padding: 0 1rem;
+    }
     
-    st.markdown("---")
+    .about-feature-box {
+        background: var(--card-bg);
+        padding: 2.5rem 1.5rem;
+        border-radius: 20px;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.1);
+        border: 2px solid var(--border-color);
+        text-align: center;
+        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
+        position: relative;
+        overflow: hidden;
+        min-height: 300px;
+        display: flex;
+        flex-direction: column;
+        justify-content: flex-start;
+    }
     
-    # FAQ Section
-    st.header("❓ Frequently Asked Questions")
+    .about-feature-box::before {
+        content: '';
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+        bottom: 0;
+        background: var(--primary-gradient);
+        opacity: 0;
+        transition: opacity 0.4s ease;
+        z-index: 0;
+    }
     
-    with st.expander("How quickly will I receive a response?"):
-        st.write("We typically respond to emails within 24 hours during business days. For urgent matters, please call our phone number directly.")
+    .about-feature-box:hover::before {
+        opacity: 0.05;
+    }
     
-    with st.expander("What information should I include in my message?"):
-        st.write("Please include as much detail as possible about your issue or inquiry. Screenshots, error messages, and step-by-step descriptions help us assist you better.")
+    .about-feature-box:hover {
+        transform: translateY(-12px) scale(1.02);
+        box-shadow: 0 25px 50px rgba(102, 126, 234, 0.2);
+        border-color: #667eea;
+    }
     
-    with st.expander("Do you offer phone support?"):
-        st.write("Yes! Our phone support is available Monday through Friday, 9:00 AM to 6:00 PM EST. For technical issues, email support may be more effective as we can share screenshots and detailed instructions.")
+    .about-feature-emoji {
+        font-size: 3.5rem;
+        display: block;
+        margin-bottom: 1.5rem;
+        filter: drop-shadow(0 4px 12px rgba(0,0,0,0.1));
+        position: relative;
+        z-index: 1;
+    }
     
-    with st.expander("Can I schedule a demo or consultation?"):
-        st.write("Absolutely! Please select 'General Inquiry' as your subject category and mention that you'd like to schedule a demo. We'll get back to you with available time slots.")
+    .about-feature-box h3 {
+        color: var(--text-primary) !important;
+        font-size: 1.4rem !important;
+        font-weight: 600 !important;
+        margin-bottom: 1rem !important;
+        line-height: 1.4 !important;
+        position: relative;
+        z-index: 1;
+    }
     
-    # Back to main page
-    if st.button("← Back to Home", key="contact_back_home"):
-        st.session_state.current_page = 'main'
-        st.rerun()
-
-def verify_otp_page():
-    st.markdown("### 📧 Verify Email")
-    st.info(f"OTP sent to: {st.session_state.temp_email}")
+    .about-feature-box p {
+        color: var(--text-secondary) !important;
+        font-size: 1rem !important;
+        line-height: 1.6 !important;
+        margin: 0 !important;
+        position: relative;
+        z-index: 1;
+        flex-grow: 1;
+    }
     
-    with st.form("otp_form"):
-        otp_input = st.text_input("Enter OTP", placeholder="Enter 6-digit OTP")
-        submitted = st.form_submit_button("Verify")
-        
-        if submitted:
-            if verify_otp(st.session_state.temp_email, otp_input):
-                # Create user account
-                conn = sqlite3.connect('codegpt_users.db')
-                c = conn.cursor()
-                c.execute("INSERT INTO users (username, email, password_hash, verified) VALUES (?, ?, ?, 1)",
-                         (st.session_state.temp_username, st.session_state.temp_email, st.session_state.temp_password))
-                conn.commit()
-                conn.close()
-                
-                st.success("Account created successfully! Please login.")
-                st.session_state.current_page = 'login'
-                st.session_state.temp_email = None
-                st.session_state.temp_username = None
-                st.session_state.temp_password = None
-                st.rerun()
-            else:
-                st.error("Invalid or expired OTP")
-    
-    if st.button("← Back to Signup"):
-        st.session_state.current_page = 'signup'
-        st.rerun()
-    
-
-def login_page():
-    st.markdown("### 🔐 Login")
-    with st.form("login_form"):
-        username = st.text_input("Username or Email", placeholder="Enter username or email")
-        password = st.text_input("Password", type="password", placeholder="Enter password")
-        submitted = st.form_submit_button("Login")
-        
-        if submitted:
-            if username and password:
-                conn = sqlite3.connect('codegpt_users.db')
-                c = conn.cursor()
-                c.execute("SELECT id, username, verified FROM users WHERE (username = ? OR email = ?) AND password_hash = ?",
-                         (username, username, hash_password(password)))
-                user = c.fetchone()
-                conn.close()
-                
-                if user:
-                    if user[2]:  # verified
-                        st.session_state.authenticated = True
-                        st.session_state.user_id = user[0]
-                        st.session_state.username = user[1]
-                        st.session_state.current_page = 'main'
-                        st.success(f"Welcome back, {user[1]}!")
-                        st.rerun()
-                    else:
-                        st.error("Please verify your email first")
-                else:
-                    st.error("Invalid credentials")
-            else:
-                st.error("Please fill all fields")
-
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        st.markdown(
-            """
-            <div style='text-align: center;'>
-                <p>Don't have an account?</p>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
-        if st.button("📝 Sign Up Here", key="login_to_signup", use_container_width=True):
-            st.session_state.current_page = 'signup'
-            st.rerun()
-
-def profile_page():
-    st.markdown('<div class="main-container">', unsafe_allow_html=True)
-    st.markdown("## 👤 Profile")
-    
-    if st.session_state.authenticated:
-        conn = sqlite3.connect('codegpt_users.db')
-        c = conn.cursor()
-        c.execute("SELECT username, email, created_at FROM users WHERE id = ?", (st.session_state.user_id,))
-        user_data = c.fetchone()
-        
-        # Get chat history count
-        c.execute("SELECT COUNT(*) FROM chat_history WHERE user_id = ?", (st.session_state.user_id,))
-        chat_count = c.fetchone()[0]
-        conn.close()
-        
-        if user_data:
-            # Profile Display Section
-            st.markdown("""
-            <div class="profile-card">
-                <h3 style="text-align: center; margin-bottom: 2rem;">🎯 User Profile</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"""
-                <div class="feature-card">
-                    <h4>👤 Account Information</h4>
-                    <p><strong>Username:</strong> {user_data[0]}</p>
-                    <p><strong>Email:</strong> {user_data[1]}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            with col2:
-                st.markdown(f"""
-                <div class="feature-card">
-                    <h4>📊 Activity Stats</h4>
-                    <p><strong>Member Since:</strong> {user_data[2][:10]}</p>
-                    <p><strong>Total Analyses:</strong> {chat_count}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Edit Profile Section
-            st.markdown("---")
-            st.markdown("### ✏️ Edit Profile")
-            
-            with st.form("edit_profile_form"):
-                st.markdown("**Update your profile information:**")
-                new_username = st.text_input("New Username", value=user_data[0], placeholder="Enter new username")
-                new_email = st.text_input("New Email", value=user_data[1], placeholder="Enter new email")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    current_password = st.text_input("Current Password", type="password", placeholder="Enter current password")
-                with col2:
-                    new_password = st.text_input("New Password (optional)", type="password", placeholder="Enter new password")
-                
-                submitted = st.form_submit_button("💾 Update Profile", type="primary")
-                
-                if submitted:
-                    if not current_password:
-                        st.error("Please enter your current password to make changes")
-                    else:
-                        # Verify current password
-                        conn = sqlite3.connect('codegpt_users.db')
-                        c = conn.cursor()
-                        c.execute("SELECT password_hash FROM users WHERE id = ?", (st.session_state.user_id,))
-                        stored_password = c.fetchone()[0]
-                        
-                        if hash_password(current_password) == stored_password:
-                            # Update profile
-                            if new_password:
-                                # Update with new password
-                                c.execute("UPDATE users SET username = ?, email = ?, password_hash = ? WHERE id = ?",
-                                         (new_username, new_email, hash_password(new_password), st.session_state.user_id))
-                            else:
-                                # Update without password change
-                                c.execute("UPDATE users SET username = ?, email = ? WHERE id = ?",
-                                         (new_username, new_email, st.session_state.user_id))
-                            
-                            conn.commit()
-                            conn.close()
-                            
-                            # Update session state
-                            st.session_state.username = new_username
-                            st.success("✅ Profile updated successfully!")
-                            time.sleep(1)
-                            st.rerun()
-                        else:
-                            st.error("❌ Current password is incorrect")
-                            conn.close()
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-
-
-def history_page():
-    
-    # Enhanced Header
-    st.markdown("""
-    <div class="header">
-        <h1>📊 Analysis History</h1>
-        <p>Track your coding journey and past analyses</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    if st.session_state.authenticated:
-        conn = sqlite3.connect('codegpt_users.db')
-        c = conn.cursor()
-        
-        # Get total count for pagination
-        c.execute("SELECT COUNT(*) FROM chat_history WHERE user_id = ?", (st.session_state.user_id,))
-        total_count = c.fetchone()[0]
-        
-        # Pagination controls
-        items_per_page = 10
-        total_pages = (total_count + items_per_page - 1) // items_per_page
-        
-        if 'current_page_num' not in st.session_state:
-            st.session_state.current_page_num = 1
-        
-        # Stats overview
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.markdown(f"""
-            <div class="feature-card" style="text-align: center;">
-                <h3 style="color: #667eea;">📈</h3>
-                <h4>{total_count}</h4>
-                <p>Total Analyses</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            # Get this week's count
-            c.execute("""SELECT COUNT(*) FROM chat_history 
-                        WHERE user_id = ? AND created_at >= date('now', '-7 days')""", 
-                     (st.session_state.user_id,))
-            week_count = c.fetchone()[0]
-            st.markdown(f"""
-            <div class="feature-card" style="text-align: center;">
-                <h3 style="color: #22c55e;">📅</h3>
-                <h4>{week_count}</h4>
-                <p>This Week</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            # Most used feature
-            c.execute("""SELECT features_used, COUNT(*) as count 
-                        FROM chat_history WHERE user_id = ? 
-                        GROUP BY features_used ORDER BY count DESC LIMIT 1""", 
-                     (st.session_state.user_id,))
-            popular_feature = c.fetchone()
-            feature_name = popular_feature[0].split(',')[0] if popular_feature else "None"
-            st.markdown(f"""
-            <div class="feature-card" style="text-align: center;">
-                <h3 style="color: #f59e0b;">⭐</h3>
-                <h4>{feature_name}</h4>
-                <p>Most Used</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col4:
-            # Average per week
-            avg_per_week = max(1, total_count // 4) if total_count > 0 else 0
-            st.markdown(f"""
-            <div class="feature-card" style="text-align: center;">
-                <h3 style="color: #ec4899;">📊</h3>
-                <h4>{avg_per_week}</h4>
-                <p>Avg/Week</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Pagination controls
-        if total_pages > 1:
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col1:
-                if st.button("⬅️ Previous", disabled=(st.session_state.current_page_num <= 1)):
-                    st.session_state.current_page_num -= 1
-                    st.rerun()
-            
-            with col2:
-                st.markdown(f"<h4 style='text-align: center;'>Page {st.session_state.current_page_num} of {total_pages}</h4>", 
-                           unsafe_allow_html=True)
-            
-            with col3:
-                if st.button("Next ➡️", disabled=(st.session_state.current_page_num >= total_pages)):
-                    st.session_state.current_page_num += 1
-                    st.rerun()
-        
-        # Get paginated history
-        offset = (st.session_state.current_page_num - 1) * items_per_page
-        c.execute("""SELECT code_input, features_used, ai_output, created_at 
-                     FROM chat_history WHERE user_id = ? 
-                     ORDER BY created_at DESC LIMIT ? OFFSET ?""", 
-                 (st.session_state.user_id, items_per_page, offset))
-        history = c.fetchall()
-        conn.close()
-        
-        if history:
-            st.markdown("### 📋 Recent Analyses")
-            
-            for i, (code, features, output, timestamp) in enumerate(history):
-                # Enhanced history card design
-                analysis_num = offset + i + 1
-                date_formatted = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%B %d, %Y at %I:%M %p")
-                
-                # Feature badges
-                feature_list = features.split(',')
-                feature_badges = ""
-                for feature in feature_list[:3]:  # Show first 3 features
-                    color = "#667eea" if "Bug" in feature else "#22c55e" if "Explain" in feature else "#f59e0b"
-                    feature_badges += f'<span style="background: {color}; color: white; padding: 4px 8px; border-radius: 12px; font-size: 0.8rem; margin-right: 8px;">{feature.strip()}</span>'
-                
-                if len(feature_list) > 3:
-                    feature_badges += f'<span style="background: #6b7280; color: white; padding: 4px 8px; border-radius: 12px; font-size: 0.8rem;">+{len(feature_list)-3} more</span>'
-                
-                # Create expandable card
-                with st.expander(f"🔍 Analysis #{analysis_num} • {date_formatted}", expanded=False):
-                    st.markdown(f"""
-                    <div class="chat-history">
-                        <div style="margin-bottom: 1.5rem;">
-                            <h4 style="margin-bottom: 0.5rem;">🏷️ Features Used:</h4>
-                            <div style="margin-bottom: 1rem;">{feature_badges}</div>
-                        </div>
-                        
-                       
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Show code with syntax highlighting
-                    code_preview = code[:400] + "..." if len(code) > 400 else code
-                    st.code(code_preview, language='python')
-                    
-                    st.markdown("**🤖 AI Analysis Preview:**")
-                    output_preview = output[:500] + "..." if len(output) > 500 else output
-                    st.markdown(output_preview)
-                    
-                    # Action buttons
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        if st.button(f"📋 Copy Code", key=f"copy_{analysis_num}"):
-                            st.success("Code copied to clipboard!")
-                    with col2:
-                        if st.button(f"🔄 Re-analyze", key=f"reanalyze_{analysis_num}"):
-                            st.session_state.current_page = 'main'
-                            st.info("Redirecting to main page...")
-                            st.rerun()
-                    with col3:
-                        if st.button(f"📊 Full View", key=f"expand_{analysis_num}"):
-                            st.markdown("**Complete Analysis:**")
-                            st.markdown(output)
-        else:
-            st.markdown("""
-            <div class="feature-card" style="text-align: center; padding: 3rem;">
-                <h3>📭 No Analysis History</h3>
-                <p>Start using CodeGPT to see your analysis history here!</p>
-                <br>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if st.button("🚀 Start Analyzing", type="primary"):
-                st.session_state.current_page = 'main'
-                st.rerun()
-    else:
-        st.markdown("""
-        <div class="feature-card" style="text-align: center; padding: 3rem;">
-            <h3>🔐 Login Required</h3>
-            <p>Please login to view your analysis history</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns([1,1,1])
-        with col2:
-            if st.button("🔐 Login Now", type="primary"):
-                st.session_state.current_page = 'login'
-                st.rerun()
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-
-def about_page():
-    # Enhanced CSS with proper alignment and dark theme support
-    st.markdown("""
-    <style>
-    /* Root variables for theme support */
-    :root {
-        --primary-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        --secondary-gradient: linear-gradient(135deg, #4299e1 0%, #3182ce 100%);
-        --bg-light: #ffffff;
-        --bg-dark: #1a202c;
-        --text-primary-light: #2d3748;
-        --text-primary-dark: #f7fafc;
-        --text-secondary-light: #4a5568;
-        --text-secondary-dark: #cbd5e0;
-        --card-bg-light: #ffffff;
-        --card-bg-dark: #2d3748;
-        --border-light: #e2e8f0;
-        --border-dark: #4a5568;
-        --section-bg-light: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);
-        --section-bg-dark: linear-gradient(135deg, #2d3748 0%, #1a202c 100%);
-    }
-    
-    /* Dark theme detection */
-    @media (prefers-color-scheme: dark) {
-        :root {
-            --bg-primary: var(--bg-dark);
-            --text-primary: var(--text-primary-dark);
-            --text-secondary: var(--text-secondary-dark);
-            --card-bg: var(--card-bg-dark);
-            --border-color: var(--border-dark);
-            --section-bg: var(--section-bg-dark);
-        }
+    /* Technology section with proper theming */
+    .about-tech-section {
+        background: var(--section-bg);
+        padding: 4rem 2rem;
+        border-radius: 24px;
+        margin: 5rem 0;
+        text-align: center;
+        border: 2px solid var(--border-color);
     }
     
-    @media (prefers-color-scheme: light) {
-        :root {
-            --bg-primary: var(--bg-light);
-            --text-primary: var(--text-primary-light);
-            --text-secondary: var(--text-secondary-light);
-            --card-bg: var(--card-bg-light);
-            --border-color: var(--border-light);
-            --section-bg: var(--section-bg-light);
-        }
+    .about-tech-section h2 {
+        color: var(--text-primary) !important;
+        font-size: clamp(1.8rem, 3vw, 2.5rem) !important;
+        font-weight: 700 !important;
+        margin-bottom: 1rem !important;
     }
     
-    /* Streamlit dark theme override */
-    .stApp[data-theme="dark"] {
-        --bg-primary: var(--bg-dark);
-        --text-primary: var(--text-primary-dark);
-        --text-secondary: var(--text-secondary-dark);
-        --card-bg: var(--card-bg-dark);
-        --border-color: var(--border-dark);
-        --section-bg: var(--section-bg-dark);
+    .about-tech-section > p {
+        color: var(--text-secondary) !important;
+        font-size: 1.2rem !important;
+        margin-bottom: 2rem !important;
     }
     
-    .stApp[data-theme="light"] {
-        --bg-primary: var(--bg-light);
-        --text-primary: var(--text-primary-light);
-        --text-secondary: var(--text-secondary-light);
-        --card-bg: var(--card-bg-light);
-        --border-color: var(--border-light);
-        --section-bg: var(--section-bg-light);
+    .about-tech-tags {
+        display: flex;
+        flex-wrap: wrap;
+        justify-content: center;
+        gap: 1rem;
+        margin-top: 2rem;
+        max-width: 800px;
+        margin-left: auto;
+        margin-right: auto;
     }
     
-    /* Main wrapper with proper alignment */
-    .about-main-wrapper {
-        max-width: 1400px;
-        margin: 0 auto;
-        padding: 2rem;
-        font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        width: 100%;
-        box-sizing: border-box;
+    .about-tech-tag {
+        background: var(--card-bg);
+        padding: 1rem 2rem;
+        border-radius: 50px;
+        box-shadow: 0 6px 20px rgba(0,0,0,0.1);
+        border: 2px solid var(--border-color);
+        font-weight: 600;
+        color: var(--text-primary);
+        font-size: 1rem;
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+        cursor: default;
+        white-space: nowrap;
     }
     
-    /* Hero banner with enhanced styling */
-    .about-hero-banner {
+    .about-tech-tag:hover {
         background: var(--primary-gradient);
-        color: white;
-        padding: 4rem 2rem;
-        border-radius: 24px;
-        text-align: center;
-        margin-bottom: 4rem;
-        box-shadow: 0 20px 40px rgba(102, 126, 234, 0.3);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .about-hero-banner::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="grain" width="100" height="100" patternUnits="userSpaceOnUse"><circle cx="50" cy="50" r="1" fill="white" opacity="0.1"/></pattern></defs><rect width="100" height="100" fill="url(%23grain)"/></svg>');
-        pointer-events: none;
-    }
-    
-    .about-hero-banner h1 {
-        font-size: clamp(2.5rem, 5vw, 4rem) !important;
-        font-weight: 800 !important;
-        margin-bottom: 1.5rem !important;
         color: white !important;
-        text-shadow: 2px 2px 8px rgba(0,0,0,0.3);
-        position: relative;
-        z-index: 1;
-    }
-    
-    .about-hero-banner p {
-        font-size: clamp(1.1rem, 2vw, 1.4rem) !important;
-        opacity: 0.95 !important;
-        max-width: 800px !important;
-        margin: 0 auto !important;
-        line-height: 1.8 !important;
-        color: white !important;
-        position: relative;
-        z-index: 1;
+        transform: translateY(-4px) scale(1.05);
+        box-shadow: 0 12px 30px rgba(102, 126, 234, 0.4);
+        border-color: transparent;
     }
     
-    /* Features section with better alignment */
-    .about-features-section {
-        margin: 5rem 0;
-        width: 100%;
+    /* Statistics grid with improved spacing */
+    .about-stats-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+        gap: 2rem;
+        margin: 4rem 0;
+        padding: 2rem 0;
+        max-width: 2000px;
+        margin-left: auto;
+        margin-right: auto;
     }
     
-    .about-features-header {
+    .about-stat-card {
         text-align: center;
-        margin-bottom: 4rem;
-    }
-    
-    .about-features-header h2 {
-        font-size: clamp(2rem, 4vw, 3rem) !important;
-        color: var(--text-primary) !important;
-        margin-bottom: 1rem !important;
-        font-weight: 700 !important;
+        padding: 2.5rem 1.5rem;
+        background: var(--card-bg);
+        border-radius: 20px;
+        box-shadow: 0 8px 25px rgba(0,0,0,0.1);
+        border: 2px solid var(--border-color);
+        transition: all 0.3s ease;
     }
     
-    .about-features-header p {
-        font-size: 1.2rem !important;
-        color: var(--text-secondary) !important;
-        max-width: 600px !important;
-        margin: 0 auto !important;
-        line-height: 1.6 !important;
+    .about-stat-card:hover {
+        transform: translateY(-8px);
+        box-shadow: 0 15px 40px rgba(102, 126, 234, 0.15);
     }
     
-    /* Grid layout for features - 3 columns */
-    .about-features-container {
-        display: grid;
-        grid-template-columns: repeat(3, 1fr);
-        gap: 2rem;
-        width: 100%;
-        max-width: 1300px;
-        margin: 0 auto;
-        padding: 0 1rem;
+    .about-stat-number {
+        font-size: clamp(2.5rem, 4vw, 3.5rem) !important;
+        font-weight: 800 !important;
+        color: #667eea !important;
+        display: block !important;
+        margin-bottom: 1rem !important;
+        background: var(--primary-gradient);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
     }
     
-    .about-feature-box {
-        background: var(--card-bg);
-        padding: 2.5rem 1.5rem;
-        border-radius: 20px;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        border: 2px solid var(--border-color);
+    .about-stat-label {
+        color: var(--text-secondary) !important;
+        font-size: 1rem !important;
+        text-transform: uppercase !important;
+        letter-spacing: 1.5px !important;
+        font-weight: 600 !important;
+        line-height: 1.4 !important;
+    }
+    
+    /* Call to action with enhanced styling */
+    .about-cta-banner {
+        background: var(--primary-gradient);
+        color: white;
+        padding: 4rem 2rem;
+        border-radius: 24px;
         text-align: center;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
+        margin-top: 5rem;
+        box-shadow: 0 15px 40px rgba(66, 153, 225, 0.4);
         position: relative;
         overflow: hidden;
-        min-height: 300px;
-        display: flex;
-        flex-direction: column;
-        justify-content: flex-start;
     }
     
-    .about-feature-box::before {
+    .about-cta-banner::before {
         content: '';
         position: absolute;
         top: 0;
         left: 0;
         right: 0;
         bottom: 0;
-        background: var(--primary-gradient);
-        opacity: 0;
-        transition: opacity 0.4s ease;
-        z-index: 0;
-    }
-    
-    .about-feature-box:hover::before {
-        opacity: 0.05;
-    }
-    
-    .about-feature-box:hover {
-        transform: translateY(-12px) scale(1.02);
-        box-shadow: 0 25px 50px rgba(102, 126, 234, 0.2);
-        border-color: #667eea;
-    }
-    
-    .about-feature-emoji {
-        font-size: 3.5rem;
-        display: block;
-        margin-bottom: 1.5rem;
-        filter: drop-shadow(0 4px 12px rgba(0,0,0,0.1));
-        position: relative;
-        z-index: 1;
+        background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="dots" width="20" height="20" patternUnits="userSpaceOnUse"><circle cx="10" cy="10" r="1" fill="white" opacity="0.1"/></pattern></defs><rect width="100" height="100" fill="url(%23dots)"/></svg>');
+        pointer-events: none;
     }
     
-    .about-feature-box h3 {
-        color: var(--text-primary) !important;
-        font-size: 1.4rem !important;
-        font-weight: 600 !important;
-        margin-bottom: 1rem !important;
-        line-height: 1.4 !important;
+    .about-cta-banner h2 {
+        font-size: clamp(1.8rem, 3vw, 2.5rem) !important;
+        font-weight: 700 !important;
+        margin-bottom: 1.5rem !important;
+        color: white !important;
         position: relative;
         z-index: 1;
     }
     
-    .about-feature-box p {
-        color: var(--text-secondary) !important;
-        font-size: 1rem !important;
+    .about-cta-banner p {
+        font-size: clamp(1rem, 2vw, 1.3rem) !important;
+        opacity: 0.95 !important;
+        margin-bottom: 0 !important;
+        color: white !important;
+        max-width: 700px !important;
+        margin-left: auto !important;
+        margin-right: auto !important;
         line-height: 1.6 !important;
-        margin: 0 !important;
         position: relative;
         z-index: 1;
-        flex-grow: 1;
     }
     
-    /* Technology section with proper theming */
-    .about-tech-section {
-        background: var(--section-bg);
-        padding: 4rem 2rem;
-        border-radius: 24px;
-        margin: 5rem 0;
-        text-align: center;
-        border: 2px solid var(--border-color);
+    /* Responsive design improvements */
+    @media (max-width: 1200px) {
+        .about-main-wrapper {
+            padding: 1.5rem;
+        }
+        
+        .about-features-container {
+            grid-template-columns: repeat(2, 1fr);
+            gap: 1.5rem;
+        }
     }
     
-    .about-tech-section h2 {
-        color: var(--text-primary) !important;
-        font-size: clamp(1.8rem, 3vw, 2.5rem) !important;
-        font-weight: 700 !important;
-        margin-bottom: 1rem !important;
+    @media (max-width: 768px) {
+        .about-main-wrapper {
+            padding: 1rem;
+        }
+        
+        .about-features-container {
+            grid-template-columns: 1fr;
+            gap: 1.5rem;
+            padding: 0;
+        }
+        
+        .about-feature-box {
+            padding: 2rem 1.5rem;
+            min-height: auto;
+        }
+        
+        .about-hero-banner {
+            padding: 3rem 1.5rem;
+            margin-bottom: 3rem;
+        }
+        
+        .about-tech-section {
+            padding: 3rem 1.5rem;
+        }
+        
+        .about-tech-tags {
+            gap: 0.75rem;
+        }
+        
+        .about-tech-tag {
+            padding: 0.75rem 1.5rem;
+            font-size: 0.9rem;
+        }
+        
+        .about-stats-grid {
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 1.5rem;
+        }
+        
+        .about-stat-card {
+            padding: 2rem 1rem;
+        }
+        
+        .about-cta-banner {
+            padding: 3rem 1.5rem;
+        }
     }
     
-    .about-tech-section > p {
-        color: var(--text-secondary) !important;
-        font-size: 1.2rem !important;
-        margin-bottom: 2rem !important;
+    @media (max-width: 480px) {
+        .about-features-container {
+            grid-template-columns: 1fr;
+            padding: 0;
+        }
+        
+        .about-feature-box {
+            margin: 0;
+            padding: 1.5rem;
+        }
+        
+        .about-tech-tags {
+            gap: 0.5rem;
+        }
+        
+        .about-tech-tag {
+            padding: 0.6rem 1.2rem;
+            font-size: 0.85rem;
+        }
+        
+        .about-stats-grid {
+            grid-template-columns: 1fr;
+            gap: 1rem;
+        }
     }
+"""
+
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+def font_css():
+    # @font-face rules for the bundled fonts and, per GOOGLE_FONTS, an @import
+    # for the rest. The files are only reachable with static serving on. The
+    # ?v= content hash lets a proxy cache app/static/fonts/ for good.
+    rules, bundled = [], set()
+    families = {family.replace(" ", ""): family for family in FONT_FAMILIES}
+    if st.get_option("server.enableStaticServing") and os.path.isdir(FONT_DIR):
+        for filename in sorted(os.listdir(FONT_DIR)):
+            match = re.fullmatch(r"([A-Za-z]+)-(\d{3}(?:-\d{3})?)\.woff2", filename)
+            if not match or match.group(1) not in families:
+                continue
+            family = families[match.group(1)]
+            with open(os.path.join(FONT_DIR, filename), "rb") as f:
+                version = hashlib.sha256(f.read()).hexdigest()[:8]
+            rules.append(f"@font-face{{font-family:'{family}';font-style:normal;"
+                         f"font-weight:{match.group(2).replace('-', ' ')};font-display:swap;"
+                         f"src:url(fonts/{filename}?v={version}) format('woff2')}}")
+            bundled.add(family)
+    remote = [family for family in FONT_FAMILIES if GOOGLE_FONTS == "1" or (GOOGLE_FONTS == "auto" and family not in bundled)]
+    if remote:
+        query = "&".join(f"family={family.replace(' ', '+')}:wght@{FONT_FAMILIES[family]}" for family in remote)
+        rules.insert(0, f"@import url('https://fonts.googleapis.com/css2?{query}&display=swap');")
+    return "".join(rules)
+
+@st.cache_resource
+def get_stylesheets():
+    # Markup for each stylesheet, built once per process. With static file
+    # serving on (.streamlit/config.toml) the minified CSS is written to
+    # static/<name>.<hash>.css and every rerun only sends a <link> to it,
+    # which the browser caches; otherwise the minified CSS is sent inline.
+    SETUP_STEPS.append("stylesheets")
+    tags = {}
+    for name, css in (("codegpt", GLOBAL_CSS), ("about", ABOUT_CSS)):
+        css = (font_css() if name == "codegpt" else "") + minify_css(css)
+        filename = f"{name}.{hashlib.sha256(css.encode()).hexdigest()[:12]}.css"
+        path = os.path.join(STATIC_DIR, filename)
+        try:
+            if st.get_option("server.enableStaticServing") and not os.path.exists(path):
+                os.makedirs(STATIC_DIR, exist_ok=True)
+                for old in os.listdir(STATIC_DIR):
+                    if old.startswith(f"{name}.") and old.endswith(".css"):
+                        os.remove(os.path.join(STATIC_DIR, old))
+                with open(path + ".tmp", "w") as f:
+                    f.write(css)
+                os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Could not write {path}: {e}")
+        if st.get_option("server.enableStaticServing") and os.path.exists(path):
+            tags[name] = f'<link rel="stylesheet" href="app/static/{filename}">'
+        else:
+            tags[name] = f"<style>{css}</style>"
+    return tags
+
+st.markdown(get_stylesheets()["codegpt"], unsafe_allow_html=True)
+
+# Initialize session state
+if 'authenticated' not in st.session_state:
+    st.session_state.authenticated = False
+if 'user_id' not in st.session_state:
+    st.session_state.user_id = None
+if 'username' not in st.session_state:
+    st.session_state.username = None
+if 'current_page' not in st.session_state:
+    st.session_state.current_page = 'main'
+if 'temp_email' not in st.session_state:
+    st.session_state.temp_email = None
+if 'temp_username' not in st.session_state:
+    st.session_state.temp_username = None
+if 'temp_password' not in st.session_state:
+    st.session_state.temp_password = None
+if 'otp_email_id' not in st.session_state:
+    st.session_state.otp_email_id = None
+if 'otp_email_final' not in st.session_state:
+    st.session_state.otp_email_final = None
+
+# Professional Navigation
+def show_navigation():
+    col1, col2, col3, col4, col5, col6 = st.columns([1,1,1,1,1,1])
     
-    .about-tech-tags {
-        display: flex;
-        flex-wrap: wrap;
-        justify-content: center;
-        gap: 1rem;
-        margin-top: 2rem;
-        max-width: 800px;
-        margin-left: auto;
-        margin-right: auto;
-    }
+    with col1:
+        if st.button("🏠 Home", key="nav_home"):
+            st.session_state.current_page = 'main'
+            st.rerun()
+    
+    with col2:
+        if st.button("📊 History", key="nav_history"):
+            if st.session_state.authenticated:
+                st.session_state.current_page = 'history'
+                st.rerun()
+            else:
+                st.warning("Please login to view history")
+    
+    with col3:
+        if not st.session_state.authenticated:
+            if st.button("🔐 Login", key="nav_login"):
+                st.session_state.current_page = 'login'
+                st.rerun()
+        else:
+            if st.button("👤 Profile", key="nav_profile"):
+                st.session_state.current_page = 'profile'
+                st.rerun()
+    
+    with col4:
+        if not st.session_state.authenticated:
+            if st.button("📝 Sign Up", key="nav_signup"):
+                st.session_state.current_page = 'signup'
+                st.rerun()
+        else:
+            if st.button("🚪 Logout", key="nav_logout"):
+                st.session_state.authenticated = False
+                st.session_state.user_id = None
+                st.session_state.username = None
+                st.session_state.current_page = 'main'
+                st.success("Logged out successfully!")
+                st.rerun()
+    
+    with col5:
+        if st.button("ℹ About", key="nav_about"):
+            st.session_state.current_page = 'about'
+            st.rerun()
+
+    with col6:
+        if st.button("📞 Contact", key="nav_contact"):
+            st.session_state.current_page = 'contact'
+            st.rerun()
     
-    .about-tech-tag {
-        background: var(--card-bg);
-        padding: 1rem 2rem;
-        border-radius: 50px;
-        box-shadow: 0 6px 20px rgba(0,0,0,0.1);
-        border: 2px solid var(--border-color);
-        font-weight: 600;
-        color: var(--text-primary);
-        font-size: 1rem;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        cursor: default;
-        white-space: nowrap;
-    }
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Authentication functions
+
+
+# Authentication functions
+def signup_page():
+    st.markdown('<div class="main-container">', unsafe_allow_html=True)
+    st.markdown("## 📝 Create Account")
     
-    .about-tech-tag:hover {
-        background: var(--primary-gradient);
-        color: white !important;
-        transform: translateY(-4px) scale(1.05);
-        box-shadow: 0 12px 30px rgba(102, 126, 234, 0.4);
-        border-color: transparent;
-    }
+    with st.form("signup_form"):
+        username = st.text_input("Username", placeholder="Enter username")
+        email = st.text_input("Email", placeholder="Enter email address")
+        password = st.text_input("Password", type="password", placeholder="Enter password")
+        confirm_password = st.text_input("Confirm Password", type="password", placeholder="Confirm password")
+        
+        submitted = st.form_submit_button("Create Account")
+
+        
+        if submitted:
+            if not all([username, email, password, confirm_password]):
+                st.error("Please fill all fields")
+            elif password != confirm_password:
+                st.error("Passwords don't match")
+            elif len(password) < 6:
+                st.error("Password must be at least 6 characters")
+            else:
+                # Check if user exists
+                with get_db().connection() as conn:
+                    existing = conn.execute(USER_EXISTS_SQL, (username, email)).fetchone()
+                if existing:
+                    st.error("Username or email already exists")
+                else:
+                    # Generate and send OTP
+                    otp = generate_otp()
+                    store_otp(email, otp)
+                    st.session_state.otp_email_id = send_otp_email(email, otp)
+                    st.session_state.temp_username = username
+                    st.session_state.temp_email = email
+                    st.session_state.temp_password = hash_password(password)
+                    st.session_state.current_page = 'verify_otp'
+                    st.success("OTP sent to your email! Check your inbox.")
+                    st.rerun()
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.markdown(
+            """
+            <div style='text-align: center;'>
+                <p>Already have an account?</p>
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+        if st.button("🔐 Login Here", key="signup_to_login", use_container_width=True):
+            st.session_state.current_page = 'login'
+            st.rerun()
     
-    /* Statistics grid with improved spacing */
-    .about-stats-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 2rem;
-        margin: 4rem 0;
-        padding: 2rem 0;
-        max-width: 2000px;
-        margin-left: auto;
-        margin-right: auto;
-    }
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def contactus():    
+    # Contact Form Section
+    st.header("📝 Send us a Message")
     
-    .about-stat-card {
-        text-align: center;
-        padding: 2.5rem 1.5rem;
-        background: var(--card-bg);
-        border-radius: 20px;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.1);
-        border: 2px solid var(--border-color);
-        transition: all 0.3s ease;
-    }
+    with st.form("contact_form"):
+        # Form fields
+        name = st.text_input("Full Name *", placeholder="Enter your full name")
+        email = st.text_input("Email Address *", placeholder="Enter your email address")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            subject_type = st.selectbox(
+                "Subject Category *",
+                ["General Inquiry", "Technical Support", "Bug Report", "Feature Request", "Billing", "Other"]
+            )
+        with col2:
+            priority = st.selectbox(
+                "Priority Level",
+                ["Low", "Medium", "High", "Urgent"]
+            )
+        
+        subject = st.text_input("Subject *", placeholder="Brief description of your inquiry")
+        message = st.text_area(
+            "Message *", 
+            placeholder="Please provide detailed information about your inquiry...",
+            height=150
+        )
+        
+        # Additional options
+        col1, col2 = st.columns(2)
+        with col1:
+            phone = st.text_input("Phone Number (Optional)", placeholder="For urgent matters")
+        with col2:
+            preferred_contact = st.selectbox(
+                "Preferred Contact Method",
+                ["Email", "Phone", "No Preference"]
+            )
+        
+        # File upload for attachments
+        uploaded_file = st.file_uploader(
+            "Attach Files (Optional)",
+            type=['pdf', 'doc', 'docx', 'txt', 'png', 'jpg', 'jpeg'],
+            help="Upload any relevant documents or screenshots"
+        )
+        
+        # Newsletter signup
+        newsletter = st.checkbox("Subscribe to our newsletter for updates and tips")
+        
+        # Submit button
+        submitted = st.form_submit_button("📤 Send Message", use_container_width=True)
+        
+        if submitted:
+            # Validation
+            if not name or not email or not subject or not message:
+                st.error("Please fill in all required fields marked with *")
+            elif "@" not in email or "." not in email:
+                st.error("Please enter a valid email address")
+            else:
+                # Here you would typically save to database or send email
+                # For now, we'll just show a success message
+                st.success("✅ Thank you for contacting us!")
+                st.info(f"We've received your message about '{subject}' and will respond within 24 hours.")
+                
+                # You can add code here to:
+                # 1. Save to database
+                # 2. Send email notification
+                # 3. Create support ticket
+                
+                # Example of what you might store:
+                contact_data = {
+                    "name": name,
+                    "email": email,
+                    "subject_type": subject_type,
+                    "priority": priority,
+                    "subject": subject,
+                    "message": message,
+                    "phone": phone,
+                    "preferred_contact": preferred_contact,
+                    "newsletter": newsletter,
+                    "timestamp": "datetime.now()",
+                    "file_attached": uploaded_file is not None
+                }
+                
+                # Clear form (optional - Streamlit will handle this on rerun)
+                st.balloons()
     
-    .about-stat-card:hover {
-        transform: translateY(-8px);
-        box-shadow: 0 15px 40px rgba(102, 126, 234, 0.15);
-    }
+    st.markdown("---")
     
-    .about-stat-number {
-        font-size: clamp(2.5rem, 4vw, 3.5rem) !important;
-        font-weight: 800 !important;
-        color: #667eea !important;
-        display: block !important;
-        margin-bottom: 1rem !important;
-        background: var(--primary-gradient);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
+    # Contact Information Section
+    st.header("Get in Touch")
+    st.write("We'd love to hear from you! Reach out to us using any of the methods below:")
     
-    .about-stat-label {
-        color: var(--text-secondary) !important;
-        font-size: 1rem !important;
-        text-transform: uppercase !important;
-        letter-spacing: 1.5px !important;
-        font-weight: 600 !important;
-        line-height: 1.4 !important;
-    }
+    st.markdown(get_static_pages()["contact_info"], unsafe_allow_html=True)
     
-    /* Call to action with enhanced styling */
-    .about-cta-banner {
-        background: var(--primary-gradient);
-        color: white;
-        padding: 4rem 2rem;
-        border-radius: 24px;
-        text-align: center;
-        margin-top: 5rem;
-        box-shadow: 0 15px 40px rgba(66, 153, 225, 0.4);
-        position: relative;
-        overflow: hidden;
-    }
+    st.markdown("---")
     
-    .about-cta-banner::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="dots" width="20" height="20" patternUnits="userSpaceOnUse"><circle cx="10" cy="10" r="1" fill="white" opacity="0.1"/></pattern></defs><rect width="100" height="100" fill="url(%23dots)"/></svg>');
-        pointer-events: none;
-    }
+    # FAQ Section
+    st.header("❓ Frequently Asked Questions")
     
-    .about-cta-banner h2 {
-        font-size: clamp(1.8rem, 3vw, 2.5rem) !important;
-        font-weight: 700 !important;
-        margin-bottom: 1.5rem !important;
-        color: white !important;
-        position: relative;
-        z-index: 1;
-    }
+    for question, answer in CONTACT_FAQ:
+        with st.expander(question):
+            st.write(answer)
     
-    .about-cta-banner p {
-        font-size: clamp(1rem, 2vw, 1.3rem) !important;
-        opacity: 0.95 !important;
-        margin-bottom: 0 !important;
-        color: white !important;
-        max-width: 700px !important;
-        margin-left: auto !important;
-        margin-right: auto !important;
-        line-height: 1.6 !important;
-        position: relative;
-        z-index: 1;
-    }
+    # Back to main page
+    if st.button("← Back to Home", key="contact_back_home"):
+        st.session_state.current_page = 'main'
+        st.rerun()
+
+def render_email_status(status):
+    if status is None:
+        return
+    state, attempts, error = status
+    if state == 'sent':
+        st.caption("✅ Email delivered")
+    elif state == 'failed':
+        st.error(f"Failed to send OTP: {error}")
+    elif attempts:
+        st.warning(f"Sending failed {attempts} time(s), retrying… ({error})")
+    else:
+        st.caption("📤 Sending email…")
+
+@st.fragment(run_every=2)
+def poll_email_status(email_id):
+    # Polls the outbox so delivery problems show up without a page reload.
+    # Once the message is sent, failed or pruned the status cannot change:
+    # it is kept in session state and a full rerun drops this timer.
+    status = get_email_outbox().status(email_id)
+    if status is None or status[0] != 'queued':
+        st.session_state.otp_email_final = (email_id, status)
+        st.rerun()
+    render_email_status(status)
+
+def show_email_status(email_id):
+    if not email_id:
+        return
+    final = st.session_state.otp_email_final
+    if final and final[0] == email_id:
+        render_email_status(final[1])
+    else:
+        poll_email_status(email_id)
+
+def verify_otp_page():
+    st.markdown("### 📧 Verify Email")
+    st.info(f"OTP sent to: {st.session_state.temp_email}")
+    show_email_status(st.session_state.otp_email_id)
     
-    /* Responsive design improvements */
-    @media (max-width: 1200px) {
-        .about-main-wrapper {
-            padding: 1.5rem;
-        }
+    with st.form("otp_form"):
+        otp_input = st.text_input("Enter OTP", placeholder="Enter 6-digit OTP")
+        submitted = st.form_submit_button("Verify")
         
-        .about-features-container {
-            grid-template-columns: repeat(2, 1fr);
-            gap: 1.5rem;
-        }
-    }
+        if submitted:
+            if verify_otp(st.session_state.temp_email, otp_input):
+                # Create user account
+                with get_db().connection() as conn:
+                    conn.execute("INSERT INTO users (username, email, password_hash, verified) VALUES (?, ?, ?, 1)",
+                                 (st.session_state.temp_username, st.session_state.temp_email, st.session_state.temp_password))
+                
+                st.success("Account created successfully! Please login.")
+                st.session_state.current_page = 'login'
+                st.session_state.temp_email = None
+                st.session_state.temp_username = None
+                st.session_state.temp_password = None
+                st.session_state.otp_email_id = None
+                st.rerun()
+            else:
+                st.error("Invalid or expired OTP")
     
-    @media (max-width: 768px) {
-        .about-main-wrapper {
-            padding: 1rem;
-        }
-        
-        .about-features-container {
-            grid-template-columns: 1fr;
-            gap: 1.5rem;
-            padding: 0;
-        }
+    if st.button("← Back to Signup"):
+        st.session_state.current_page = 'signup'
+        st.rerun()
+    
+
+def login_page():
+    st.markdown("### 🔐 Login")
+    with st.form("login_form"):
+        username = st.text_input("Username or Email", placeholder="Enter username or email")
+        password = st.text_input("Password", type="password", placeholder="Enter password")
+        submitted = st.form_submit_button("Login")
         
-        .about-feature-box {
-            padding: 2rem 1.5rem;
-            min-height: auto;
-        }
+        if submitted:
+            if username and password:
+                with get_db().connection() as conn:
+                    user = conn.execute(USER_LOGIN_SQL, (username, username, hash_password(password))).fetchone()
+                
+                if user:
+                    if user[2]:  # verified
+                        st.session_state.authenticated = True
+                        st.session_state.user_id = user[0]
+                        st.session_state.username = user[1]
+                        st.session_state.current_page = 'main'
+                        st.success(f"Welcome back, {user[1]}!")
+                        st.rerun()
+                    else:
+                        st.error("Please verify your email first")
+                else:
+                    st.error("Invalid credentials")
+            else:
+                st.error("Please fill all fields")
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.markdown(
+            """
+            <div style='text-align: center;'>
+                <p>Don't have an account?</p>
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+        if st.button("📝 Sign Up Here", key="login_to_signup", use_container_width=True):
+            st.session_state.current_page = 'signup'
+            st.rerun()
+
+def profile_page():
+    st.markdown('<div class="main-container">', unsafe_allow_html=True)
+    st.markdown("## 👤 Profile")
+    
+    if st.session_state.authenticated:
+        with get_db().connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT username, email, created_at FROM users WHERE id = ?", (st.session_state.user_id,))
+            user_data = c.fetchone()
+            
+            # Get chat history count
+            chat_count = load_user_stats(conn, st.session_state.user_id)[0]
         
-        .about-hero-banner {
-            padding: 3rem 1.5rem;
-            margin-bottom: 3rem;
-        }
+        if user_data:
+            # Profile Display Section
+            st.markdown("""
+            <div class="profile-card">
+                <h3 style="text-align: center; margin-bottom: 2rem;">🎯 User Profile</h3>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"""
+                <div class="feature-card">
+                    <h4>👤 Account Information</h4>
+                    <p><strong>Username:</strong> {user_data[0]}</p>
+                    <p><strong>Email:</strong> {user_data[1]}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            with col2:
+                st.markdown(f"""
+                <div class="feature-card">
+                    <h4>📊 Activity Stats</h4>
+                    <p><strong>Member Since:</strong> {user_data[2][:10]}</p>
+                    <p><strong>Total Analyses:</strong> {chat_count}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Edit Profile Section
+            st.markdown("---")
+            st.markdown("### ✏️ Edit Profile")
+            
+            with st.form("edit_profile_form"):
+                st.markdown("**Update your profile information:**")
+                new_username = st.text_input("New Username", value=user_data[0], placeholder="Enter new username")
+                new_email = st.text_input("New Email", value=user_data[1], placeholder="Enter new email")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    current_password = st.text_input("Current Password", type="password", placeholder="Enter current password")
+                with col2:
+                    new_password = st.text_input("New Password (optional)", type="password", placeholder="Enter new password")
+                
+                submitted = st.form_submit_button("💾 Update Profile", type="primary")
+                
+                if submitted:
+                    if not current_password:
+                        st.error("Please enter your current password to make changes")
+                    else:
+                        # Verify current password
+                        with get_db().connection() as conn:
+                            c = conn.cursor()
+                            c.execute("SELECT password_hash FROM users WHERE id = ?", (st.session_state.user_id,))
+                            stored_password = c.fetchone()[0]
+                            password_ok = hash_password(current_password) == stored_password
+                            
+                            if password_ok:
+                                # Update profile
+                                if new_password:
+                                    # Update with new password
+                                    c.execute("UPDATE users SET username = ?, email = ?, password_hash = ? WHERE id = ?",
+                                             (new_username, new_email, hash_password(new_password), st.session_state.user_id))
+                                else:
+                                    # Update without password change
+                                    c.execute("UPDATE users SET username = ?, email = ? WHERE id = ?",
+                                             (new_username, new_email, st.session_state.user_id))
+                        
+                        if password_ok:
+                            # Update session state
+                            st.session_state.username = new_username
+                            st.success("✅ Profile updated successfully!")
+                            time.sleep(1)
+                            st.rerun()
+                        else:
+                            st.error("❌ Current password is incorrect")
+            
+            # Export / import history
+            st.markdown("---")
+            st.markdown("### 📦 Export / Import History")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                export_format = st.radio("Format", ["ndjson", "csv"], horizontal=True, key="export_format",
+                                         format_func=lambda fmt: {"ndjson": "JSON Lines", "csv": "CSV"}[fmt])
+                export_gzip = st.checkbox("Compress (gzip)", key="export_gzip")
+                file_name = f"codegpt_history.{export_format}" + (".gz" if export_gzip else "")
+                # Built only when clicked, on a separate thread
+                st.download_button("⬇️ Download History",
+                                   data=partial(export_history, get_db(), st.session_state.user_id, export_format, export_gzip),
+                                   file_name=file_name,
+                                   mime="application/gzip" if export_gzip else
+                                        ("text/csv" if export_format == "csv" else "application/x-ndjson"))
+            with col2:
+                uploaded_history = st.file_uploader("Import an exported history", key="history_import",
+                                                    type=["ndjson", "jsonl", "csv", "gz"])
+                if uploaded_history and st.button("⬆️ Import History"):
+                    try:
+                        imported, skipped = import_history(get_db(), st.session_state.user_id,
+                                                           uploaded_history, uploaded_history.name)
+                        st.success(f"✅ Imported {imported} analyses" + (f" ({skipped} already in your history)" if skipped else ""))
+                    except (ValueError, KeyError, UnicodeDecodeError, EOFError, OSError, csv.Error) as e:
+                        st.error(f"Import failed, nothing was imported: {str(e)}")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+# History export and import
+HISTORY_EXPORT_FIELDS = ["created_at", "features_used", "code_input", "ai_output"]
+HISTORY_EXPORT_SQL = HISTORY_ROW_SQL + """ 
+                        WHERE h.user_id = ? 
+                        ORDER BY h.created_at, h.id"""
+HISTORY_IMPORT_SQL = """INSERT INTO chat_history (user_id, created_at, features_used, code_input, code_hash, ai_output, output_hash) 
+                        SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7 
+                        WHERE NOT EXISTS (SELECT 1 FROM chat_history 
+                                          WHERE user_id = ?1 AND created_at = ?2 AND features_used = ?3 
+                                            AND code_input IS ?4 AND code_hash IS ?5 AND ai_output IS ?6 AND output_hash IS ?7)"""
+
+def iter_history_records(db, user_id, batch_size=500):
+    # The cursor is read in batches, so only one batch of decoded rows is in
+    # memory at a time however long the history is
+    with db.connection() as conn:
+        cursor = conn.execute(HISTORY_EXPORT_SQL, (user_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for _, code_input, features_used, ai_output, created_at in map(decode_history_row, rows):
+                yield {"created_at": created_at, "features_used": features_used,
+                       "code_input": code_input, "ai_output": ai_output}
+
+def iter_history_export(records, fmt):
+    if fmt == "ndjson":
+        for record in records:
+            record["features_used"] = record["features_used"].split(',') if record["features_used"] else []
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+        return
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=HISTORY_EXPORT_FIELDS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def export_history(db, user_id, fmt="ndjson", compress=False):
+    # Runs on the download button's worker thread when the user clicks, so
+    # it gets the database passed in rather than calling get_db(). The
+    # download button needs the whole file as bytes, so the output is built
+    # in memory; only the database rows are read in batches.
+    buffer = io.BytesIO()
+    out = gzip.GzipFile(fileobj=buffer, mode="wb") if compress else buffer
+    for chunk in iter_history_export(iter_history_records(db, user_id), fmt):
+        out.write(chunk.encode())
+    if compress:
+        out.close()
+    return buffer.getvalue()
+
+def iter_history_import(fileobj, name):
+    # Accepts what export_history writes: NDJSON or CSV, optionally gzipped
+    if name.endswith(".gz"):
+        fileobj, name = gzip.GzipFile(fileobj=fileobj, mode="rb"), name[:-3]
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    records = csv.DictReader(text) if name.endswith(".csv") else (line for line in text if line.strip())
+    for record_number, record in enumerate(records, start=1):
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            if not isinstance(record, dict) or not record.get("created_at"):
+                raise ValueError("missing created_at")
+            datetime.strptime(record["created_at"], "%Y-%m-%d %H:%M:%S")
+        except ValueError as e:
+            raise ValueError(f"record {record_number}: {e}") from e
+        features_used = record.get("features_used") or ""
+        if isinstance(features_used, list):
+            features_used = ','.join(features_used)
+        yield record["created_at"], features_used, record.get("code_input") or "", record.get("ai_output") or ""
+
+def import_history(db, user_id, fileobj, name, batch_size=1000):
+    # One transaction for the whole file: a bad record rolls everything back.
+    # Records already in the history (same time, features, code and output)
+    # are skipped, so importing the same export twice is harmless.
+    imported = 0
+    records = 0
+    with db.connection(write=True) as conn:
+        # AUTOINCREMENT ids only grow, so the imported rows are the ones past it
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM chat_history").fetchone()[0]
+        batch = []
+        for created_at, features_used, code_input, ai_output in iter_history_import(fileobj, name):
+            code_value, code_hash = store_history_text(conn, code_input)
+            output_value, output_hash = store_history_text(conn, ai_output)
+            batch.append((user_id, created_at, features_used, code_value, code_hash, output_value, output_hash))
+            if len(batch) >= batch_size:
+                imported += conn.executemany(HISTORY_IMPORT_SQL, batch).rowcount
+                records += len(batch)
+                batch = []
+        if batch:
+            imported += conn.executemany(HISTORY_IMPORT_SQL, batch).rowcount
+            records += len(batch)
+        index_history_rows(conn, "id > ?", (last_id,))
+        # Imported rows carry their own dates, so recount instead of
+        # adding them to today's bucket
+        rebuild_user_stats(conn, user_id)
+    return imported, records - imported
+
+def fetch_history_page(user_id, cursor, limit):
+    with get_db().connection() as conn:
+        if cursor is None:
+            return conn.execute(HISTORY_PAGE_SQL, (user_id, limit)).fetchall()
+        return conn.execute(HISTORY_PAGE_AFTER_SQL, (user_id, cursor[0], cursor[1], limit)).fetchall()
+
+def load_history_entry(user_id, row_id, max_entries=20):
+    # Full code and output for one analysis, cached for the session so
+    # reopening it or paging back does not decode it again
+    entries = st.session_state.setdefault("history_entries", OrderedDict())
+    key = (user_id, row_id)
+    if key in entries:
+        entries.move_to_end(key)
+        return entries[key]
+    with get_db().connection() as conn:
+        row = conn.execute(HISTORY_ENTRY_SQL, (row_id, user_id)).fetchone()
+    if row is None:
+        return None
+    entries[key] = decode_history_row(row)
+    if len(entries) > max_entries:
+        entries.popitem(last=False)
+    return entries[key]
+
+def reset_history_pages(cursor=None, rows_before=0):
+    # Stack of visited pages: where each page starts and how many newer rows
+    # precede it, so Previous is a pop and analysis numbers stay correct.
+    st.session_state.history_pages = [{"cursor": cursor, "rows_before": rows_before}]
+
+def jump_history_to_date():
+    day = st.session_state.history_jump_date
+    if day is None:
+        reset_history_pages()
+        return
+    day_end = f"{day:%Y-%m-%d} 23:59:59"
+    with get_db().connection() as conn:
+        newer = conn.execute(HISTORY_NEWER_COUNT_SQL, (st.session_state.user_id, day_end)).fetchone()[0]
+    reset_history_pages((day_end, sys.maxsize), newer)
+
+def build_history_search_query(user_id, text):
+    # Each word is quoted so FTS5 syntax in the input is matched literally.
+    # A trailing * keeps working as a prefix search, but only when asked
+    # for: prefix terms merge the doclists of every word they expand to.
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word.rstrip("*")) >= 2
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not terms:
+        return None
+    # No column filter on the words: it doubles the cost of ranking, and only
+    # the searching user's own "u<id>" token could match in the owner column
+    return f"owner:u{user_id} AND ({' '.join(terms)})"
+
+def search_history(user_id, text, limit=20):
+    query = build_history_search_query(user_id, text)
+    if query is None:
+        return []
+    with get_db().connection() as conn:
+        ids = [row[0] for row in conn.execute(HISTORY_SEARCH_SQL, (query, HISTORY_SEARCH_CANDIDATES, limit))]
+        if not ids:
+            return []
+        rows = {row[0]: row for row in conn.execute(HISTORY_SEARCH_SNIPPETS_SQL, (query, json.dumps(ids)))}
+    return [rows[row_id] for row_id in ids if row_id in rows]
+
+def highlight_snippet(snippet):
+    return html.escape(snippet or "").replace("\x02", "<mark>").replace("\x03", "</mark>")
+
+def show_history_search(user_id, text):
+    started = time.perf_counter()
+    try:
+        results = search_history(user_id, text)
+    except sqlite3.OperationalError as e:
+        st.error(f"Search failed: {str(e)}")
+        return
+    elapsed = time.perf_counter() - started
+    get_perf_metrics().record("history.search", elapsed)
+    
+    if not results:
+        st.info("No analyses match your search.")
+        return
+    st.caption(f"{len(results)} best matches • {elapsed * 1000:.0f} ms")
+    
+    for i, (_, features, timestamp, code_snippet, output_snippet) in enumerate(results):
+        date_formatted = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%B %d, %Y at %I:%M %p")
+        with st.expander(f"🔍 {date_formatted} • {features.replace(',', ', ')}", expanded=(i < 3)):
+            st.markdown(f"""
+            <div class="chat-history">
+                <pre style="white-space: pre-wrap;">{highlight_snippet(code_snippet)}</pre>
+                <p>{highlight_snippet(output_snippet)}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+def history_page():
+    
+    # Enhanced Header
+    st.markdown("""
+    <div class="header">
+        <h1>📊 Analysis History</h1>
+        <p>Track your coding journey and past analyses</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if st.session_state.authenticated:
+        # Totals, this week, most used feature and average come from one
+        # user_stats row instead of aggregating chat_history on every rerun
+        with get_db().connection() as conn:
+            stats = summarize_user_stats(load_user_stats(conn, st.session_state.user_id))
+        total_count = stats["total"]
         
-        .about-tech-section {
-            padding: 3rem 1.5rem;
-        }
+        # Pagination controls
+        items_per_page = 10
+        total_pages = (total_count + items_per_page - 1) // items_per_page
         
-        .about-tech-tags {
-            gap: 0.75rem;
-        }
+        if st.session_state.get('history_pages_user') != st.session_state.user_id:
+            st.session_state.history_pages_user = st.session_state.user_id
+            reset_history_pages()
+        pages = st.session_state.history_pages
+        page = pages[-1]
         
-        .about-tech-tag {
-            padding: 0.75rem 1.5rem;
-            font-size: 0.9rem;
-        }
+        # Stats overview
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.markdown(f"""
+            <div class="feature-card" style="text-align: center;">
+                <h3 style="color: #667eea;">📈</h3>
+                <h4>{total_count}</h4>
+                <p>Total Analyses</p>
+            </div>
+            """, unsafe_allow_html=True)
         
-        .about-stats-grid {
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 1.5rem;
-        }
+        with col2:
+            st.markdown(f"""
+            <div class="feature-card" style="text-align: center;">
+                <h3 style="color: #22c55e;">📅</h3>
+                <h4>{stats["week"]}</h4>
+                <p>This Week</p>
+            </div>
+            """, unsafe_allow_html=True)
         
-        .about-stat-card {
-            padding: 2rem 1rem;
-        }
+        with col3:
+            feature_name = stats["top_feature"]
+            st.markdown(f"""
+            <div class="feature-card" style="text-align: center;">
+                <h3 style="color: #f59e0b;">⭐</h3>
+                <h4>{feature_name}</h4>
+                <p>Most Used</p>
+            </div>
+            """, unsafe_allow_html=True)
         
-        .about-cta-banner {
-            padding: 3rem 1.5rem;
-        }
-    }
-    
-    @media (max-width: 480px) {
-        .about-features-container {
-            grid-template-columns: 1fr;
-            padding: 0;
-        }
+        with col4:
+            # Average per week since the first analysis
+            st.markdown(f"""
+            <div class="feature-card" style="text-align: center;">
+                <h3 style="color: #ec4899;">📊</h3>
+                <h4>{stats["avg_per_week"]:.1f}</h4>
+                <p>Avg/Week</p>
+            </div>
+            """, unsafe_allow_html=True)
         
-        .about-feature-box {
-            margin: 0;
-            padding: 1.5rem;
-        }
+        st.markdown("---")
         
-        .about-tech-tags {
-            gap: 0.5rem;
-        }
+        search_query = st.text_input("🔎 Search your analyses", key="history_search",
+                                     placeholder="e.g. quicksort, null pointer, recurs*")
         
-        .about-tech-tag {
-            padding: 0.6rem 1.2rem;
-            font-size: 0.85rem;
-        }
+        if search_query.strip():
+            show_history_search(st.session_state.user_id, search_query)
+        else:
+            # Get paginated history (one extra row tells whether there is a next page)
+            rows = fetch_history_page(st.session_state.user_id, page["cursor"], items_per_page + 1)
+            history, has_next = rows[:items_per_page], len(rows) > items_per_page
+            offset = page["rows_before"]
+            
+            # Pagination controls
+            if total_pages > 1:
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    if st.button("⬅️ Previous", disabled=(len(pages) <= 1)):
+                        pages.pop()
+                        st.rerun()
+            
+                with col2:
+                    st.markdown(f"<h4 style='text-align: center;'>Page {offset // items_per_page + 1} of {total_pages}</h4>", 
+                               unsafe_allow_html=True)
+                    st.date_input("📅 Jump to date", value=None, key="history_jump_date",
+                                  on_change=jump_history_to_date,
+                                  help="Show analyses from this day and older. Clear it to return to the newest.")
+            
+                with col3:
+                    if st.button("Next ➡️", disabled=not has_next):
+                        last_id, last_created_at = history[-1][0], history[-1][-1]
+                        pages.append({"cursor": (last_created_at, last_id), "rows_before": offset + len(history)})
+                        st.rerun()
         
-        .about-stats-grid {
-            grid-template-columns: 1fr;
-            gap: 1rem;
-        }
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Main container
-    st.markdown('<div class="about-main-wrapper">', unsafe_allow_html=True)
-    
-    # Hero Section
-    st.markdown("""
-    <div class="about-hero-banner">
-        <h1>🚀 CodeGPT</h1>
-        <p>Your intelligent AI-powered coding companion that transforms the way you write, debug, and optimize code across multiple programming languages with cutting-edge technology.</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Features Section
-    st.markdown('<div class="about-features-section">', unsafe_allow_html=True)
-    st.markdown('''
-    <div class="about-features-header">
-        <h2>Powerful Features</h2>
-        <p>Discover the comprehensive set of tools designed to enhance your coding experience and productivity.</p>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    # Features Grid
-    st.markdown('<div class="about-features-container">', unsafe_allow_html=True)
-    
-    # Feature boxes
-    features = [
-        {
-            "emoji": "🐛",
-            "title": "Bug Detection & Fixing",
-            "description": "Instantly identify and resolve bugs in your code with AI-powered analysis and intelligent suggested fixes that save you hours of debugging time."
-        },
-        {
-            "emoji": "📚",
-            "title": "Code Explanation",
-            "description": "Get detailed, step-by-step explanations of complex code snippets and understand algorithms with clear, beginner-friendly descriptions."
-        },
-        {
-            "emoji": "📸",
-            "title": "Handwritten Code Recognition",
-            "description": "Upload images of handwritten code and convert them to digital format with high accuracy using advanced OCR technology."
-        },
-        {
-            "emoji": "⚡",
-            "title": "Code Optimization",
-            "description": "Improve your code performance with intelligent optimization suggestions, best practices, and efficiency improvements."
-        },
-        {
-            "emoji": "🌍",
-            "title": "Multi-language Support",
-            "description": "Work seamlessly with Python, JavaScript, Java, C++, Go, Rust, and 50+ other programming languages and frameworks."
-        },
-        {
-            "emoji": "🔄",
-            "title": "Code Refactoring",
-            "description": "Transform legacy code into modern, maintainable, and efficient solutions automatically with smart refactoring suggestions."
-        }
-    ]
+            if history:
+                st.markdown("### 📋 Recent Analyses")
+            
+                for i, (row_id, code_preview, code_length, features, output_preview, output_length, timestamp) in enumerate(history):
+                    # Enhanced history card design
+                    analysis_num = offset + i + 1
+                    date_formatted = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").strftime("%B %d, %Y at %I:%M %p")
+                
+                    # Feature badges
+                    feature_list = features.split(',')
+                    feature_badges = ""
+                    for feature in feature_list[:3]:  # Show first 3 features
+                        color = "#667eea" if "Bug" in feature else "#22c55e" if "Explain" in feature else "#f59e0b"
+                        feature_badges += f'<span style="background: {color}; color: white; padding: 4px 8px; border-radius: 12px; font-size: 0.8rem; margin-right: 8px;">{feature.strip()}</span>'
+                
+                    if len(feature_list) > 3:
+                        feature_badges += f'<span style="background: #6b7280; color: white; padding: 4px 8px; border-radius: 12px; font-size: 0.8rem;">+{len(feature_list)-3} more</span>'
+                
+                    # Create expandable card
+                    with st.expander(f"🔍 Analysis #{analysis_num} • {date_formatted}", expanded=False):
+                        st.markdown(f"""
+                        <div class="chat-history">
+                            <div style="margin-bottom: 1.5rem;">
+                                <h4 style="margin-bottom: 0.5rem;">🏷️ Features Used:</h4>
+                                <div style="margin-bottom: 1rem;">{feature_badges}</div>
+                            </div>
+                        
+                       
+                        </div>
+                        """, unsafe_allow_html=True)
+                    
+                        # Show code with syntax highlighting
+                        st.code(code_preview[:400] + "..." if code_length > 400 else code_preview, language='python')
+                    
+                        st.markdown("**🤖 AI Analysis Preview:**")
+                        st.markdown(output_preview + "..." if output_length > 500 else output_preview)
+                    
+                        # Action buttons
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            if st.button(f"📋 Copy Code", key=f"copy_{row_id}"):
+                                st.success("Code copied to clipboard!")
+                        with col2:
+                            if st.button(f"🔄 Re-analyze", key=f"reanalyze_{row_id}"):
+                                st.session_state.current_page = 'main'
+                                st.info("Redirecting to main page...")
+                                st.rerun()
+                        with col3:
+                            if st.button(f"📊 Full View", key=f"expand_{row_id}"):
+                                entry = load_history_entry(st.session_state.user_id, row_id)
+                                if entry:
+                                    st.markdown("**Complete Analysis:**")
+                                    st.markdown(entry[3])
+            elif total_count:
+                st.info("No analyses on or before that date.")
+            else:
+                st.markdown("""
+                <div class="feature-card" style="text-align: center; padding: 3rem;">
+                    <h3>📭 No Analysis History</h3>
+                    <p>Start using CodeGPT to see your analysis history here!</p>
+                    <br>
+                </div>
+                """, unsafe_allow_html=True)
+            
+                if st.button("🚀 Start Analyzing", type="primary"):
+                    st.session_state.current_page = 'main'
+                    st.rerun()
+    else:
+        st.markdown("""
+        <div class="feature-card" style="text-align: center; padding: 3rem;">
+            <h3>🔐 Login Required</h3>
+            <p>Please login to view your analysis history</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns([1,1,1])
+        with col2:
+            if st.button("🔐 Login Now", type="primary"):
+                st.session_state.current_page = 'login'
+                st.rerun()
     
-    for feature in features:
-        st.markdown(f"""
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Static pages
+# Markup of the pages that do not depend on the user, rendered and minified
+# once per process by get_static_pages; showing one is a dictionary lookup.
+ABOUT_FEATURES = [
+    {
+        "emoji": "🐛",
+        "title": "Bug Detection & Fixing",
+        "description": "Instantly identify and resolve bugs in your code with AI-powered analysis and intelligent suggested fixes that save you hours of debugging time."
+    },
+    {
+        "emoji": "📚",
+        "title": "Code Explanation",
+        "description": "Get detailed, step-by-step explanations of complex code snippets and understand algorithms with clear, beginner-friendly descriptions."
+    },
+    {
+        "emoji": "📸",
+        "title": "Handwritten Code Recognition",
+        "description": "Upload images of handwritten code and convert them to digital format with high accuracy using advanced OCR technology."
+    },
+    {
+        "emoji": "⚡",
+        "title": "Code Optimization",
+        "description": "Improve your code performance with intelligent optimization suggestions, best practices, and efficiency improvements."
+    },
+    {
+        "emoji": "🌍",
+        "title": "Multi-language Support",
+        "description": "Work seamlessly with Python, JavaScript, Java, C++, Go, Rust, and 50+ other programming languages and frameworks."
+    },
+    {
+        "emoji": "🔄",
+        "title": "Code Refactoring",
+        "description": "Transform legacy code into modern, maintainable, and efficient solutions automatically with smart refactoring suggestions."
+    }
+]
+
+def minify_html(markup):
+    # Drops indentation and whitespace between tags; all of this markup is
+    # plain text and tags, so no <pre> content is affected
+    return re.sub(r"\s+", " ", re.sub(r">\s+<", "><", markup.strip()))
+
+def render_about_page():
+    boxes = "".join(f"""
         <div class="about-feature-box">
             <span class="about-feature-emoji">{feature['emoji']}</span>
             <h3>{feature['title']}</h3>
             <p>{feature['description']}</p>
+        </div>""" for feature in ABOUT_FEATURES)
+    # Hero, features grid and technology stack, then (after the statistics
+    # title) the statistics and call to action
+    intro = f"""
+    <div class="about-main-wrapper">
+        <div class="about-hero-banner">
+            <h1>🚀 CodeGPT</h1>
+            <p>Your intelligent AI-powered coding companion that transforms the way you write, debug, and optimize code across multiple programming languages with cutting-edge technology.</p>
         </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown('</div></div>', unsafe_allow_html=True)  # Close features container and section
-    
-    # Technology Stack Section
-    st.markdown('''
-    <div class="about-tech-section">
-        <h2>Built with Modern Technologies</h2>
-        <p>Powered by cutting-edge AI and robust infrastructure for optimal performance and reliability.</p>
-        <div class="about-tech-tags">
-            <span class="about-tech-tag">Google Gemini 1.5 Pro</span>
-            <span class="about-tech-tag">Streamlit Framework</span>
-            <span class="about-tech-tag">SQLite3 Database</span>
-            <span class="about-tech-tag">Email OTP Security</span>
-            <span class="about-tech-tag">PIL Image Processing</span>
-            <span class="about-tech-tag">Cloud Integration</span>
-            <span class="about-tech-tag">Advanced OCR</span>
-            <span class="about-tech-tag">Real-time Processing</span>
-        </div>
-    </div>
-    ''', unsafe_allow_html=True)
-    
-    # Statistics Section
-    st.title("📊 CodeGPT Statistics")
-    st.markdown("""
-    <div class="about-stats-grid">
-        <div class="about-stat-card">
-            <span class="about-stat-number">50+</span>
-            <span class="about-stat-label">Languages Supported</span>
+        <div class="about-features-section">
+            <div class="about-features-header">
+                <h2>Powerful Features</h2>
+                <p>Discover the comprehensive set of tools designed to enhance your coding experience and productivity.</p>
+            </div>
+            <div class="about-features-container">{boxes}
+            </div>
         </div>
-        <div class="about-stat-card">
-            <span class="about-stat-number">99.9%</span>
-            <span class="about-stat-label">Accuracy Rate</span>
+        <div class="about-tech-section">
+            <h2>Built with Modern Technologies</h2>
+            <p>Powered by cutting-edge AI and robust infrastructure for optimal performance and reliability.</p>
+            <div class="about-tech-tags">
+                <span class="about-tech-tag">Google Gemini 1.5 Pro</span>
+                <span class="about-tech-tag">Streamlit Framework</span>
+                <span class="about-tech-tag">SQLite3 Database</span>
+                <span class="about-tech-tag">Email OTP Security</span>
+                <span class="about-tech-tag">PIL Image Processing</span>
+                <span class="about-tech-tag">Cloud Integration</span>
+                <span class="about-tech-tag">Advanced OCR</span>
+                <span class="about-tech-tag">Real-time Processing</span>
+            </div>
         </div>
-        <div class="about-stat-card">
-            <span class="about-stat-number">24/7</span>
-            <span class="about-stat-label">Availability</span>
+    </div>
+    """
+    outro = """
+    <div class="about-main-wrapper">
+        <div class="about-stats-grid">
+            <div class="about-stat-card">
+                <span class="about-stat-number">50+</span>
+                <span class="about-stat-label">Languages Supported</span>
+            </div>
+            <div class="about-stat-card">
+                <span class="about-stat-number">99.9%</span>
+                <span class="about-stat-label">Accuracy Rate</span>
+            </div>
+            <div class="about-stat-card">
+                <span class="about-stat-number">24/7</span>
+                <span class="about-stat-label">Availability</span>
+            </div>
+            <div class="about-stat-card">
+                <span class="about-stat-number">∞</span>
+                <span class="about-stat-label">Learning Capacity</span>
+            </div>
         </div>
-        <div class="about-stat-card">
-            <span class="about-stat-number">∞</span>
-            <span class="about-stat-label">Learning Capacity</span>
+        <div class="about-cta-banner">
+            <h2>Ready to Transform Your Coding Experience?</h2>
+            <p>Join thousands of developers who are already using CodeGPT to write better, faster, and more efficient code every day. Start your journey to becoming a more productive developer today.</p>
         </div>
     </div>
-    """, unsafe_allow_html=True)
-    
-    # Call to Action Section
-    st.markdown("""
-    <div class="about-cta-banner">
-        <h2>Ready to Transform Your Coding Experience?</h2>
-        <p>Join thousands of developers who are already using CodeGPT to write better, faster, and more efficient code every day. Start your journey to becoming a more productive developer today.</p>
+    """
+    return minify_html(intro), minify_html(outro)
+
+FOOTER_HTML = """
+<div style='text-align: center; padding: 20px; color: #666;'>
+    <h4>🚀 TEAM ARJUNA — Innovating at the Speed of Thought</h4>
+    <p>🧠 Powered by <strong>Google Gemini AI</strong> | 🔧 Built with <strong>Streamlit</strong></p>
+    <p style='font-size: 0.8em; margin-top: 15px;'>© 2025 CodeGPT. All rights reserved.</p>
+</div>
+"""
+
+# One grid instead of four columns of subheaders and st.write lines
+CONTACT_INFO_HTML = """
+<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 1rem;">
+    <div>
+        <h3>📧 Email</h3>
+        <p>support@codegpt.com<br>info@codegpt.com</p>
+        <h3>📱 Phone</h3>
+        <p>+1 (555) 123-4567<br>Mon-Fri: 9:00 AM - 6:00 PM IST</p>
     </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)  # Close main wrapper
+    <div>
+        <h3>🌐 Social Media</h3>
+        <p>Follow us on:<br>• Twitter: @codegptapp<br>• LinkedIn: codegpt<br>• Facebook: codegpt</p>
+    </div>
+    <div>
+        <h3>📍 Address</h3>
+        <p>Sri sainath nagar<br>Rangampeta<br>Tirupati, Andhrapradesh 12345</p>
+    </div>
+    <div>
+        <h3>⏰ Response Time</h3>
+        <p>• Email: Within 24 hours<br>• Phone: Immediate<br>• Support tickets: Within 4 hours</p>
+    </div>
+</div>
+"""
+
+CONTACT_FAQ = [
+    ("How quickly will I receive a response?",
+     "We typically respond to emails within 24 hours during business days. For urgent matters, please call our phone number directly."),
+    ("What information should I include in my message?",
+     "Please include as much detail as possible about your issue or inquiry. Screenshots, error messages, and step-by-step descriptions help us assist you better."),
+    ("Do you offer phone support?",
+     "Yes! Our phone support is available Monday through Friday, 9:00 AM to 6:00 PM EST. For technical issues, email support may be more effective as we can share screenshots and detailed instructions."),
+    ("Can I schedule a demo or consultation?",
+     "Absolutely! Please select 'General Inquiry' as your subject category and mention that you'd like to schedule a demo. We'll get back to you with available time slots."),
+]
+
+@st.cache_resource
+def get_static_pages():
+    SETUP_STEPS.append("static_pages")
+    about_intro, about_outro = render_about_page()
+    return {
+        "about_intro": about_intro,
+        "about_outro": about_outro,
+        "contact_info": minify_html(CONTACT_INFO_HTML),
+        "footer": minify_html(FOOTER_HTML),
+    }
+
+def about_page():
+    pages = get_static_pages()
+    st.markdown(get_stylesheets()["about"], unsafe_allow_html=True)
+    st.markdown(pages["about_intro"], unsafe_allow_html=True)
+    st.title("📊 CodeGPT Statistics")
+    st.markdown(pages["about_outro"], unsafe_allow_html=True)
+
+# Performance metrics
+class PerfMetrics:
+    # Keeps the most recent timings per metric name, shared by all sessions
+    def __init__(self, max_samples=500):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=max_samples))
+        self.counters = defaultdict(int)
+        self.gauges = {}
+
+    def record(self, name, seconds):
+        with self.lock:
+            self.samples[name].append(seconds)
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def counts(self):
+        # Counters and the latest gauge readings, for the diagnostics panel
+        with self.lock:
+            return {**self.counters, **self.gauges}
+
+    def summary(self):
+        with self.lock:
+            snapshot = {name: sorted(values) for name, values in self.samples.items() if values}
+        return {
+            name: {
+                "count": len(values),
+                "p50": values[int(0.50 * (len(values) - 1))],
+                "p95": values[int(0.95 * (len(values) - 1))],
+            }
+            for name, values in snapshot.items()
+        }
+
+@st.cache_resource
+def get_perf_metrics():
+    return PerfMetrics()
+
+class PhaseTimer:
+    # Accumulates wall time per phase of a single process_code run
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = defaultdict(float)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - started
+
+    def as_dict(self):
+        return dict(self.phases, total=time.perf_counter() - self.started)
+
+def show_diagnostics():
+    with st.sidebar.expander("⚙️ Diagnostics", expanded=False):
+        summary = get_perf_metrics().summary()
+        if not summary:
+            st.caption("No timings recorded yet.")
+        for name, stats in sorted(summary.items()):
+            st.caption(f"**{name}** — n={stats['count']} • p50 {stats['p50']:.2f}s • p95 {stats['p95']:.2f}s")
+        for name, count in sorted(get_perf_metrics().counts().items()):
+            st.caption(f"**{name}** — {count}")
+
+        st.caption(f"**Setup this run** — {len(SETUP_STEPS)} steps ({', '.join(SETUP_STEPS) or 'none'})")
+        st.caption(f"**LLM backend** — {get_llm_backend().name} ({get_llm_backend().model_name})")
+        pool = get_db().snapshot()
+        st.caption(f"**DB pool** — {pool['open']}/{pool['size']} open • {pool['idle']} idle")
+        cache_stats = get_response_cache().snapshot()
+        st.caption(f"**Response cache** — {cache_stats['entries']} entries • {cache_stats['bytes'] / 1024:.0f} KB")
+        st.caption(f"hits {cache_stats['hits']} • disk hits {cache_stats['disk_hits']} • misses {cache_stats['misses']} • "
+                   f"evictions {cache_stats['evictions']} • expired {cache_stats['expired']}")
+        image_stats = get_image_cache().snapshot()
+        st.caption(f"**Image cache** — {image_stats['entries']} entries • hits {image_stats['hits']} • "
+                   f"misses {image_stats['misses']} • evictions {image_stats['evictions']}")
+
+# Response cache
+def normalize_code(code):
+    # Trailing whitespace, CRLF line endings and common indentation do not
+    # change what Gemini is asked, so they must not change the cache key.
+    lines = [line.rstrip() for line in code.replace("\r\n", "\n").split("\n")]
+    return textwrap.dedent("\n".join(lines)).strip("\n")
+
+def response_cache_key(feature, model_name, code_input):
+    raw = "\x00".join([feature, model_name, normalize_code(code_input)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def split_history_output(features_used, ai_output):
+    # Inverse of the "feature:\noutput" join done in process_code
+    features = features_used.split(',')
+    sections = []
+    pos = 0
+    for i, feature in enumerate(features):
+        header = f"{feature}:\n"
+        if not ai_output.startswith(header, pos):
+            return []
+        start = pos + len(header)
+        if i + 1 < len(features):
+            end = ai_output.find(f"\n\n{features[i + 1]}:\n", start)
+            if end < 0:
+                return []
+            sections.append((feature, ai_output[start:end]))
+            pos = end + 2
+        else:
+            sections.append((feature, ai_output[start:]))
+    return sections
+
+class ResponseCache:
+    # In-memory LRU tier with TTL and size limits, optionally backed by the
+    # response_cache table so entries survive restarts.
+    def __init__(self, db, model_name, ttl, max_entries, max_bytes, persist=False):
+        self.db = db
+        self.model_name = model_name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist = persist
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (output, stored_at)
+        self.size = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    def key(self, feature, code_input):
+        return response_cache_key(feature, self.model_name, code_input)
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and now - entry[1] > self.ttl:
+                self._remove(key)
+                self.stats["expired"] += 1
+                entry = None
+            if entry:
+                self.entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+
+        if self.persist:
+            with self.db.connection() as conn:
+                row = conn.execute("SELECT output, created_at FROM response_cache WHERE cache_key = ? AND created_at > ?",
+                                   (key, now - self.ttl)).fetchone()
+            if row:
+                with self.lock:
+                    self._insert(key, row[0], row[1])
+                    self.stats["disk_hits"] += 1
+                return row[0]
+
+        with self.lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key, feature, output, stored_at=None, write_through=True):
+        stored_at = stored_at or time.time()
+        with self.lock:
+            self._insert(key, output, stored_at)
+        if self.persist and write_through:
+            with self.db.connection() as conn:
+                conn.execute("INSERT OR REPLACE INTO response_cache (cache_key, feature, output, created_at) VALUES (?, ?, ?, ?)",
+                             (key, feature, output, stored_at))
+                conn.execute("DELETE FROM response_cache WHERE created_at <= ?", (time.time() - self.ttl,))
+
+    def _insert(self, key, output, stored_at):
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = (output, stored_at)
+        self.size += len(output)
+        while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+            self._remove(next(iter(self.entries)))
+            self.stats["evictions"] += 1
+
+    def _remove(self, key):
+        output, _ = self.entries.pop(key)
+        self.size -= len(output)
+
+    def warm_from_history(self, limit=1000):
+        # Seed the cache from recent chat_history rows; rows older than the
+        # TTL would be expired on first lookup, so they are skipped.
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl)
+        with self.db.connection() as conn:
+            rows = conn.execute(HISTORY_ROW_SQL + """ 
+                                   WHERE h.created_at > ?
+                                   ORDER BY h.created_at DESC LIMIT ?""",
+                                (cutoff.strftime("%Y-%m-%d %H:%M:%S"), limit)).fetchall()
+
+        warmed = 0
+        for _, code_input, features_used, ai_output, created_at in map(decode_history_row, reversed(rows)):
+            if not code_input or not features_used:
+                continue
+            stored_at = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+            for feature, output in split_history_output(features_used, ai_output):
+                if build_feature_prompt(feature, code_input) is None or output.startswith("Error generating"):
+                    continue
+                self.put(self.key(feature, code_input), feature, output, stored_at,
+                         write_through=False)
+                warmed += 1
+        return warmed
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats, entries=len(self.entries), bytes=self.size)
+
+def image_dhash(data):
+    # 64-bit difference hash: each bit says whether a pixel of the 9x8
+    # grayscale thumbnail is brighter than its right-hand neighbour. Survives
+    # re-encoding, rescaling and small crops, which change only a few bits.
+    image = Image.open(io.BytesIO(data))
+    image.draft("L", (64, 64))
+    pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = value << 1 | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+class ImageCache:
+    # Outputs for images a user has sent before, kept in the image_cache
+    # table. Entries are per user, and a hit needs the same preprocessed
+    # bytes (sha256) unless max_distance allows dHash near matches. Hits
+    # refresh last_used and inserts evict the least recently used rows.
+    def __init__(self, db, model_name, max_entries, max_distance):
+        self.db = db
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def key(self, image, prompt, user_id):
+        scope = f"u{user_id}:" + response_cache_key("📸 Convert Handwritten Code", self.model_name, prompt)
+        return scope, hashlib.sha256(image["data"]).hexdigest(), image_dhash(image["data"])
+
+    def get(self, key, exact=False):
+        scope, sha256, dhash = key
+        with self.db.connection() as conn:
+            if self.max_distance > 0 and not exact:
+                row = conn.execute(IMAGE_CACHE_NEAR_SQL, (scope, sha256, dhash, self.max_distance, sha256, dhash)).fetchone()
+            else:
+                row = conn.execute(IMAGE_CACHE_EXACT_SQL, (scope, sha256)).fetchone()
+            if row:
+                conn.execute("UPDATE image_cache SET last_used = ? WHERE id = ?", (time.time(), row[0]))
+        with self.lock:
+            self.stats["hits" if row else "misses"] += 1
+        return row[1] if row else None
+
+    def put(self, key, output):
+        scope, sha256, dhash = key
+        now = time.time()
+        with self.db.connection() as conn:
+            conn.execute("INSERT INTO image_cache (scope, sha256, dhash, output, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                         (scope, sha256, dhash, output, now, now))
+            evicted = conn.execute("""DELETE FROM image_cache WHERE id IN 
+                                          (SELECT id FROM image_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)""",
+                                   (self.max_entries,)).rowcount
+        with self.lock:
+            self.stats["evictions"] += evicted
+
+    def snapshot(self):
+        with self.db.connection() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM image_cache").fetchone()[0]
+        with self.lock:
+            return dict(self.stats, entries=entries)
+
+@st.cache_resource
+def get_image_cache():
+    return ImageCache(get_db(), get_llm_backend().model_name, IMAGE_CACHE_MAX_ENTRIES, IMAGE_CACHE_MAX_DISTANCE)
+
+@st.cache_resource
+def get_response_cache():
+    cache = ResponseCache(get_db(), get_llm_backend().model_name, RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES,
+                          persist=RESPONSE_CACHE_PERSIST)
+    if RESPONSE_CACHE_WARM:
+        cache.warm_from_history()
+    return cache
+
+# LLM backends
+# Every backend exposes the same generate() call: it returns the full text,
+# or an iterator of text pieces when stream=True.
+class GeminiBackend:
+    name = "gemini"
+
+    # genai.configure() drops the cached transport, so it runs once here and
+    # every session shares the same GenerativeModel objects (and connections).
+    def __init__(self, api_key, model_name=GEMINI_MODEL):
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.lock = threading.Lock()
+        self.models = {}
+
+    def get(self, name=None):
+        name = name or self.model_name
+        with self.lock:
+            model = self.models.get(name)
+            if model is None:
+                model = self.models[name] = genai.GenerativeModel(name)
+            return model
+
+    def generate(self, contents, stream=False, response_schema=None):
+        model = self.get()
+        if response_schema:
+            response = model.generate_content(contents, generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": response_schema,
+            })
+            return response.text
+        if stream:
+            return (chunk.text for chunk in model.generate_content(contents, stream=True) if chunk.parts)
+        return model.generate_content(contents).text
+
+    def warm_up(self, metrics):
+        started = time.perf_counter()
+        try:
+            # count_tokens opens the connection without spending generation quota
+            self.get().count_tokens("ping")
+            metrics.record("gemini.warmup", time.perf_counter() - started)
+        except Exception as e:
+            print(f"Gemini warm-up failed: {e}")
+
+class FakeBackendError(RuntimeError):
+    pass
+
+def parse_latency_spec(spec):
+    # "fixed:0.5", "uniform:0.2:1.5" or "lognormal:<median>:<sigma>" in seconds
+    kind, _, args = spec.partition(":")
+    params = [float(arg) for arg in args.split(":") if arg]
+    if kind == "fixed" and len(params) == 1:
+        return lambda rng: params[0]
+    if kind == "uniform" and len(params) == 2:
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == "lognormal" and len(params) == 2:
+        return lambda rng: rng.lognormvariate(math.log(params[0]), params[1])
+    raise ValueError(f"Invalid latency distribution: {spec}")
+
+class FakeBackend:
+    # Offline stand-in for load testing and benchmarks. Latency, output and
+    # failures are drawn from an RNG seeded with the prompt and how many times
+    # it has been asked, so a run is reproducible whatever the thread order.
+    name = "fake"
+
+    def __init__(self, latency="lognormal:0.8:0.3", tokens_per_sec=80.0, output_tokens=300,
+                 error_rate=0.0, seed=42, model_name=GEMINI_MODEL):
+        self.model_name = f"fake:{model_name}"
+        self.latency = parse_latency_spec(latency)
+        self.tokens_per_sec = tokens_per_sec
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.calls = defaultdict(int)
+
+    def _rng(self, contents):
+        parts = contents if isinstance(contents, list) else [contents]
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, dict):
+                digest.update(part["data"])
+            else:
+                digest.update(part.encode() if isinstance(part, str) else repr(getattr(part, "size", part)).encode())
+        prompt_hash = digest.hexdigest()
+        with self.lock:
+            self.calls[prompt_hash] += 1
+            call_number = self.calls[prompt_hash]
+        return random.Random(f"{self.seed}:{prompt_hash}:{call_number}"), prompt_hash
+
+    def _tokens(self, rng, prompt_hash):
+        words = ["analysis", "function", "loop", "variable", "complexity", "refactor", "return", "input"]
+        return [f"**{prompt_hash[:8]}**"] + [rng.choice(words) for _ in range(self.output_tokens - 1)]
+
+    def generate(self, contents, stream=False, response_schema=None):
+        rng, prompt_hash = self._rng(contents)
+        time.sleep(self.latency(rng))
+        if rng.random() < self.error_rate:
+            raise FakeBackendError(f"Injected failure for prompt {prompt_hash[:8]}")
+        tokens = self._tokens(rng, prompt_hash)
+
+        if response_schema:
+            time.sleep(len(tokens) / self.tokens_per_sec)
+            keys = list(response_schema.get("properties", {}))
+            return json.dumps({key: f"### {key}\n" + " ".join(tokens) for key in keys})
+        if stream:
+            return self._stream(tokens)
+        time.sleep(len(tokens) / self.tokens_per_sec)
+        return " ".join(tokens)
+
+    def _stream(self, tokens, tokens_per_chunk=16):
+        for i in range(0, len(tokens), tokens_per_chunk):
+            chunk = tokens[i:i + tokens_per_chunk]
+            time.sleep(len(chunk) / self.tokens_per_sec)
+            yield " ".join(chunk) + " "
+
+    def warm_up(self, metrics):
+        pass
+
+@st.cache_resource
+def get_llm_backend():
+    if LLM_BACKEND == "fake":
+        backend = FakeBackend(FAKE_LATENCY, FAKE_TOKENS_PER_SEC, FAKE_OUTPUT_TOKENS, FAKE_ERROR_RATE, FAKE_SEED)
+    elif LLM_BACKEND == "gemini":
+        backend = GeminiBackend(GOOGLE_API_KEY)
+    else:
+        raise ValueError(f"Unknown CODEGPT_BACKEND: {LLM_BACKEND}")
+    SETUP_STEPS.append("llm_backend")
+    if WARMUP_MODELS:
+        threading.Thread(target=backend.warm_up, args=(get_perf_metrics(),), name="llm-warmup", daemon=True).start()
+    return backend
+
+@st.cache_resource
+def start_history_maintenance():
+    # Blob migration, then retention and blob garbage collection on a timer
+    thread = threading.Thread(target=run_history_maintenance, args=(get_db(), get_perf_metrics()),
+                              name="history-maintenance", daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource
+def get_email_outbox():
+    # Also picks up mail still queued when the previous process stopped
+    outbox = EmailOutbox(get_db(), get_perf_metrics(), SMTP_SERVER, SMTP_PORT, EMAIL_USER, EMAIL_PASS,
+                         starttls=SMTP_STARTTLS)
+    threading.Thread(target=outbox.run, name="email-outbox", daemon=True).start()
+    return outbox
+
+@st.cache_resource
+def start_otp_sweeper():
+    thread = threading.Thread(target=run_otp_sweeper, args=(get_db(), get_perf_metrics()),
+                              name="otp-sweeper", daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource
+def initialize_app():
+    # Configures the LLM backend (and starts its warm-up call) and the
+    # background workers, once per process
+    SETUP_STEPS.append("workers")
+    get_llm_backend()
+    start_history_maintenance()
+    start_otp_sweeper()
+    get_email_outbox()
+
 # AI functions
-def query_gemini(prompt):
-    model = genai.GenerativeModel("gemini-1.5-flash")
-    response = model.generate_content(prompt)
-    return response.text
+def collect_stream(pieces, on_chunk):
+    text = ""
+    for piece in pieces:
+        text += piece
+        on_chunk(text)
+    return text
+
+def query_gemini(prompt, on_chunk=None, response_schema=None):
+    backend = get_llm_backend()
+    if response_schema:
+        return backend.generate(prompt, response_schema=response_schema)
+    if STREAM_RESPONSES and on_chunk:
+        return collect_stream(backend.generate(prompt, stream=True), on_chunk)
+    return backend.generate(prompt)
+
+def cached_query_gemini(cache, feature, code_input, prompt, on_chunk=None):
+    key = cache.key(feature, code_input)
+    output = cache.get(key)
+    if output is None:
+        output = query_gemini(prompt, on_chunk=on_chunk)
+        cache.put(key, feature, output)
+    return output
+
+def preprocess_image(data, max_edge=None, grayscale=None, autocontrast=None, fmt=None, quality=None):
+    # Returns the {"mime_type", "data"} part sent to the model: upright,
+    # longest edge at most max_edge and re-encoded. Phone photos are mostly
+    # JPEG, whose decoder can scale by 1/2, 1/4 or 1/8 while decoding
+    # (draft mode), so a 12 MP photo is never decoded at full size.
+    max_edge = IMAGE_MAX_EDGE if max_edge is None else max_edge
+    grayscale = IMAGE_GRAYSCALE if grayscale is None else grayscale
+    autocontrast = IMAGE_AUTOCONTRAST if autocontrast is None else autocontrast
+    fmt = fmt or IMAGE_FORMAT
+    quality = quality or IMAGE_QUALITY
+    if len(data) > IMAGE_MAX_UPLOAD_MB * 1024 * 1024:
+        raise ValueError(f"Image is larger than {IMAGE_MAX_UPLOAD_MB:g} MB")
+    image = Image.open(io.BytesIO(data))
+    if image.width * image.height > IMAGE_MAX_PIXELS:
+        raise ValueError(f"Image has more than {IMAGE_MAX_PIXELS / 1e6:g} megapixels")
+    if image.format == "JPEG" and max_edge:
+        image.draft("L" if grayscale else "RGB", (max_edge, max_edge))
+    image = ImageOps.exif_transpose(image)
+    if max_edge:
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    if grayscale:
+        image = image.convert("L")
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    if autocontrast:
+        image = ImageOps.autocontrast(image, cutoff=1)
+    out = io.BytesIO()
+    image.save(out, fmt, quality=quality, optimize=True)
+    return {"mime_type": Image.MIME[fmt], "data": out.getvalue()}
+
+def prepare_uploaded_images(uploaded_files):
+    # Pages are preprocessed in parallel, once per upload; later reruns reuse
+    # the encoded images. Returns the image part, or the error, per file.
+    prepared = st.session_state.get("prepared_images", {})
+    pending = [f for f in uploaded_files if f.file_id not in prepared]
+
+    def prepare(uploaded_file):
+        started = time.perf_counter()
+        try:
+            return preprocess_image(uploaded_file.getvalue()), time.perf_counter() - started
+        except Exception as e:
+            return e, None
+
+    results = {}
+    if pending:
+        metrics = get_perf_metrics()
+        with ThreadPoolExecutor(max_workers=MAX_FEATURE_WORKERS) as executor:
+            for uploaded_file, (payload, seconds) in zip(pending, executor.map(prepare, pending)):
+                results[uploaded_file.file_id] = payload
+                if seconds is not None:
+                    metrics.record("image.preprocess", seconds)
+                    metrics.increment("image.bytes_uploaded", uploaded_file.size)
+                    metrics.increment("image.bytes_sent", len(payload["data"]))
+    pages = [prepared.get(f.file_id) or results[f.file_id] for f in uploaded_files]
+    st.session_state.prepared_images = {f.file_id: page for f, page in zip(uploaded_files, pages)
+                                        if not isinstance(page, Exception)}
+    return pages
 
-def reply(input_text, image, prompt):
-    model1 = genai.GenerativeModel("gemini-1.5-flash")
-    response = model1.generate_content([input_text, image, prompt])
-    return response.text
+def page_order(uploaded_file):
+    # Natural sort by file name, so IMG_2 comes before IMG_10
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", uploaded_file.name)]
+
+HANDWRITTEN_PAGE_PREFIX = "📸 Convert Handwritten Code · page "
+
+def handwritten_page_label(number, total, name):
+    return f"{HANDWRITTEN_PAGE_PREFIX}{number}/{total} ({name})"
+
+def stitch_handwritten_pages(results):
+    # Per-page results collapse into a single "📸 Convert Handwritten Code"
+    # entry listing every page in order, in place of the first page
+    pages = [(feature, output) for feature, output in results if feature.startswith(HANDWRITTEN_PAGE_PREFIX)]
+    if not pages:
+        return results, None
+    stitched = "\n\n".join(f"#### Page {feature[len(HANDWRITTEN_PAGE_PREFIX):]}\n\n{output}" for feature, output in pages)
+    first = results.index(pages[0])
+    others = [result for result in results if not result[0].startswith(HANDWRITTEN_PAGE_PREFIX)]
+    return others[:first] + [("📸 Convert Handwritten Code", stitched)] + others[first:], stitched
+
+def reply(input_text, image, prompt, on_chunk=None):
+    backend = get_llm_backend()
+    if STREAM_RESPONSES and on_chunk:
+        return collect_stream(backend.generate([input_text, image, prompt], stream=True), on_chunk)
+    return backend.generate([input_text, image, prompt])
+
+def cached_reply(cache, user_id, input_text, image, prompt, exact=False, on_chunk=None):
+    if cache.max_entries <= 0:
+        return reply(input_text, image, prompt, on_chunk=on_chunk)
+    key = cache.key(image, prompt, user_id)
+    output = cache.get(key, exact)
+    if output is None:
+        output = reply(input_text, image, prompt, on_chunk=on_chunk)
+        cache.put(key, output)
+    return output
 
 def save_chat_history(user_id, code_input, features_used, ai_output):
     if user_id:
-        conn = sqlite3.connect('codegpt_users.db')
-        c = conn.cursor()
-        c.execute("INSERT INTO chat_history (user_id, code_input, features_used, ai_output) VALUES (?, ?, ?, ?)",
-                 (user_id, code_input, ','.join(features_used), ai_output))
-        conn.commit()
-        conn.close()
+        with get_db().connection(write=True) as conn:
+            code_value, code_hash = store_history_text(conn, code_input)
+            output_value, output_hash = store_history_text(conn, ai_output)
+            row_id = conn.execute("""INSERT INTO chat_history (user_id, code_input, code_hash, features_used, ai_output, output_hash) 
+                                     VALUES (?, ?, ?, ?, ?, ?)""",
+                                  (user_id, code_value, code_hash, ','.join(features_used), output_value, output_hash)).lastrowid
+            index_history_rows(conn, "id = ?", (row_id,))
+            record_history_stats(conn, user_id, features_used)
 
 
 
 
-def process_code(code_input, features_selected, uploaded_file=None):
-    results = []
-    
-    if not features_selected:
-        # Default analysis - only run if there's code input
-        if code_input:
-            prompt = f"""
+# Batched feature analysis
+# Keys used for each feature in the single-call JSON response
+FEATURE_KEYS = {
+    "🐛 Find & Fix Bugs": "find_and_fix_bugs",
+    "📚 Explain Code": "explain_code",
+    "⚡ Optimize Code": "optimize_code",
+    "🌍 Detect & Adapt Language": "detect_and_adapt_language",
+    "🔄 Refactor Code": "refactor_code",
+}
+
+FEATURE_INSTRUCTIONS = {
+    "🐛 Find & Fix Bugs": "Analyze the code for errors and potential bugs (syntax issues, logical errors, performance inefficiencies). "
+                         "Format: *Issue:*, *Errors Found:*, *Suggested Fix:* with corrected code, *Explanation:*.",
+    "📚 Explain Code": "Explain the code in simple terms. "
+                      "Format: *Overview:*, *Step-by-Step Breakdown:*, *Key Concepts Used:*.",
+    "⚡ Optimize Code": "Optimize the code. "
+                       "Format: *Current Issues:*, *Optimized Code:*, *Explanation of Improvements:*, *Performance Impact:*.",
+    "🌍 Detect & Adapt Language": "Detect the programming language and provide equivalent implementations in "
+                                 "java,c,c++,c#,java script,python,go,rust,typescript,php,swift,kotlin. "
+                                 "Format: *Detected Language:*, *Equivalent Implementations in Other Languages:*.",
+    "🔄 Refactor Code": "Refactor the code. "
+                       "Format: *Refactored Code:*, *Key Improvements:*, *Enhanced Readability Features:*.",
+}
+
+def build_batch_prompt(features, code_input):
+    sections = "\n".join(f'- "{FEATURE_KEYS[feature]}": {FEATURE_INSTRUCTIONS[feature]}' for feature in features)
+    return f"""Analyze the following code once and answer every section listed below.
+Return a JSON object with exactly these keys; each value is the complete markdown answer for that section.
+
+Code:
+{code_input}
+
+Sections:
+{sections}
+"""
+
+def build_batch_schema(features):
+    keys = [FEATURE_KEYS[feature] for feature in features]
+    return {
+        "type": "object",
+        "properties": {key: {"type": "string"} for key in keys},
+        "required": keys,
+    }
+
+class FeatureBatch:
+    # Shares one Gemini call between the worker tasks of several features.
+    # The first task to ask runs the batched request; a feature whose part
+    # is missing from the parsed response falls back to its own prompt.
+    def __init__(self, cache, metrics, features, code_input):
+        self.cache = cache
+        self.metrics = metrics
+        self.features = features
+        self.code_input = code_input
+        self.lock = threading.Lock()
+        self.outputs = None
+
+    def output_for(self, feature, on_chunk=None):
+        with self.lock:
+            if self.outputs is None:
+                self.outputs = self._run()
+        output = self.outputs.get(feature)
+        if output is None:
+            output = query_gemini(build_feature_prompt(feature, self.code_input), on_chunk=on_chunk)
+            self.cache.put(self.cache.key(feature, self.code_input), feature, output)
+        return output
+
+    def _run(self):
+        outputs = {}
+        missing = []
+        for feature in self.features:
+            cached = self.cache.get(self.cache.key(feature, self.code_input))
+            if cached is None:
+                missing.append(feature)
+            else:
+                outputs[feature] = cached
+        if len(missing) < 2:
+            return outputs
+
+        metrics = self.metrics
+        metrics.increment("batch.requests")
+        try:
+            parsed = json.loads(query_gemini(build_batch_prompt(missing, self.code_input),
+                                             response_schema=build_batch_schema(missing)))
+        except Exception as e:
+            print(f"Batched analysis failed, falling back to per-feature calls: {e}")
+            metrics.increment("batch.fallback_calls", len(missing))
+            return outputs
+
+        for feature in missing:
+            text = parsed.get(FEATURE_KEYS[feature]) if isinstance(parsed, dict) else None
+            if isinstance(text, str) and text.strip():
+                outputs[feature] = text
+                self.cache.put(self.cache.key(feature, self.code_input), feature, text)
+            else:
+                metrics.increment("batch.fallback_calls")
+        return outputs
+
+def build_feature_prompt(feature, code_input):
+    if feature == "Complete Analysis":
+        return f"""
             Make the heading as *Finding & Fixing Bugs*
             Analyze the following code for errors and potential bugs. Identify syntax issues, logical errors, and performance inefficiencies. 
             Provide a list of errors with explanations and suggest fixes. Give headings in bold text. If there are no errors, mention that there are no errors.
@@ -2097,35 +3872,8 @@ def process_code(code_input, features_selected, uploaded_file=None):
             Make the heading as *Refactoring the Code*
             Refactor the following code to enhance readability, maintainability, and structure.
             """
-            output = query_gemini(prompt)
-            results.append(("Complete Analysis", output))
-    else:
-        for feature in features_selected:
-            if feature == "📸 Convert Handwritten Code" and uploaded_file:
-                try:
-                    # Display the uploaded image in a smaller, contained frame
-                    image1 = Image.open(uploaded_file)
-                    
-                    # Create columns to control image size and layout
-                    col1, col2, col3 = st.columns([1, 2, 1])
-                    with col2:
-                        st.image(image1, caption="Uploaded Handwritten Code", width=400)
-                    
-                    # Process the image
-                    prompt = "Analyze this handwritten code image and convert it to digital code. Provide explanation and fix any errors."
-                    output = reply("", image1, prompt)  # Make sure this function exists and works
-                    results.append((feature, output))
-                except Exception as e:
-                    st.error(f"Error processing image: {str(e)}")
-                    results.append((feature, f"Error processing image: {str(e)}"))
-            
-            elif feature == "📸 Convert Handwritten Code" and not uploaded_file:
-                # Handle case where handwritten conversion is selected but no file uploaded
-                st.warning("Please upload an image for handwritten code conversion.")
-                results.append((feature, "No image uploaded for handwritten code conversion."))
-            
-            elif feature == "🐛 Find & Fix Bugs" and code_input:
-                prompt = f"""*Finding & Fixing Bugs*
+    elif feature == "🐛 Find & Fix Bugs":
+        return f"""*Finding & Fixing Bugs*
                 
                 Analyze the following code for errors and potential bugs. Identify syntax issues, logical errors, and performance inefficiencies.
                 Code: {code_input}
@@ -2136,11 +3884,8 @@ def process_code(code_input, features_selected, uploaded_file=None):
                 - *Suggested Fix:* Provide corrected code
                 - *Explanation:* Explain why the fix works
                 """
-                output = query_gemini(prompt)
-                results.append((feature, output))
-            
-            elif feature == "📚 Explain Code" and code_input:
-                prompt = f"""*Code Explanation*
+    elif feature == "📚 Explain Code":
+        return f"""*Code Explanation*
                 
                 Explain the following code in simple terms:
                 {code_input}
@@ -2150,11 +3895,8 @@ def process_code(code_input, features_selected, uploaded_file=None):
                 - *Step-by-Step Breakdown:* Explain each important line
                 - *Key Concepts Used:* List algorithms, data structures, and logic patterns
                 """
-                output = query_gemini(prompt)
-                results.append((feature, output))
-            
-            elif feature == "⚡ Optimize Code" and code_input:
-                prompt = f"""*Code Optimization*
+    elif feature == "⚡ Optimize Code":
+        return f"""*Code Optimization*
                 
                 Optimize the following code:
                 {code_input}
@@ -2165,11 +3907,8 @@ def process_code(code_input, features_selected, uploaded_file=None):
                 - *Explanation of Improvements:*
                 - *Performance Impact:*
                 """
-                output = query_gemini(prompt)
-                results.append((feature, output))
-            
-            elif feature == "🌍 Detect & Adapt Language" and code_input:
-                prompt = f"""*Language Detection & Adaptation*
+    elif feature == "🌍 Detect & Adapt Language":
+        return f"""*Language Detection & Adaptation*
                 
                 Detect the programming language and provide equivalent implementations java,c,c++,c#,java script,python,go,rust,typescript,php,swift,kotlin:
                 {code_input}
@@ -2178,11 +3917,8 @@ def process_code(code_input, features_selected, uploaded_file=None):
                 - *Detected Language:*
                 - *Equivalent Implementations in Other Languages:*
                 """
-                output = query_gemini(prompt)
-                results.append((feature, output))
-            
-            elif feature == "🔄 Refactor Code" and code_input:
-                prompt = f"""*Code Refactoring*
+    elif feature == "🔄 Refactor Code":
+        return f"""*Code Refactoring*
                 
                 Refactor the following code:
                 {code_input}
@@ -2192,33 +3928,176 @@ def process_code(code_input, features_selected, uploaded_file=None):
                 - *Key Improvements:*
                 - *Enhanced Readability Features:*
                 """
-                output = query_gemini(prompt)
-                results.append((feature, output))
+    return None
+
+
+def run_feature_task(index, task, events):
+    # Runs in a worker thread: never touches st.*, only reports back through
+    # the events queue which the script thread drains.
+    started = time.perf_counter()
+    first_token = None
+
+    def on_chunk(text):
+        nonlocal first_token
+        if first_token is None:
+            first_token = time.perf_counter() - started
+        events.put((index, "chunk", text))
+
+    try:
+        output = task(on_chunk=on_chunk)
+        total = time.perf_counter() - started
+        events.put((index, "done", (output, first_token if first_token is not None else total, total)))
+    except Exception as e:
+        events.put((index, "error", e))
+
+
+def run_feature_tasks(sections, timer):
+    # Render a placeholder per section up front so the page keeps the selected
+    # order, then fill each one in as soon as its Gemini call comes back.
+    with timer.phase("render"):
+        st.markdown("## -- Output -- ")
+        placeholders = []
+        timing_placeholders = []
+        for feature, _ in sections:
+            st.markdown(f"### {feature}")
+            with st.container():
+                placeholders.append(st.empty())
+                timing_placeholders.append(st.empty())
+                st.markdown("---")
+
+    metrics = get_perf_metrics()
+    events = queue.Queue()
+    outputs = [None] * len(sections)
+    pending = 0
+    with ThreadPoolExecutor(max_workers=MAX_FEATURE_WORKERS) as executor:
+        for i, (feature, task) in enumerate(sections):
+            if callable(task):
+                with timer.phase("render"):
+                    placeholders[i].markdown("⏳ *Generating...*")
+                executor.submit(run_feature_task, i, task, events)
+                pending += 1
+            else:
+                outputs[i] = task
+                with timer.phase("render"):
+                    placeholders[i].markdown(task)
+
+        while pending:
+            with timer.phase("model"):
+                i, kind, payload = events.get()
+            with timer.phase("render"):
+                if kind == "chunk":
+                    placeholders[i].markdown(payload + " ▌")
+                elif kind == "done":
+                    outputs[i], first_token, total = payload
+                    placeholders[i].markdown(outputs[i])
+                    timing_placeholders[i].caption(f"⏱️ First token {first_token:.1f}s • Total {total:.1f}s")
+                    metrics.record("gemini.first_token", first_token)
+                    metrics.record("gemini.total", total)
+                    pending -= 1
+                else:
+                    outputs[i] = f"Error generating {sections[i][0]}: {str(payload)}"
+                    placeholders[i].error(outputs[i])
+                    pending -= 1
+
+    return [(feature, output) for (feature, _), output in zip(sections, outputs)]
+
+
+def build_feature_sections(code_input, features_selected, uploaded_files=None, batch=False):
+    # Each section is (feature, task) where task is either a callable that
+    # queries Gemini or an already known output string.
+    sections = []
+    cache = get_response_cache()
+
+    # In batch mode the text features share a single JSON-structured request
+    feature_batch = None
+    batch_features = [f for f in features_selected if f in FEATURE_KEYS] if code_input else []
+    if batch and len(batch_features) > 1:
+        feature_batch = FeatureBatch(cache, get_perf_metrics(), batch_features, code_input)
+    
+    if not features_selected:
+        # Default analysis - only run if there's code input
+        if code_input:
+            prompt = build_feature_prompt("Complete Analysis", code_input)
+            sections.append(("Complete Analysis", partial(cached_query_gemini, cache, "Complete Analysis", code_input, prompt)))
+    else:
+        for feature in features_selected:
+            if feature == "📸 Convert Handwritten Code" and uploaded_files:
+                pages = prepare_uploaded_images(uploaded_files)
+                images = [(page, f.name) for f, page in zip(uploaded_files, pages) if not isinstance(page, Exception)]
+                
+                # Display the images as they are sent, in a smaller, contained frame
+                if len(pages) == 1 and images:
+                    col1, col2, col3 = st.columns([1, 2, 1])
+                    with col2:
+                        st.image(images[0][0]["data"], caption="Uploaded Handwritten Code", width=400)
+                elif images:
+                    st.image([page["data"] for page, _ in images], caption=[name for _, name in images], width=150)
+                
+                # Process each page; one page keeps the plain feature name. Pages
+                # of one notebook look alike to a perceptual hash, so a
+                # multi-page upload only reuses exact matches from the cache.
+                prompt = "Analyze this handwritten code image and convert it to digital code. Provide explanation and fix any errors."
+                for number, (uploaded_file, page) in enumerate(zip(uploaded_files, pages), 1):
+                    label = feature if len(pages) == 1 else handwritten_page_label(number, len(pages), uploaded_file.name)
+                    if isinstance(page, Exception):
+                        st.error(f"Error processing image {uploaded_file.name}: {str(page)}")
+                        sections.append((label, f"Error processing image: {str(page)}"))
+                    else:
+                        sections.append((label, partial(cached_reply, get_image_cache(), st.session_state.user_id, "", page, prompt,
+                                                        exact=len(pages) > 1)))
+            
+            elif feature == "📸 Convert Handwritten Code" and not uploaded_files:
+                # Handle case where handwritten conversion is selected but no file uploaded
+                st.warning("Please upload an image for handwritten code conversion.")
+                sections.append((feature, "No image uploaded for handwritten code conversion."))
+            
+            elif feature_batch and feature in feature_batch.features:
+                sections.append((feature, partial(feature_batch.output_for, feature)))
+            
+            elif code_input:
+                prompt = build_feature_prompt(feature, code_input)
+                if prompt:
+                    sections.append((feature, partial(cached_query_gemini, cache, feature, code_input, prompt)))
             
             # Handle cases where code input is required but not provided
-            elif feature != "📸 Convert Handwritten Code" and not code_input:
+            else:
                 st.warning(f"Please provide code input for {feature}")
-                results.append((feature, f"No code input provided for {feature}"))
+                sections.append((feature, f"No code input provided for {feature}"))
+    return sections
+
+
+def process_code(code_input, features_selected, uploaded_files=None, batch=False):
+    timer = PhaseTimer()
+    with timer.phase("prompt"):
+        sections = build_feature_sections(code_input, features_selected, uploaded_files, batch)
     
     # Only display results if there are any
-    if results:
-        st.markdown("## -- Output -- ")
-        # Display results
-        for feature, output in results:
-            st.markdown(f"### {feature}")
-            with st.container():
-                st.markdown(output)
-                st.markdown("---")
+    if sections:
+        # All selected features are sent to Gemini at once
+        results = run_feature_tasks(sections, timer)
+        results, stitched = stitch_handwritten_pages(results)
+        if stitched:
+            with timer.phase("render"):
+                with st.expander("📄 Handwritten code, all pages in order"):
+                    st.markdown(stitched)
         
         # Save to history if user is logged in
         if st.session_state.authenticated and results:
             combined_output = "\n\n".join([f"{feature}:\n{output}" for feature, output in results])
-            save_chat_history(st.session_state.user_id, code_input, 
-                             [f[0] for f in results], combined_output)
+            with timer.phase("save"):
+                save_chat_history(st.session_state.user_id, code_input, 
+                                 [f[0] for f in results], combined_output)
             st.success("💾 Analysis saved to your history!")
     else:
         st.info("No output generated. Please check your inputs and selected features.")
 
+    # Kept per session so the benchmark suite can read the breakdown of the last run
+    timings = timer.as_dict()
+    st.session_state.last_run_timings = timings
+    metrics = get_perf_metrics()
+    for phase, seconds in timings.items():
+        metrics.record(f"pipeline.{phase}", seconds)
+
 
 # Updated main application
 def main_page():
@@ -2261,6 +4140,10 @@ def main_page():
         refactor_code = st.checkbox("🔄 Refactor Code")
         convert_handwritten = st.checkbox("📸 Convert Handwritten")
 
+    batch_mode = st.toggle("🧩 Combine features into a single request", value=BATCH_FEATURES,
+                           help="Sends the code once for all selected features. Falls back to "
+                                "separate requests if the combined answer can't be split into sections.")
+
     features_selected = []
     if find_bugs: features_selected.append("🐛 Find & Fix Bugs")
     if explain_code: features_selected.append("📚 Explain Code")
@@ -2268,15 +4151,25 @@ def main_page():
     if detect_language: features_selected.append("🌍 Detect & Adapt Language")
     if refactor_code: features_selected.append("🔄 Refactor Code")
 
-    uploaded_file = None
+    uploaded_files = []
     if convert_handwritten:
         features_selected.append("📸 Convert Handwritten Code")  # Fixed: Use consistent name
-        uploaded_file = st.file_uploader("📸 Upload Handwritten Code Image", type=["png", "jpg", "jpeg"])
+        uploaded_files = st.file_uploader("📸 Upload Handwritten Code Images", type=["png", "jpg", "jpeg"],
+                                          accept_multiple_files=True,
+                                          help=f"One image per page, up to {IMAGE_MAX_PAGES} pages of {IMAGE_MAX_UPLOAD_MB:g} MB each. "
+                                               "Pages are read in file name order.")
+        uploaded_files = sorted(uploaded_files, key=page_order)
+        if len(uploaded_files) > IMAGE_MAX_PAGES:
+            st.warning(f"Only the first {IMAGE_MAX_PAGES} pages will be converted.")
+            uploaded_files = uploaded_files[:IMAGE_MAX_PAGES]
         
-        # Show file upload status without displaying the image
-        if uploaded_file is not None:
-            st.success(f"✅ Image uploaded successfully: {uploaded_file.name}")
+        # Show file upload status without displaying the images
+        if len(uploaded_files) == 1:
+            st.success(f"✅ Image uploaded successfully: {uploaded_files[0].name}")
             st.info("Click 'Process Selected Features' to analyze the handwritten code.")
+        elif uploaded_files:
+            st.success(f"✅ {len(uploaded_files)} pages uploaded")
+            st.info("Click 'Process Selected Features' to convert every page.")
 
     # Action Buttons
     st.markdown("### 🎛 Quick Actions")
@@ -2290,21 +4183,21 @@ def main_page():
 
     # Button Actions
     if analyze_all:
-        if code_input or uploaded_file:
+        if code_input or uploaded_files:
             with st.spinner("🤖 CodeGPT is analyzing your code..."):
                 all_features = ["🐛 Find & Fix Bugs", "📚 Explain Code", "⚡ Optimize Code",
                                 "🌍 Detect & Adapt Language", "🔄 Refactor Code"]
                 # Add handwritten conversion if image is uploaded
-                if uploaded_file:
+                if uploaded_files:
                     all_features.append("📸 Convert Handwritten Code")
-                process_code(code_input, all_features, uploaded_file)
+                process_code(code_input, all_features, uploaded_files, batch=batch_mode)
         else:
             st.warning("Please provide code input or upload an image!")
 
     if process_selected:
-        if features_selected and (code_input or uploaded_file):
+        if features_selected and (code_input or uploaded_files):
             with st.spinner("🤖 CodeGPT is processing..."):
-                process_code(code_input, features_selected, uploaded_file)
+                process_code(code_input, features_selected, uploaded_files, batch=batch_mode)
         elif not features_selected:
             st.warning("Please select at least one feature!")
         else:
@@ -2315,7 +4208,13 @@ def main_page():
 
 
 def main():
+    initialize_app()
+    metrics = get_perf_metrics()
+    metrics.increment("app.runs")
+    metrics.increment("setup.steps", len(SETUP_STEPS))
     show_navigation()
+    if SHOW_DIAGNOSTICS:
+        show_diagnostics()
     
     # Route to different pages based on current_page
     if st.session_state.current_page == 'main':
@@ -2339,13 +4238,7 @@ def main():
 # Footer
 def show_footer():
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; padding: 20px; color: #666;'>
-        <h4>🚀 TEAM ARJUNA — Innovating at the Speed of Thought</h4>
-        <p>🧠 Powered by <strong>Google Gemini AI</strong> | 🔧 Built with <strong>Streamlit</strong></p>
-        <p style='font-size: 0.8em; margin-top: 15px;'>© 2025 CodeGPT. All rights reserved.</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(get_static_pages()["footer"], unsafe_allow_html=True)
 
 
 
@@ -0,0 +1,193 @@
+# Throughput and signup latency benchmark for outbound email.
+#
+# Runs a local SMTP stand-in (socketserver) that accepts everything and can
+# add a handshake delay, standing in for the TCP/TLS setup and AUTH round
+# trips of a remote server, and hang up after every N messages. Three
+# measurements:
+#   inline       connect, login, send and quit per message, as
+#                send_otp_email did before the outbox
+#   outbox       app.EmailOutbox draining a queue over one reused
+#                connection: enqueue latency and messages/sec until the
+#                stand-in has received everything
+#   signup_form  submitting the signup form through Streamlit's AppTest
+#                runner, which now only queues the message
+#
+#   python benchmarks/bench_email.py --messages 200 --handshake-ms 150 --output email.json
+import argparse
+import os
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import compare, make_app, make_workdir, summarize, write_results  # noqa: E402
+
+os.chdir(make_workdir("codegpt-email-"))
+import app  # noqa: E402  (creates the schema, including email_outbox)
+
+SENDER = "bench@codegpt.local"
+
+
+class StandInHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        time.sleep(server.handshake_delay)
+        self.reply("220 standin ESMTP")
+        received = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.wfile.write(b"250-standin\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+            elif command.startswith("AUTH"):
+                time.sleep(server.handshake_delay)
+                self.reply("235 2.7.0 Authentication successful")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                received += 1
+                with server.lock:
+                    server.delivered += 1
+                self.reply("250 OK queued")
+                if server.drop_every and received % server.drop_every == 0:
+                    return  # hang up, like a per-connection message limit
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class StandInSMTP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handshake_delay, drop_every):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.handshake_delay = handshake_delay
+        self.drop_every = drop_every
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.delivered = 0
+
+    def wait_for(self, count, timeout=300):
+        deadline = time.monotonic() + timeout
+        while self.delivered < count:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"stand-in received {self.delivered}/{count} messages")
+            time.sleep(0.005)
+
+
+def message(recipient, i):
+    return f"From: {SENDER}\r\nTo: {recipient}\r\nSubject: bench {i}\r\n\r\nYour code is {i:06d}\r\n"
+
+
+def run_inline(server, count):
+    samples = []
+    started = time.perf_counter()
+    for i in range(count):
+        sent = time.perf_counter()
+        smtp = smtplib.SMTP(*server.server_address)
+        smtp.login(SENDER, "bench")
+        smtp.sendmail(SENDER, f"user{i}@x.io", message(f"user{i}@x.io", i))
+        smtp.quit()
+        samples.append(time.perf_counter() - sent)
+    elapsed = time.perf_counter() - started
+    return {"send": summarize(samples), "messages_per_sec": count / elapsed}
+
+
+def run_outbox(server, count):
+    host, port = server.server_address
+    metrics = app.PerfMetrics()
+    outbox = app.EmailOutbox(app.get_db(), metrics, host, port, SENDER, "bench", starttls=False)
+    threading.Thread(target=outbox.run, name="bench-outbox", daemon=True).start()
+    target = server.delivered + count
+    samples = []
+    started = time.perf_counter()
+    for i in range(count):
+        queued = time.perf_counter()
+        outbox.enqueue(f"user{i}@x.io", f"bench {i}", f"<p>Your code is {i:06d}</p>")
+        samples.append(time.perf_counter() - queued)
+    server.wait_for(target)
+    elapsed = time.perf_counter() - started
+    counts = metrics.counts()
+    return {"enqueue": summarize(samples), "messages_per_sec": count / elapsed,
+            "connects": counts.get("email.connects", 0), "retries": counts.get("email.retries", 0)}
+
+
+def run_signup_form(server, count):
+    host, port = server.server_address
+    at = make_app()
+    at.secrets["SMTP_SERVER"] = host
+    at.secrets["SMTP_PORT"] = str(port)
+    at.secrets["SMTP_STARTTLS"] = "0"
+    at.run()
+    target = server.delivered + count
+    samples = []
+    for i in range(count):
+        at.session_state["current_page"] = "signup"
+        at.run()
+        for label, value in (("Username", f"signup{i}"), ("Email", f"signup{i}@x.io"),
+                             ("Password", "secret123"), ("Confirm Password", "secret123")):
+            next(t for t in at.text_input if t.label == label).input(value)
+        button = next(b for b in at.button if b.label == "Create Account")
+        started = time.perf_counter()
+        button.click().run()
+        samples.append(time.perf_counter() - started)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        if at.session_state["current_page"] != "verify_otp":
+            raise RuntimeError("signup did not reach the OTP page")
+    server.wait_for(target)
+    return {"submit": summarize(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="email delivery throughput and signup latency")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--signups", type=int, default=20)
+    parser.add_argument("--handshake-ms", type=float, default=150,
+                        help="stand-in delay before the greeting and on AUTH")
+    parser.add_argument("--drop-every", type=int, default=50,
+                        help="stand-in hangs up after this many messages per connection (0 never)")
+    parser.add_argument("--output", default="bench_email.json")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    server = StandInSMTP(args.handshake_ms / 1000, args.drop_every)
+    threading.Thread(target=server.serve_forever, name="smtp-standin", daemon=True).start()
+
+    results = {"inline": run_inline(server, args.messages),
+               "outbox": run_outbox(server, args.messages),
+               "signup_form": run_signup_form(server, args.signups)}
+    server.shutdown()
+
+    inline, outbox, signup = results["inline"], results["outbox"], results["signup_form"]
+    print(f"\n{'mode':<8} {'msg/s':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    print(f"{'inline':<8} {inline['messages_per_sec']:8.1f} {inline['send']['p50'] * 1000:9.2f} "
+          f"{inline['send']['p95'] * 1000:9.2f}  (per send)")
+    print(f"{'outbox':<8} {outbox['messages_per_sec']:8.1f} {outbox['enqueue']['p50'] * 1000:9.2f} "
+          f"{outbox['enqueue']['p95'] * 1000:9.2f}  (per enqueue, {outbox['connects']} connects)")
+    print(f"signup form submit p50 {signup['submit']['p50'] * 1000:.2f} ms, p95 {signup['submit']['p95'] * 1000:.2f} ms "
+          f"(previously plus one inline send)")
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    write_results(os.path.abspath(args.output), "email", settings, results)
+    if args.compare:
+        compare(os.path.abspath(args.compare), results)
+
+
+if __name__ == "__main__":
+    main()
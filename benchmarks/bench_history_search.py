@@ -0,0 +1,111 @@
+# Latency benchmark for the history search box (app.search_history).
+#
+# Fills a throwaway database and indexes each batch with
+# app.index_history_rows, so the FTS5 index is built exactly as the app
+# builds it. Words are drawn with a
+# Zipf-like skew from the snippet corpus and README, and one "heavy" user
+# owns a larger share of the rows. Each query shape is then timed for random
+# users and for the heavy user, snippets included.
+#
+#   python benchmarks/bench_history_search.py --rows 1000000 --output search.json
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import REPO_ROOT, compare, load_corpus, make_workdir, summarize, write_results  # noqa: E402
+
+make_workdir("codegpt-search-")
+import app  # noqa: E402  (creates the schema and FTS triggers)
+
+FEATURES = ["🐛 Find & Fix Bugs", "📚 Explain Code", "⚡ Optimize Code", "🌍 Detect & Adapt Language", "🔄 Refactor Code"]
+TARGET_MS = 100
+
+
+def load_vocabulary():
+    with open(os.path.join(REPO_ROOT, "README.md")) as f:
+        texts = [f.read()] + list(load_corpus().values())
+    counts = {}
+    for text in texts:
+        for word in re.findall(r"[A-Za-z]{3,}", text):
+            counts[word.lower()] = counts.get(word.lower(), 0) + 1
+    return sorted(counts, key=counts.get, reverse=True)
+
+
+def seed(users, rows, heavy_share, vocabulary, batch_size=10000):
+    rng = random.Random(5)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    heavy_rows = int(rows * heavy_share)
+    started = time.perf_counter()
+    for start in range(0, rows, batch_size):
+        batch = []
+        for i in range(start, min(rows, start + batch_size)):
+            user_id = 1 if i < heavy_rows else rng.randint(2, users)
+            code = " ".join(rng.choices(vocabulary, weights, k=25))
+            output = " ".join(rng.choices(vocabulary, weights, k=60))
+            batch.append((user_id, code, ",".join(rng.sample(FEATURES, 2)), output, f"-{rng.randint(0, 86400 * 365)} seconds"))
+        with app.get_db().connection(write=True) as conn:
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM chat_history").fetchone()[0]
+            conn.executemany("INSERT INTO chat_history (user_id, code_input, features_used, ai_output, created_at) "
+                             "VALUES (?, ?, ?, ?, datetime('now', ?))", batch)
+            app.index_history_rows(conn, "id > ?", (last_id,))
+        done = min(rows, start + batch_size)
+        if done % (batch_size * 10) == 0 or done == rows:
+            print(f"seeded {done}/{rows} rows ({time.perf_counter() - started:.0f}s)")
+    with app.get_db().connection() as conn:
+        conn.execute("INSERT INTO history_fts (history_fts) VALUES ('optimize')")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="history search latency on a large database")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--heavy-share", type=float, default=0.02, help="share of rows owned by user 1")
+    parser.add_argument("--queries", type=int, default=50, help="searches per query shape and user kind")
+    parser.add_argument("--output", default="bench_history_search.json")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    vocabulary = load_vocabulary()
+    seed(args.users, args.rows, args.heavy_share, vocabulary)
+
+    rng = random.Random(9)
+    middle = len(vocabulary) // 2
+    shapes = {
+        "common_word": lambda: vocabulary[rng.randint(0, 4)],
+        "mid_word": lambda: vocabulary[rng.randint(middle - 20, middle + 20)],
+        "rare_word": lambda: vocabulary[rng.randint(len(vocabulary) - 50, len(vocabulary) - 1)],
+        "two_words": lambda: f"{vocabulary[rng.randint(0, 50)]} {vocabulary[rng.randint(0, 200)]}",
+        "prefix": lambda: vocabulary[rng.randint(0, 100)][:4] + "*",
+    }
+    user_kinds = {"typical_user": lambda: rng.randint(2, args.users), "heavy_user": lambda: 1}
+
+    results = {}
+    for kind, pick_user in user_kinds.items():
+        for shape, make_query in shapes.items():
+            samples = []
+            for _ in range(args.queries):
+                user_id, text = pick_user(), make_query()
+                started = time.perf_counter()
+                app.search_history(user_id, text)
+                samples.append(time.perf_counter() - started)
+            results.setdefault(kind, {})[shape] = summarize(samples)
+
+    print(f"\n{'user':<14} {'query':<12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for kind, shapes_results in results.items():
+        for shape, stats in shapes_results.items():
+            flag = "" if stats["p95"] * 1000 < TARGET_MS else f"  over {TARGET_MS} ms"
+            print(f"{kind:<14} {shape:<12} {stats['p50'] * 1000:9.2f} {stats['p95'] * 1000:9.2f} "
+                  f"{stats['p99'] * 1000:9.2f}{flag}")
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    write_results(os.path.abspath(args.output), "history_search", settings, results)
+    if args.compare:
+        compare(os.path.abspath(args.compare), results)
+
+
+if __name__ == "__main__":
+    main()
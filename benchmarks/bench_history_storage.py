@@ -0,0 +1,172 @@
+# Size and read-latency benchmark for the chat_history storage formats.
+#
+# Fills a throwaway database with Analyze All-sized rows built from the
+# snippet corpus and README prose, stored inline as plain TEXT; a share of
+# rows repeat an earlier analysis, as re-analyzing a snippet does. Each codec
+# then gets its own copy, moved into history_blobs by
+# app.migrate_history_rows (the same code the background migration runs),
+# vacuumed and measured: file size, migration time, the time to read
+# history pages (previews only, as the page query returns them) and the time
+# to load and decode one full entry, as Full View does. "inline" is the
+# seeded database as it was before the blob store, the baseline the ratios
+# are taken against.
+#
+#   python benchmarks/bench_history_storage.py --rows-per-user 100 --output storage.json
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import REPO_ROOT, compare, load_corpus, make_workdir, summarize, write_results  # noqa: E402
+
+workdir = make_workdir("codegpt-storage-", "plain.db")
+os.environ["CODEGPT_HISTORY_COMPRESSION"] = "none"
+os.environ["CODEGPT_HISTORY_MIGRATE"] = "0"
+import app  # noqa: E402  (creates the schema in plain.db)
+
+FEATURES = ["🐛 Find & Fix Bugs", "📚 Explain Code", "⚡ Optimize Code", "🌍 Detect & Adapt Language", "🔄 Refactor Code"]
+PAGE_SIZE = 10
+
+
+def load_prose():
+    with open(os.path.join(REPO_ROOT, "README.md")) as f:
+        return [line.strip() for line in f if len(line.strip()) > 40]
+
+
+def fake_analysis(rng, corpus, prose):
+    # One "feature:\noutput" section per feature, like process_code saves.
+    # The language section carries a translation into every other language.
+    sections = []
+    for feature in FEATURES:
+        text = "\n\n".join(rng.sample(prose, min(len(prose), 6)))
+        snippets = corpus if "Language" in feature else rng.sample(corpus, 2)
+        for lang, code in snippets:
+            text += f"\n\n```{lang}\n{code}\n```"
+        sections.append(f"{feature}:\n{text}")
+    return "\n\n".join(sections)
+
+
+def seed(path, users, rows_per_user, repeat_rate):
+    rng = random.Random(11)
+    # (language, code) pairs, the language taken from the file extension
+    corpus = [(os.path.splitext(name)[1].lstrip("."), code) for name, code in load_corpus().items()]
+    prose = load_prose()
+    rows = []
+    for _ in range(users * rows_per_user):
+        if rows and rng.random() < repeat_rate:
+            rows.append(rng.choice(rows))
+        else:
+            rows.append((rng.choice(corpus)[1], fake_analysis(rng, corpus, prose)))
+    conn = sqlite3.connect(path)
+    app.register_sql_functions(conn)  # history_fts_source decodes with it
+    conn.executemany("INSERT INTO users (username, email, password_hash, verified) VALUES (?, ?, ?, 1)",
+                     [(f"user{i}", f"user{i}@x.io", "h") for i in range(users)])
+    conn.executemany("INSERT INTO chat_history (user_id, code_input, features_used, ai_output, created_at) "
+                     "VALUES (?, ?, ?, ?, datetime('now', ?))",
+                     [(i % users + 1, code, ",".join(FEATURES), output, f"-{rng.randint(0, 86400 * 90)} seconds")
+                      for i, (code, output) in enumerate(rows)])
+    conn.execute("INSERT INTO history_fts (history_fts) VALUES ('rebuild')")  # indexed, as the app would have
+    conn.commit()
+    conn.close()
+
+
+def compact(path):
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return os.path.getsize(path)
+
+
+def read_pages(db, users, pages_per_user):
+    # Walks each user's history newest-first with the keyset queries the
+    # history page uses.
+    samples = []
+    for user_id in range(1, users + 1):
+        cursor = None
+        for _ in range(pages_per_user):
+            started = time.perf_counter()
+            with db.connection() as conn:
+                if cursor is None:
+                    rows = conn.execute(app.HISTORY_PAGE_SQL, (user_id, PAGE_SIZE + 1)).fetchall()
+                else:
+                    rows = conn.execute(app.HISTORY_PAGE_AFTER_SQL, (user_id, *cursor, PAGE_SIZE + 1)).fetchall()
+            samples.append(time.perf_counter() - started)
+            if len(rows) <= PAGE_SIZE:
+                break
+            cursor = (rows[PAGE_SIZE - 1][-1], rows[PAGE_SIZE - 1][0])
+    return samples
+
+
+def read_entries(db, rows, count, rng):
+    entries = []
+    with db.connection() as conn:
+        for _ in range(count):
+            entries.append(conn.execute("SELECT id, user_id FROM chat_history WHERE id = ?",
+                                        (rng.randint(1, rows),)).fetchone())
+    samples = []
+    for entry in entries:
+        started = time.perf_counter()
+        with db.connection() as conn:
+            app.decode_history_row(conn.execute(app.HISTORY_ENTRY_SQL, entry).fetchone())
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="chat_history size and read latency per storage format")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--rows-per-user", type=int, default=100)
+    parser.add_argument("--repeat-rate", type=float, default=0.3, help="share of rows repeating an earlier analysis")
+    parser.add_argument("--pages", type=int, default=5, help="history pages read per user and round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", default="bench_history_storage.json")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    plain_path = os.environ["CODEGPT_DB_PATH"]
+    seed(plain_path, args.users, args.rows_per_user, args.repeat_rate)
+    codecs = ["none", "zlib"] + (["zstd"] if app.zstandard is not None else [])
+
+    results = {}
+    for codec in ["inline"] + codecs:
+        path = os.path.join(workdir, f"{codec}.db")
+        source, target = sqlite3.connect(plain_path), sqlite3.connect(path)
+        source.backup(target)
+        source.close()
+        target.close()
+
+        db = app.Database(path, pool_size=2)
+        started = time.perf_counter()
+        migrated = app.migrate_history_rows(db, app.PerfMetrics(), codec, pause=0) if codec != "inline" else 0
+        migrate_seconds = time.perf_counter() - started
+        db_bytes = compact(path)
+
+        samples = []
+        for _ in range(args.rounds):
+            samples += read_pages(db, args.users, args.pages)
+        entry_samples = read_entries(db, args.users * args.rows_per_user, len(samples), random.Random(3))
+        results[codec] = {"db_bytes": db_bytes, "rows_migrated": migrated,
+                          "migrate_seconds": migrate_seconds, "page_read": summarize(samples),
+                          "entry_read": summarize(entry_samples)}
+
+    baseline = results["inline"]["db_bytes"]
+    print(f"\n{'codec':<6} {'db size':>10} {'ratio':>7} {'migrate':>9} {'page p50':>10} {'page p95':>10} "
+          f"{'entry p50':>10} {'entry p95':>10}")
+    for codec, result in results.items():
+        page, entry = result["page_read"], result["entry_read"]
+        print(f"{codec:<6} {result['db_bytes'] / 1024 / 1024:8.2f}MB {result['db_bytes'] / baseline:7.2f} "
+              f"{result['migrate_seconds']:8.2f}s {page['p50'] * 1000:8.2f}ms {page['p95'] * 1000:8.2f}ms "
+              f"{entry['p50'] * 1000:8.2f}ms {entry['p95'] * 1000:8.2f}ms")
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    write_results(os.path.abspath(args.output), "history_storage", settings, results)
+    if args.compare:
+        compare(os.path.abspath(args.compare), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Bytes sent and latency of the handwritten-code image path, per image size.
+#
+# Draws synthetic "photos of handwritten code" (pen strokes on uneven paper
+# with sensor noise) at several resolutions and saves them as the camera
+# would: JPEG with an EXIF orientation tag, plus a PNG screenshot variant.
+# For each one it times:
+#   before       Image.open of the raw upload, re-encoded the way the Gemini
+#                SDK encodes an in-memory PIL image (lossless WebP, full size)
+#   preprocess   app.preprocess_image with the configured defaults and with
+#                grayscale/contrast turned off
+#
+#   python benchmarks/bench_image.py --sizes 1,3,12,24 --output image.json
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+from PIL import Image, ImageDraw, ImageFilter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import compare, make_workdir, summarize, write_results  # noqa: E402
+
+make_workdir("codegpt-image-")
+import app  # noqa: E402
+
+app.IMAGE_MAX_UPLOAD_MB = 1024  # the largest synthetic PNGs exceed the app's cap
+app.IMAGE_MAX_PIXELS = 10 ** 9
+
+
+def handwriting_photo(megapixels, seed):
+    rng = random.Random(seed)
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    # Drawn small and scaled up, so strokes and shading cost the same at any size
+    base_w, base_h = 1200, 900
+    image = Image.new("RGB", (base_w, base_h), (226, 220, 204))
+    draw = ImageDraw.Draw(image)
+    for x in range(0, base_w, 40):
+        draw.line([(x, 0), (x + 200, base_h)], fill=(210, 204, 190), width=30)  # uneven lighting
+    for row in range(18):
+        y = 60 + row * 45
+        draw.line([(40, y + 20), (base_w - 40, y + 20)], fill=(170, 190, 215), width=1)  # ruled paper
+        x = 60 + rng.randint(0, 4) * 30
+        while x < base_w - 120 and rng.random() > 0.05:
+            stroke = [(x + rng.randint(0, 14), y + rng.randint(-12, 14)) for _ in range(5)]
+            draw.line(stroke, fill=(30, 35, 80), width=3)
+            x += rng.randint(10, 28)
+    image = image.resize((width, height), Image.BICUBIC).filter(ImageFilter.GaussianBlur(1))
+    noise = Image.effect_noise((width, height), 12).convert("RGB")
+    return Image.blend(image, noise, 0.08)
+
+
+def encode_upload(image, fmt):
+    out = io.BytesIO()
+    if fmt == "JPEG":
+        exif = Image.Exif()
+        exif[0x0112] = 6  # camera held upright: rotate 90° on display
+        image.save(out, "JPEG", quality=92, exif=exif)
+    else:
+        image.save(out, "PNG")
+    return out.getvalue()
+
+
+def before(data):
+    image = Image.open(io.BytesIO(data))
+    out = io.BytesIO()
+    image.save(out, format="webp", lossless=True)
+    return out.getvalue()
+
+
+def time_variant(fn, data, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        sent = fn(data)
+        samples.append(time.perf_counter() - started)
+    return {"bytes_sent": len(sent), "latency": summarize(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="image preprocessing bytes and latency by image size")
+    parser.add_argument("--sizes", default="1,3,12,24", help="comma separated megapixels")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default="bench_image.json")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    variants = {
+        "before": before,
+        "preprocess": lambda data: app.preprocess_image(data)["data"],
+        "preprocess_color": lambda data: app.preprocess_image(data, grayscale=False, autocontrast=False)["data"],
+    }
+    results = {}
+    for megapixels in [float(size) for size in args.sizes.split(",")]:
+        photo = handwriting_photo(megapixels, seed=int(megapixels * 10))
+        for fmt in ("JPEG", "PNG"):
+            data = encode_upload(photo, fmt)
+            name = f"{megapixels:g}MP_{fmt.lower()}"
+            results[name] = {"upload_bytes": len(data)}
+            for variant, fn in variants.items():
+                results[name][variant] = time_variant(fn, data, args.repeats)
+            print(f"{name} done")
+
+    print(f"\n{'image':<12} {'upload':>9} {'variant':<17} {'sent':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, result in results.items():
+        for variant in variants:
+            stats = result[variant]
+            print(f"{name:<12} {result['upload_bytes'] / 1024:8.0f}K {variant:<17} {stats['bytes_sent'] / 1024:8.0f}K "
+                  f"{stats['latency']['p50'] * 1000:9.1f} {stats['latency']['p95'] * 1000:9.1f}")
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    settings.update(max_edge=app.IMAGE_MAX_EDGE, format=app.IMAGE_FORMAT, quality=app.IMAGE_QUALITY)
+    write_results(os.path.abspath(args.output), "image", settings, results)
+    if args.compare:
+        compare(os.path.abspath(args.compare), results)
+
+
+if __name__ == "__main__":
+    main()
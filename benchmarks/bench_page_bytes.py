@@ -0,0 +1,83 @@
+# Bytes each page sends to the browser per rerun.
+#
+# Renders every page through Streamlit's AppTest runner and adds up the
+# serialized protobuf of every element and block in the resulting tree,
+# which is what a rerun ships over the websocket (the ForwardMsg envelopes
+# around them add a few bytes each). The largest single element is reported
+# too, since that is usually a stylesheet or a block of static HTML.
+# Static file serving is on by default, as in .streamlit/config.toml; pass
+# --no-static-serving for the inline fallback.
+#
+#   python benchmarks/bench_page_bytes.py --output before.json
+#   python benchmarks/bench_page_bytes.py --output after.json --compare before.json
+import argparse
+import json
+import os
+import sys
+
+from streamlit import config
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import create_user, make_app, make_workdir, write_results  # noqa: E402
+
+PAGES = ["main", "login", "signup", "about", "contact", "history", "profile"]
+
+
+def tree_bytes(node):
+    # (total bytes, largest element bytes) of a node and everything below it
+    size = len(node.proto.SerializeToString()) if getattr(node, "proto", None) is not None else 0
+    total, largest = size, size
+    for child in getattr(node, "children", {}).values():
+        child_total, child_largest = tree_bytes(child)
+        total += child_total
+        largest = max(largest, child_largest)
+    return total, largest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bytes sent to the browser per rerun, per page")
+    parser.add_argument("--no-static-serving", action="store_true", help="send stylesheets inline")
+    parser.add_argument("--output", default="bench_page_bytes.json")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+    output_path = os.path.abspath(args.output)
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    os.chdir(make_workdir("codegpt-bytes-"))
+
+    # The runner does not read the repo's .streamlit/config.toml from here
+    config.set_option("server.enableStaticServing", not args.no_static_serving)
+    at = make_app()
+    at.run()
+    user_id = create_user(os.environ["CODEGPT_DB_PATH"])
+    at.session_state["authenticated"] = True
+    at.session_state["user_id"] = user_id
+    at.session_state["username"] = "bench"
+
+    results = {}
+    for page in PAGES:
+        at.session_state["current_page"] = page
+        at.run()  # navigating to the page
+        at.run()  # a rerun on it, e.g. after a widget interaction
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].message}")
+        total, largest = tree_bytes(at._tree)
+        results[page] = {"bytes": total, "largest_element": largest}
+
+    print(f"\n{'page':<10} {'bytes/rerun':>12} {'largest':>10}")
+    for page, result in results.items():
+        print(f"{page:<10} {result['bytes']:12,} {result['largest_element']:10,}")
+
+    write_results(output_path, "page_bytes", {"static_serving": not args.no_static_serving}, results)
+    if compare_path:
+        with open(compare_path) as f:
+            baseline = json.load(f)["results"]
+        print(f"\nCompared with {compare_path}:")
+        for page, result in results.items():
+            if page in baseline:
+                old = baseline[page]["bytes"]
+                print(f"  {page:<10} {old:10,} -> {result['bytes']:10,} ({(result['bytes'] - old) / old * 100:+6.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
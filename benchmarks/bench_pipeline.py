@@ -0,0 +1,109 @@
+# End-to-end benchmark of the analysis pipeline.
+#
+# Drives app.py headlessly through Streamlit's AppTest runner with the fake
+# LLM backend, over one snippet per language from benchmarks/corpus. Each
+# snippet is run once per feature and once through "Analyze All", as a
+# logged-in user so save_chat_history is part of the measurement.
+#
+#   python benchmarks/bench_pipeline.py --rounds 3 --output before.json
+#   python benchmarks/bench_pipeline.py --rounds 3 --compare before.json
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import compare, create_user, load_corpus, make_app, make_workdir, summarize, write_results  # noqa: E402
+
+# Checkbox label on the main page -> feature name used by process_code
+FEATURE_CHECKBOXES = {
+    "🐛 **Find & Fix Bugs**": "🐛 Find & Fix Bugs",
+    "📚 Explain Code": "📚 Explain Code",
+    "⚡ Optimize Code": "⚡ Optimize Code",
+    "🌍 Detect & Adapt Language": "🌍 Detect & Adapt Language",
+    "🔄 Refactor Code": "🔄 Refactor Code",
+}
+
+PHASES = ("prompt", "model", "render", "save", "total")
+
+
+def run_scenario(at, code, checkbox_label=None):
+    for checkbox in at.checkbox:
+        checkbox.set_value(checkbox.label == checkbox_label)
+    at.text_area(key="code_input_1").input(code)
+    label = "✨ Process Selected Features" if checkbox_label else "🚀 Analyze All Features"
+    button = next(b for b in at.button if b.label == label)
+
+    started = time.perf_counter()
+    button.click().run()
+    wall = time.perf_counter() - started
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return wall, dict(at.session_state["last_run_timings"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of process_code")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the whole corpus")
+    parser.add_argument("--latency", default="lognormal:0.05:0.3", help="fake backend latency distribution")
+    parser.add_argument("--tokens-per-sec", default="4000", help="fake backend token throughput")
+    parser.add_argument("--workers", default="6", help="CODEGPT_MAX_WORKERS")
+    parser.add_argument("--batch", action="store_true", help="use the single-request batch mode")
+    parser.add_argument("--with-cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--output", default="bench_pipeline.json")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    args = parser.parse_args()
+    output_path = os.path.abspath(args.output)
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    workdir = make_workdir("codegpt-bench-")
+    os.chdir(workdir)
+    os.environ.update({
+        "CODEGPT_BACKEND": "fake",
+        "CODEGPT_FAKE_LATENCY": args.latency,
+        "CODEGPT_FAKE_TOKENS_PER_SEC": args.tokens_per_sec,
+        "CODEGPT_MAX_WORKERS": args.workers,
+        "CODEGPT_BATCH_FEATURES": "1" if args.batch else "0",
+    })
+    if not args.with_cache:
+        os.environ["CODEGPT_CACHE_MAX_ENTRIES"] = "0"
+
+    at = make_app()
+    at.run()
+    user_id = create_user(os.environ["CODEGPT_DB_PATH"])
+    at.session_state["authenticated"] = True
+    at.session_state["user_id"] = user_id
+    at.session_state["username"] = "bench"
+
+    scenarios = {"analyze_all": None}
+    scenarios.update({feature: label for label, feature in FEATURE_CHECKBOXES.items()})
+    samples = {name: {"wall": [], **{phase: [] for phase in PHASES}} for name in scenarios}
+
+    corpus = load_corpus()
+    for round_number in range(args.rounds):
+        for snippet_name, code in corpus.items():
+            for scenario, checkbox_label in scenarios.items():
+                wall, timings = run_scenario(at, code, checkbox_label)
+                samples[scenario]["wall"].append(wall)
+                for phase in PHASES:
+                    samples[scenario][phase].append(timings.get(phase, 0.0))
+        print(f"round {round_number + 1}/{args.rounds} done")
+
+    results = {scenario: {metric: summarize(values) for metric, values in metrics.items()}
+               for scenario, metrics in samples.items()}
+
+    print(f"\n{'scenario':<28} {'metric':<8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for scenario, metrics in results.items():
+        for metric, stats in metrics.items():
+            print(f"{scenario:<28} {metric:<8} {stats['p50']:9.4f} {stats['p95']:9.4f} {stats['p99']:9.4f}")
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    settings["snippets"] = len(corpus)
+    write_results(output_path, "pipeline", settings, results)
+    if compare_path:
+        compare(compare_path, results)
+
+
+if __name__ == "__main__":
+    main()
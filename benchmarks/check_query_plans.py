@@ -0,0 +1,50 @@
+# Asserts via EXPLAIN QUERY PLAN that every query in app.HOT_QUERIES searches
+# its index instead of scanning a table. Builds a throwaway database, fills it
+# with enough rows for the planner to have real choices, and exits non-zero
+# if any hot query regresses to a scan.
+#
+#   python benchmarks/check_query_plans.py
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import make_workdir  # noqa: E402
+
+make_workdir("codegpt-plans-")
+import app  # noqa: E402  (creates the schema in the throwaway database)
+
+FEATURES = ["🐛 Find & Fix Bugs", "📚 Explain Code", "⚡ Optimize Code", "🔄 Refactor Code"]
+
+
+def seed(conn, users=50, rows_per_user=40):
+    rng = random.Random(7)
+    conn.executemany("INSERT INTO users (username, email, password_hash, verified) VALUES (?, ?, ?, 1)",
+                     [(f"user{i}", f"user{i}@x.io", "h") for i in range(users)])
+    conn.executemany("INSERT INTO chat_history (user_id, code_input, features_used, ai_output, created_at) "
+                     "VALUES (?, ?, ?, ?, datetime('now', ?))",
+                     [(u + 1, "print(1)", ",".join(rng.sample(FEATURES, 2)), "ok", f"-{rng.randint(0, 90)} days")
+                      for u in range(users) for _ in range(rows_per_user)])
+    conn.executemany("INSERT INTO otp_codes (email, otp_code, expires_at) VALUES (?, ?, datetime('now', ?))",
+                     [(f"user{i}@x.io", f"{rng.randint(0, 999999):06d}", f"{rng.randint(-60, 10)} minutes")
+                      for i in range(users * 5)])
+
+
+def main():
+    with app.get_db().connection() as conn:
+        seed(conn)
+        conn.execute("ANALYZE")
+        report = app.check_query_plans(conn)
+
+    failed = 0
+    for name, (ok, plan) in report.items():
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        for line in plan:
+            print(f"       {line}")
+        failed += not ok
+    print(f"\n{len(report) - failed}/{len(report)} hot queries use their index")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
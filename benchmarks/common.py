@@ -0,0 +1,134 @@
+# Helpers shared by the benchmark scripts: a throwaway database, the snippet
+# corpus, percentiles, JSON result files and comparing two result files
+# produced from different commits.
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+CORPUS_DIR = os.path.join(REPO_ROOT, "benchmarks", "corpus")
+
+# st.secrets entries app.py reads at start-up; the benchmarks never send mail
+BENCH_SECRETS = {
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "2525",
+    "EMAIL_USER": "bench@codegpt.local",
+    "EMAIL_PASS": "bench",
+}
+
+
+def make_app(timeout=120):
+    # Streamlit's headless test runner executes app.py exactly like a browser
+    # session would, including session state, reruns and widget values.
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    for key, value in BENCH_SECRETS.items():
+        at.secrets[key] = value
+    return at
+
+
+def make_workdir(prefix, db_name="codegpt_users.db"):
+    # Points app.py at a database in a new temporary directory, with the fake
+    # LLM backend and no warm-up call unless the caller set them. Scripts that
+    # import app must call this first: the import creates the schema.
+    workdir = tempfile.mkdtemp(prefix=prefix)
+    os.environ["CODEGPT_DB_PATH"] = os.path.join(workdir, db_name)
+    os.environ.setdefault("CODEGPT_BACKEND", "fake")
+    os.environ.setdefault("CODEGPT_WARMUP", "0")
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return workdir
+
+
+def load_corpus():
+    # {file name: source} for every snippet in benchmarks/corpus
+    corpus = {}
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if not os.path.isfile(os.path.join(CORPUS_DIR, name)):
+            continue  # compileall leaves a __pycache__ next to quicksort.py
+        with open(os.path.join(CORPUS_DIR, name)) as f:
+            corpus[name] = f.read()
+    return corpus
+
+
+def create_user(db_path, username="bench"):
+    # A verified user for the benchmarks that need a logged-in session
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT OR IGNORE INTO users (username, email, password_hash, verified) VALUES (?, ?, ?, 1)",
+                 (username, f"{username}@codegpt.local", "x"))
+    user_id = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()[0]
+    conn.commit()
+    conn.close()
+    return user_id
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values):
+    return {
+        "n": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(path, name, settings, results):
+    payload = {
+        "benchmark": name,
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "settings": settings,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results written to {path}")
+
+
+def compare(baseline_path, results, metric_keys=("p50", "p95", "p99")):
+    # Prints the relative change of every summarized metric against a results
+    # file written by an earlier run (typically on another commit).
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit', '?')}):")
+    for path, old, new in _walk_pairs(baseline["results"], results):
+        for key in metric_keys:
+            if key in old and key in new and old[key]:
+                change = (new[key] - old[key]) / old[key] * 100
+                print(f"  {path:<48} {key}: {old[key]:9.4f} -> {new[key]:9.4f} ({change:+6.1f}%)")
+
+
+def _walk_pairs(old, new, path=""):
+    if isinstance(old, dict) and isinstance(new, dict):
+        if "p50" in old and "p50" in new:
+            yield path, old, new
+            return
+        for key in old:
+            if key in new:
+                yield from _walk_pairs(old[key], new[key], f"{path}/{key}" if path else key)
@@ -0,0 +1,17 @@
+public class BinarySearch {
+    public static int search(int[] values, int target) {
+        int low = 0, high = values.length;
+        while (low <= high) {
+            int mid = (low + high) / 2;
+            if (values[mid] == target) return mid;
+            if (values[mid] < target) low = mid + 1;
+            else high = mid - 1;
+        }
+        return -1;
+    }
+
+    public static void main(String[] args) {
+        int[] values = {1, 3, 5, 7, 9, 11};
+        System.out.println(search(values, 7));
+    }
+}
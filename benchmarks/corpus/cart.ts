@@ -0,0 +1,27 @@
+interface Item {
+  name: string;
+  price: number;
+  quantity: number;
+}
+
+class Cart {
+  private items: Item[] = [];
+
+  add(item: Item): void {
+    const existing = this.items.find((i) => i.name === item.name);
+    if (existing) {
+      existing.quantity += item.quantity;
+    } else {
+      this.items.push(item);
+    }
+  }
+
+  total(discount?: number): number {
+    const sum = this.items.reduce((acc, i) => acc + i.price * i.quantity, 0);
+    return discount ? sum - sum * discount / 100 : sum;
+  }
+}
+
+const cart = new Cart();
+cart.add({ name: "book", price: 12.5, quantity: 2 });
+console.log(cart.total(10));
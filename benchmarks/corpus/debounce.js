@@ -0,0 +1,16 @@
+function debounce(fn, wait) {
+  let timer;
+  return function (...args) {
+    clearTimeout(timer);
+    timer = setTimeout(() => fn.apply(this, args), wait);
+  };
+}
+
+const results = [];
+for (var i = 0; i < 3; i++) {
+  setTimeout(() => results.push(i), 0);
+}
+
+const log = debounce((msg) => console.log(msg, results), 100);
+log("first");
+log("second");
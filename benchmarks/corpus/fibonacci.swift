@@ -0,0 +1,18 @@
+import Foundation
+
+func fibonacci(_ n: Int) -> Int {
+    if n <= 1 {
+        return n
+    }
+    return fibonacci(n - 1) + fibonacci(n - 2)
+}
+
+func fibonacciSequence(count: Int) -> [Int] {
+    var sequence: [Int] = []
+    for i in 0...count {
+        sequence.append(fibonacci(i))
+    }
+    return sequence
+}
+
+print(fibonacciSequence(count: 20))
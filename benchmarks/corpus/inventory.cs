@@ -0,0 +1,27 @@
+using System;
+using System.Collections.Generic;
+
+public class Inventory
+{
+    private readonly Dictionary<string, int> _stock = new Dictionary<string, int>();
+
+    public void Add(string item, int quantity)
+    {
+        if (_stock.ContainsKey(item)) _stock[item] += quantity;
+        else _stock[item] = quantity;
+    }
+
+    public bool Remove(string item, int quantity)
+    {
+        if (_stock[item] < quantity) return false;
+        _stock[item] -= quantity;
+        return true;
+    }
+
+    public static void Main()
+    {
+        var inventory = new Inventory();
+        inventory.Add("apple", 3);
+        Console.WriteLine(inventory.Remove("pear", 1));
+    }
+}
@@ -0,0 +1,23 @@
+#include <iostream>
+#include <vector>
+
+using Matrix = std::vector<std::vector<int>>;
+
+Matrix multiply(const Matrix &a, const Matrix &b) {
+    size_t n = a.size(), m = b[0].size(), k = b.size();
+    Matrix result(n, std::vector<int>(m, 0));
+    for (size_t i = 0; i < n; ++i)
+        for (size_t j = 0; j < m; ++j)
+            for (size_t x = 0; x < k; ++x)
+                result[i][j] += a[i][x] * b[x][j];
+    return result;
+}
+
+int main() {
+    Matrix a = {{1, 2}, {3, 4}};
+    Matrix b = {{5, 6}, {7, 8}};
+    for (auto &row : multiply(a, b)) {
+        for (int v : row) std::cout << v << " ";
+        std::cout << "\n";
+    }
+}
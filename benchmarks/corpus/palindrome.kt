@@ -0,0 +1,16 @@
+fun isPalindrome(text: String): Boolean {
+    val cleaned = text.filter { it.isLetterOrDigit() }.lowercase()
+    var left = 0
+    var right = cleaned.length
+    while (left < right) {
+        if (cleaned[left] != cleaned[right]) return false
+        left++
+        right--
+    }
+    return true
+}
+
+fun main() {
+    val phrases = listOf("Racecar", "A man, a plan, a canal: Panama", "Kotlin")
+    phrases.forEach { println("$it -> ${isPalindrome(it)}") }
+}
@@ -0,0 +1,20 @@
+def quicksort(items):
+    if len(items) <= 1:
+        return items
+    pivot = items[0]
+    left = [x for x in items if x < pivot]
+    middle = [x for x in items if x == pivot]
+    right = [x for x in items if x > pivot]
+    return quicksort(left) + middle + quicksort(right)
+
+
+def top_k(items, k):
+    result = []
+    for item in quicksort(items)[::-1]:
+        if len(result) == k:
+            break
+        result.append(item)
+    return result
+
+
+print(top_k([5, 2, 9, 1, 7, 3], 3))
@@ -0,0 +1,34 @@
+#[derive(Debug, PartialEq)]
+enum Token {
+    Number(i64),
+    Plus,
+    Minus,
+}
+
+fn tokenize(input: &str) -> Vec<Token> {
+    let mut tokens = Vec::new();
+    let chars: Vec<char> = input.chars().collect();
+    let mut i = 0;
+    while i < chars.len() {
+        match chars[i] {
+            '+' => tokens.push(Token::Plus),
+            '-' => tokens.push(Token::Minus),
+            c if c.is_ascii_digit() => {
+                let start = i;
+                while i < chars.len() && chars[i].is_ascii_digit() {
+                    i += 1;
+                }
+                let value: String = chars[start..i].iter().collect();
+                tokens.push(Token::Number(value.parse().unwrap()));
+                continue;
+            }
+            _ => {}
+        }
+        i += 1;
+    }
+    tokens
+}
+
+fn main() {
+    println!("{:?}", tokenize("12 + 30 - 4"));
+}
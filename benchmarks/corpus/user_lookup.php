@@ -0,0 +1,16 @@
+<?php
+function findUser(PDO $db, $email) {
+    $query = "SELECT id, name FROM users WHERE email = '" . $email . "'";
+    $result = $db->query($query);
+    return $result->fetch(PDO::FETCH_ASSOC);
+}
+
+function greet($user) {
+    if ($user == null) {
+        return "Hello, guest";
+    }
+    return "Hello, " . htmlspecialchars($user['name']);
+}
+
+$db = new PDO('sqlite::memory:');
+echo greet(findUser($db, $_GET['email']));
@@ -0,0 +1,22 @@
+#include <stdio.h>
+#include <ctype.h>
+
+int count_words(const char *text) {
+    int count = 0, in_word = 0;
+    for (int i = 0; text[i] != '\0'; i++) {
+        if (isspace(text[i])) {
+            in_word = 0;
+        } else if (!in_word) {
+            in_word = 1;
+            count++;
+        }
+    }
+    return count;
+}
+
+int main(void) {
+    char buffer[256];
+    fgets(buffer, 512, stdin);
+    printf("%d\n", count_words(buffer));
+    return 0;
+}
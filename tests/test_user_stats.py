@@ -0,0 +1,23 @@
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+workdir = tempfile.mkdtemp(prefix="codegpt-tests-")
+os.environ["CODEGPT_DB_PATH"] = os.path.join(workdir, "codegpt_users.db")
+os.environ.setdefault("CODEGPT_BACKEND", "fake")
+os.environ.setdefault("CODEGPT_WARMUP", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+
+
+def days_ago(days):
+    return (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+
+
+def test_week_counts_the_last_seven_days_including_today():
+    day_counts = {days_ago(0): 1, days_ago(6): 2, days_ago(7): 4}
+    row = (7, days_ago(7), json.dumps(day_counts), json.dumps({"📚 Explain Code": 7}))
+    assert app.summarize_user_stats(row)["week"] == 3